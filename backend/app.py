@@ -1,10 +1,12 @@
-from flask import Flask, send_from_directory
+from flask import Flask, send_from_directory, jsonify, g, request
 from flask_cors import CORS
 from dotenv import load_dotenv
 import os
-from spotipy.oauth2 import SpotifyClientCredentials
-import spotipy
-from flask_cors import CORS
+import spotify_client
+from spotify_client import SpotifyRateLimitError
+import db
+import query_log
+from db import DatabaseManager, PoolTimeout
 
 from routes.auth import auth_bp
 from routes.notice import notice_bp
@@ -12,6 +14,10 @@ from routes.user import user_bp
 from routes.playlist import playlist_bp          
 from routes.music_list import music_list_bp   
 from routes.music import music_bp   
+from services import bulk_import as bulk_import_service
+from services import genre as genre_service
+from services import chart as chart_service
+from services import catalog_index
 
 
 load_dotenv()
@@ -36,12 +42,54 @@ app.register_blueprint(playlist_bp)
 app.register_blueprint(music_list_bp) 
 app.register_blueprint(music_bp)
 
-# Spotify 인증
-client_credentials_manager = SpotifyClientCredentials(
-    client_id=os.getenv('SPOTIFY_CLIENT_ID'),
-    client_secret=os.getenv('SPOTIFY_CLIENT_SECRET')
-)
-sp = spotipy.Spotify(client_credentials_manager=client_credentials_manager)
+# 요청마다 DB 연결 하나를 공유하고 응답 전에 한 번 commit
+db.init_app(app)
+# 요청별 쿼리 수/시간 → Server-Timing 헤더, 느린 쿼리/쿼리가 많은 요청 로그
+query_log.init_app(app)
+
+# 장르 레지스트리 미리 로드 (실패하면 첫 조회 시 다시 시도)
+try:
+    genre_service.load()
+except Exception as e:
+    print(f"⚠️ 장르 목록 로드 실패: {e}")
+
+# 자동완성 색인 구성 (백그라운드, 주기적으로 재구성)
+catalog_index.start_loader()
+
+# 중단된 bulk import 작업 재개
+bulk_import_service.start_worker()
+
+# 차트 스냅샷 주기적 확인
+chart_service.start_scheduler()
+
+def _retry_later_response(e):
+    """일시적인 한도 초과(e.retry_after초 후 재시도) → 503 + Retry-After"""
+    resp = jsonify({"success": False, "message": str(e), "retry_after": e.retry_after})
+    resp.status_code = 503
+    resp.headers['Retry-After'] = str(e.retry_after)
+    return resp
+
+
+@app.errorhandler(SpotifyRateLimitError)
+def handle_spotify_rate_limit(e):
+    """Spotify 호출 한도 초과 → 503 + Retry-After"""
+    return _retry_later_response(e)
+
+
+@app.errorhandler(PoolTimeout)
+def handle_pool_timeout(e):
+    """DB 연결 대기 시간 초과 → 503 + Retry-After"""
+    return _retry_later_response(e)
+
+
+@app.after_request
+def convert_swallowed_pool_timeout(response):
+    """서비스에서 PoolTimeout을 잡아 실패 응답으로 바꾼 경우에도 503 + Retry-After로 응답"""
+    error = g.pop('pool_timeout', None)
+    if error is not None and response.status_code >= 400 and response.status_code != 503:
+        return _retry_later_response(error)
+    return response
+
 
 # 기본 라우트
 @app.route('/')
@@ -90,7 +138,7 @@ def health():
             return {
                 'status': 'healthy',
                 'database': 'connected',
-                'spotify': sp is not None,
+                'spotify': spotify_client.is_configured(),
                 'version': version['VERSION()']
             }, 200
         except Exception as e:
@@ -107,6 +155,20 @@ def health():
             'database': 'disconnected'
         }, 500
 
+
+@app.route('/health/db-pool')
+def db_pool_stats():
+    """DB 풀 상태 (사용 중/유휴/대기 연결 수, 연결 대기 시간 분포, 복제 지연)"""
+    return {'primary': DatabaseManager.stats(), 'replica': DatabaseManager.replica_stats()}, 200
+
+
+@app.route('/health/db-queries')
+def db_query_stats():
+    """총 실행 시간이 긴 SQL 문장 (정규화된 문장별 실행 횟수/총·평균·최대 시간/행 수)"""
+    limit = request.args.get('limit', 20, type=int)
+    return {'statements': query_log.QueryStats.top(limit)}, 200
+
+
 if __name__ == '__main__':
     print("Test: http://localhost:5001/test")
     print("Health: http://localhost:5001/health")
@@ -0,0 +1,83 @@
+# bench_genre_matcher.py - Spotify 장르 → DB 장르 매칭 벤치마크
+# 실행: python bench_genre_matcher.py [아티스트 수] [반복 횟수]
+import random
+import sys
+import time
+
+from services.genre_matcher import GENRE_MAP, GenreMatcher
+
+# 실제 Spotify 장르 문자열과 비슷한 형태의 샘플
+SAMPLE_GENRES = [
+    "k-pop", "k-pop girl group", "k-pop boy group", "korean r&b", "korean pop",
+    "k-rap", "korean hip hop", "korean indie", "dance pop", "pop", "post-teen pop",
+    "art pop", "hip hop", "pop rap", "trap", "melodic rap", "r&b", "alternative r&b",
+    "contemporary r&b", "neo soul", "jazz", "vocal jazz", "contemporary jazz",
+    "electronic", "edm", "progressive house", "deep house", "techno", "electropop",
+    "rock", "modern rock", "indie rock", "alternative rock", "metal", "metalcore",
+    "nu metal", "indie", "indie pop", "bedroom pop", "j-pop", "anime", "ost",
+    "classical", "lo-fi beats", "city pop", "ballad", "korean ost", "trot",
+]
+
+
+def make_artists(count, seed=42):
+    rng = random.Random(seed)
+    return [rng.sample(SAMPLE_GENRES, rng.randint(0, 5)) for _ in range(count)]
+
+
+# 변경 전 artist_genre.GENRE_MAP (기준선: 확장된 GENRE_MAP으로 비교하면 개선 폭이 작게 나옴)
+LEGACY_GENRE_MAP = {
+    "k-pop": "K-Pop",
+    "korean pop": "K-Pop",
+    "dance pop": "Pop",
+    "pop": "Pop",
+    "hip hop": "Hip-Hop",
+    "hip-hop": "Hip-Hop",
+    "r&b": "R&B",
+    "jazz": "Jazz",
+    "electronic": "Electronic",
+    "edm": "Electronic",
+    "rock": "Rock",
+    "metal": "Metal",
+    "indie": "Indie",
+}
+
+
+def exact_match(genres):
+    """기존 방식: 변경 전 GENRE_MAP 키와 정확히 같은 장르만 매칭"""
+    for g in genres:
+        key = (g or "").lower()
+        if key in LEGACY_GENRE_MAP:
+            return LEGACY_GENRE_MAP[key]
+    return None
+
+
+def run(name, fn, artists, repeat):
+    best = None
+    matched = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [fn(genres) for genres in artists]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        matched = sum(1 for r in results if r)
+
+    rate = len(artists) / best if best else float("inf")
+    print(f"{name:<28} {best * 1000:9.2f} ms  {rate:14,.0f} artists/s  매칭률 {matched / len(artists):6.1%}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    artists = make_artists(count)
+
+    print(f"🎵 아티스트 {count:,}명, {repeat}회 반복 중 최고 기록")
+    print("=" * 80)
+    run("exact (변경 전 GENRE_MAP 조회)", exact_match, artists, repeat)
+
+    cold = GenreMatcher(GENRE_MAP)
+    run("GenreMatcher (첫 실행)", cold.match, artists, 1)
+    run("GenreMatcher (캐시 적중)", cold.match, artists, repeat)
+
+
+if __name__ == "__main__":
+    main()
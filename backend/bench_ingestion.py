@@ -0,0 +1,78 @@
+# bench_ingestion.py - 가짜 Spotify 백엔드로 음악 수집 처리량 측정 (DB 필요, Spotify 인증 불필요)
+# 실행: python bench_ingestion.py --searches 20 --size 50 --bulk 500 --latency-ms 80
+#   - 녹화한 응답 사용: SPOTIFY_FIXTURE_DIR=fixtures/spotify python bench_ingestion.py
+#   - 응답 녹화: SPOTIFY_BACKEND=record python app.py 로 실제 API를 호출하면 fixture가 저장됨
+import argparse
+import os
+import time
+import uuid
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="search_and_save_music / bulk_import_music 처리량 측정")
+    parser.add_argument("--searches", type=int, default=20, help="검색 횟수 (검색어마다 다른 키워드)")
+    parser.add_argument("--size", type=int, default=50, help="검색 한 번의 페이지 크기")
+    parser.add_argument("--bulk", type=int, default=500, help="bulk import 곡 수 (0이면 생략)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="가짜 Spotify 평균 응답 지연(ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="가짜 Spotify 500 응답 비율")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="가짜 Spotify 429 응답 비율")
+    parser.add_argument("--run-id", default=None, help="검색어 접두사 (같은 값이면 이미 저장된 곡을 다시 조회)")
+    return parser.parse_args()
+
+
+def report(name, tracks, new, elapsed):
+    rate = tracks / elapsed if elapsed else float("inf")
+    print(f"{name:<22} {tracks:6d}곡 (신규 {new:6d})  {elapsed:8.2f}s  {rate:10.1f} tracks/s")
+
+
+def main():
+    args = parse_args()
+
+    # 서비스 모듈을 불러오기 전에 백엔드 설정
+    os.environ.setdefault("SPOTIFY_BACKEND", "fake")
+    os.environ["SPOTIFY_FAKE_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["SPOTIFY_FAKE_ERROR_RATE"] = str(args.error_rate)
+    os.environ["SPOTIFY_FAKE_429_RATE"] = str(args.rate_limit_rate)
+    os.environ.setdefault("SPOTIFY_RATE_LIMIT", "1000")
+    os.environ.setdefault("SPOTIFY_RATE_BURST", "1000")
+    # 수집 경로만 측정 (로컬 검색 생략)
+    os.environ.setdefault("SEARCH_LOCAL_FIRST", "false")
+
+    from services import music as music_service
+
+    run_id = args.run_id or uuid.uuid4().hex[:8]
+    print(f"🎵 수집 벤치마크 (backend={os.environ['SPOTIFY_BACKEND']}, run_id={run_id}, "
+          f"latency={args.latency_ms}ms)")
+    print("=" * 80)
+
+    tracks = new = errors = 0
+    start = time.perf_counter()
+    for i in range(args.searches):
+        musics, _, _, error = music_service.search_and_save_music(
+            f"bench {run_id} {i}", None, 1, args.size
+        )
+        if error:
+            errors += 1
+            continue
+        tracks += len(musics)
+        new += sum(1 for m in musics if m.get("is_new"))
+    report("search_and_save_music", tracks, new, time.perf_counter() - start)
+    if errors:
+        print(f"  ⚠️ 검색 실패 {errors}회")
+
+    if args.bulk:
+        start = time.perf_counter()
+        musics, error = music_service.bulk_import_music(f"bench {run_id} bulk", args.bulk)
+        elapsed = time.perf_counter() - start
+        if error:
+            print(f"  ❌ bulk import 실패: {error}")
+        else:
+            report("bulk_import_music", len(musics), sum(1 for m in musics if m.get("is_new")), elapsed)
+
+
+if __name__ == "__main__":
+    main()
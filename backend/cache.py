@@ -0,0 +1,166 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+
+
+class TTLCache:
+    """스레드 안전한 LRU + TTL 인메모리 캐시"""
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def get_many(self, keys):
+        """캐시에 있는 키만 dict로 반환 (값이 None인 항목도 포함)"""
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at <= now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                found[key] = value
+        return found
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+    def set_many(self, items):
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = (value, expires_at)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class StaleWhileRevalidateCache:
+    """
+    LRU + TTL 캐시 (stale-while-revalidate)
+    - ttl 이내: 캐시 값 반환 (hit)
+    - ttl 초과 ~ stale_ttl 이내: 캐시 값을 그대로 반환하고, 백그라운드에서 한 번만 갱신 (stale)
+    - 그 외: loader를 직접 호출해서 저장 (miss)
+    - refresh_context: 백그라운드 갱신을 감쌀 context manager를 만드는 함수 (예: Spotify 호출 우선순위)
+    """
+
+    def __init__(self, maxsize=1000, ttl=60, stale_ttl=600, name="cache", refresh_context=nullcontext):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.name = name
+        self.refresh_context = refresh_context
+        self._data = OrderedDict()  # key -> (value, stored_at)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+
+    def _count(self, field):
+        self._stats[field] += 1
+
+    def peek(self, key):
+        """통계/갱신 없이 신선한 값만 조회"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry and time.monotonic() - entry[1] < self.ttl:
+                return entry[0]
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key, loader):
+        """캐시 조회, 없으면 loader() 결과를 저장 후 반환 (loader 예외는 그대로 전달)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = time.monotonic() - stored_at
+                if age < self.ttl:
+                    self._data.move_to_end(key)
+                    self._count("hits")
+                    return value
+                if age < self.stale_ttl:
+                    self._data.move_to_end(key)
+                    self._count("stale_hits")
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(
+                            target=self._refresh, args=(key, loader),
+                            name=f"{self.name}-refresh", daemon=True
+                        ).start()
+                    return value
+                del self._data[key]
+            self._count("misses")
+
+        value = loader()
+        self.set(key, value)
+        return value
+
+    def _refresh(self, key, loader):
+        try:
+            with self.refresh_context():
+                value = loader()
+            self.set(key, value)
+            with self._lock:
+                self._count("refreshes")
+        except Exception as e:
+            print(f"⚠️ [{self.name}] 백그라운드 갱신 실패: {e}")
+            with self._lock:
+                self._count("refresh_errors")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["stale_hits"] + self._stats["misses"]
+            hit_count = self._stats["hits"] + self._stats["stale_hits"]
+            return {
+                **self._stats,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "hit_ratio": round(hit_count / lookups, 4) if lookups else 0.0
+            }
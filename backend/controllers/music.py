@@ -1,5 +1,9 @@
 from flask import request, jsonify
+from middleware.auth_utils import get_user_from_token
 from services import music as music_service
+from services import bulk_import as bulk_import_service
+from services import chart as chart_service
+from streaming import STREAM_CHUNK_SIZE, STREAM_FORMATS, stream_response
 
 
 def search_music():
@@ -12,8 +16,12 @@ def search_music():
     if not keyword:
         return jsonify({"success": False, "message": "검색어(q)가 필요합니다."}), 400
 
-    musics, total, error = music_service.search_and_save_music(
-        keyword, category, page, size
+    # 다음 페이지 미리 가져오기는 사용자(비로그인은 IP)별로 제한
+    user_no, _, auth_error = get_user_from_token()
+    client_key = f"user:{user_no}" if not auth_error else f"ip:{request.remote_addr}"
+
+    musics, total, source, error = music_service.search_and_save_music(
+        keyword, category, page, size, client_key
     )
     if error:
         return jsonify({"success": False, "message": error}), 500
@@ -23,51 +31,106 @@ def search_music():
         "data": musics,
         "page": page,
         "size": size,
-        "total": total
+        "total": total,
+        "source": source
     }), 200
 
 
+def get_search_cache_stats():
+    return jsonify({"success": True, "data": music_service.get_search_cache_stats()}), 200
+
+
+def suggest_music():
+    """검색창 자동완성 (DB/Spotify 호출 없이 메모리 색인에서 조회)"""
+    query = request.args.get('q') or ''
+    limit = request.args.get('limit', 10, type=int)
+
+    musics, error = music_service.suggest_music(query, limit)
+    if error:
+        return jsonify({"success": False, "message": error}), 500
+
+    return jsonify({"success": True, "data": musics}), 200
+
+
 def get_music_list():
     category = request.args.get('category')
     value = request.args.get('value')
+    keyword = (request.args.get('q') or '').strip()
+    stream = request.args.get('stream')
 
-    musics, error = music_service.get_music_list(category, value)
+    if stream and stream not in STREAM_FORMATS:
+        return jsonify({"success": False, "message": "stream은 ndjson 또는 json이어야 합니다."}), 400
+
+    # 전체/장르 목록은 서버 측 커서로 나눠서 전송 (검색 결과는 크기가 제한돼 있어 그대로)
+    if stream and not keyword:
+        chunks, error = music_service.stream_music_list(category, value, STREAM_CHUNK_SIZE)
+        if error:
+            return jsonify({"success": False, "message": error}), 400
+        return stream_response(chunks, stream)
+
+    musics, error = music_service.get_music_list(category, value, keyword)
     if error:
         return jsonify({"success": False, "message": error}), 400
 
+    if stream:
+        return stream_response([musics], stream)
     return jsonify({"success": True, "data": musics}), 200
 
 
 def get_global_top_50():
-    musics, error = music_service.get_global_top_50()
+    return get_chart(chart_service.DEFAULT_CHART_KEY)
+
+
+def get_chart(chart_key):
+    """저장된 차트 스냅샷 조회 (snapshot_id가 바뀌면 백그라운드에서 갱신)"""
+    chart, error = chart_service.get_chart(chart_key)
     if error:
-        return jsonify({"success": False, "message": error}), 500
+        status = 404 if error == "존재하지 않는 차트입니다." else 500
+        return jsonify({"success": False, "message": error}), status
 
-    new_count = sum(1 for m in musics if m.get('is_new'))
-    
     return jsonify({
         "success": True,
-        "message": f"총 {len(musics)}곡 (신규 {new_count}곡 저장)",
-        "data": musics
+        "message": f"총 {len(chart['musics'])}곡",
+        "data": chart['musics'],
+        "chart_key": chart['chart_key'],
+        "snapshot_id": chart['snapshot_id'],
+        "refreshed_at": chart['refreshed_at'],
+        # 아직 스냅샷이 없어 가져오는 중 (잠시 후 다시 조회)
+        "refreshing": chart['refreshing']
     }), 200
-    
+
+
 def bulk_import():
-    data = request.get_json()
-    query = data.get('query', 'kpop')
+    """대량 가져오기 작업 생성 (백그라운드 실행, 바로 job_id 반환)"""
+    data = request.get_json(silent=True) or {}
+    query = (data.get('query') or 'kpop').strip()
     count = data.get('count', 100)
-    
-    if count > 200:
-        return jsonify({"success": False, "message": "최대 200개까지 가능합니다."}), 400
-    
-    musics, error = music_service.bulk_import_music(query, count)
+
+    if not isinstance(count, int) or count < 1:
+        return jsonify({"success": False, "message": "count는 1 이상의 정수여야 합니다."}), 400
+
+    if count > bulk_import_service.BULK_IMPORT_MAX_COUNT:
+        return jsonify({
+            "success": False,
+            "message": f"최대 {bulk_import_service.BULK_IMPORT_MAX_COUNT}개까지 가능합니다."
+        }), 400
+
+    job, error = bulk_import_service.create_job(query, count)
     if error:
         return jsonify({"success": False, "message": error}), 500
-    
-    new_count = sum(1 for m in musics if m.get('is_new'))
-    
+
     return jsonify({
         "success": True,
-        "message": f"총 {len(musics)}곡 가져옴 (신규 {new_count}곡 저장)",
-        "data": musics
-    }), 200
+        "message": f"'{query}' {count}곡 가져오기 작업이 시작되었습니다.",
+        "data": job
+    }), 202
+
+
+def get_bulk_import_job(job_id):
+    """대량 가져오기 작업 진행 상황 조회"""
+    job, error = bulk_import_service.get_job(job_id)
+    if error:
+        status = 404 if error == "존재하지 않는 작업입니다." else 500
+        return jsonify({"success": False, "message": error}), status
 
+    return jsonify({"success": True, "data": job}), 200
@@ -1,6 +1,7 @@
 from flask import request, jsonify
 from services import playlist as playlist_svc
 from middleware.auth_utils import require_auth
+from streaming import STREAM_CHUNK_SIZE, STREAM_FORMATS, stream_response
 
 
 def _check_playlist_owner(playlist_no: int, user_no: int):
@@ -94,6 +95,15 @@ def delete_playlist(playlist_no: int):
 
 # 전체 플레이리스트 목록 조회
 def get_playlist_list():
+    stream = request.args.get('stream')
+    if stream:
+        if stream not in STREAM_FORMATS:
+            return jsonify({"success": False, "message": "stream은 ndjson 또는 json이어야 합니다."}), 400
+        chunks, error = playlist_svc.stream_playlist_list(STREAM_CHUNK_SIZE)
+        if error:
+            return jsonify({"success": False, "message": error}), 500
+        return stream_response(chunks, stream)
+
     try:
         playlists, error = playlist_svc.get_playlist_list()
         if error:
@@ -1,46 +1,639 @@
 import pymysql
 import os
+import threading
+import time
+import contextvars
+import functools
+from bisect import bisect_left
+from contextlib import contextmanager
 from dotenv import load_dotenv
 from dbutils.pooled_db import PooledDB
+from flask import g, has_app_context, has_request_context, request
+import query_log
+
+# 풀 설정을 import 시점에 읽으므로 .env를 먼저 로드
+load_dotenv()
+
+
+class PoolTimeout(Exception):
+    """DB_POOL_TIMEOUT 안에 연결을 얻지 못함 (503 + Retry-After로 응답)"""
+
+    def __init__(self, name, timeout, retry_after=1):
+        super().__init__(f"DB 연결이 부족합니다. 잠시 후 다시 시도해주세요. ({name}, {timeout}초 대기)")
+        self.retry_after = retry_after
+
+
+class _PooledConnection:
+    """풀 연결 래퍼: close() 시 연결을 풀에 반납하고 대기 슬롯을 돌려줌"""
+
+    def __init__(self, conn, release):
+        self._conn = conn
+        self._release = release
+
+    def close(self):
+        if self._release is None:
+            return
+        release, self._release = self._release, None
+        try:
+            self._conn.close()
+        finally:
+            release()
+
+    def cursor(self, *args):
+        # 모든 쿼리의 실행 시간/행 수 기록 (query_log)
+        return query_log.InstrumentedCursor(self._conn.cursor(*args))
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ManagedPool:
+    """
+    PooledDB + 연결 수 제한(admission control) + 통계
+    - 동시에 빌려줄 수 있는 연결은 max_connections개, 나머지는 timeout초까지 대기 후 PoolTimeout
+    - stats(): 사용 중/유휴/대기 수, 대기 시간 히스토그램
+    """
+
+    # 대기 시간 히스토그램 구간 상한(ms)
+    WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+    def __init__(self, name, max_connections, min_cached, max_cached, timeout, retry_after, **connect_kwargs):
+        self.name = name
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.retry_after = retry_after
+        # PooledDB는 반납된 연결을 max_cached개까지 보관하고 나머지는 닫음 (0이면 제한 없음)
+        self._max_idle = max_cached or max_connections
+        self._pool = PooledDB(
+            creator=pymysql,
+            maxconnections=max_connections,
+            mincached=min_cached,
+            maxcached=max_cached,
+            blocking=True,
+            cursorclass=pymysql.cursors.DictCursor,
+            autocommit=False,
+            **connect_kwargs
+        )
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._idle = min(min_cached, self._max_idle)    # PooledDB가 처음에 min_cached개를 미리 열어 둠
+        self._waiting = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_histogram = [0] * (len(self.WAIT_BUCKETS_MS) + 1)
+
+    def connection(self):
+        started = time.monotonic()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._waiting += 1
+            try:
+                acquired = self._slots.acquire(timeout=self.timeout)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+            if not acquired:
+                with self._lock:
+                    self._timeouts += 1
+                raise PoolTimeout(self.name, self.timeout, self.retry_after)
+
+        try:
+            conn = self._pool.connection()
+        except Exception:
+            self._slots.release()
+            raise
+
+        waited_ms = (time.monotonic() - started) * 1000
+        with self._lock:
+            self._in_use += 1
+            self._idle = max(0, self._idle - 1)
+            self._checkouts += 1
+            self._wait_histogram[bisect_left(self.WAIT_BUCKETS_MS, waited_ms)] += 1
+        return _PooledConnection(conn, self._release)
+
+    def _release(self):
+        with self._lock:
+            self._in_use -= 1
+            self._idle = min(self._idle + 1, self._max_idle)
+        self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            labels = [f"<={b}ms" for b in self.WAIT_BUCKETS_MS] + [f">{self.WAIT_BUCKETS_MS[-1]}ms"]
+            return {
+                "name": self.name,
+                "max_connections": self.max_connections,
+                "in_use": self._in_use,
+                "idle": self._idle,
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "timeout_seconds": self.timeout,
+                "wait_histogram": dict(zip(labels, self._wait_histogram))
+            }
+
 
 class DatabaseManager:
     """싱글톤 패턴의 DB Connection Pool 관리자"""
     _pool = None
     _initialized = False
-    
+    _lock = threading.Lock()
+
+    # 풀 크기/대기 시간 (워커 프로세스마다 따로 적용)
+    MAX_CONNECTIONS = int(os.getenv('DB_POOL_MAX', 10))
+    MIN_CACHED = int(os.getenv('DB_POOL_MIN_CACHED', 2))
+    MAX_CACHED = int(os.getenv('DB_POOL_MAX_CACHED', 5))
+    CHECKOUT_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 5))
+    RETRY_AFTER = int(os.getenv('DB_POOL_RETRY_AFTER', 1))
+
+    # 읽기 전용 복제본 (DB_REPLICA_HOST가 없으면 모든 쿼리를 primary로)
+    REPLICA_HOST = os.getenv('DB_REPLICA_HOST') or None
+    REPLICA_MAX_CONNECTIONS = int(os.getenv('DB_REPLICA_POOL_MAX', MAX_CONNECTIONS))
+    # 복제본 연결을 오래 기다리지 않고 primary로 넘어감
+    REPLICA_CHECKOUT_TIMEOUT = float(os.getenv('DB_REPLICA_POOL_TIMEOUT', 0.5))
+    REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', 2))
+    REPLICA_CHECK_INTERVAL = float(os.getenv('DB_REPLICA_CHECK_INTERVAL', 5))
+
+    _replica_pool = None
+    _replica_check_lock = threading.Lock()
+    _replica_checked_at = float("-inf")
+    _replica_healthy = False
+    _replica_lag = None
+    _replica_error = None
+    # MySQL 8.0.22+/MariaDB 10.5.1+는 SHOW REPLICA STATUS, 그 이전 서버는 SHOW SLAVE STATUS (문법 오류 시 한 번 바꿔서 기억)
+    _replica_status_sql = "SHOW REPLICA STATUS"
+
     @classmethod
     def get_pool(cls):
         if cls._pool is None:
-            cls._pool = PooledDB(
-                creator=pymysql,
-                maxconnections=10,
-                mincached=2,
-                maxcached=5,
-                blocking=True,
-                host=os.getenv('DB_HOST', 'localhost'),
-                port=int(os.getenv('DB_PORT', 3306)),
-                user=os.getenv('DB_USER', 'root'),
-                password=os.getenv('DB_PASSWORD', ''),
-                database=os.getenv('DB_DATABASE', 'listify'),
-                cursorclass=pymysql.cursors.DictCursor,
-                autocommit=False
-            )
-            if not cls._initialized:
-                print("✅ DB Connection Pool 생성 완료")
-                cls._initialized = True
+            with cls._lock:
+                if cls._pool is None:
+                    cls._pool = ManagedPool(
+                        "primary",
+                        max_connections=cls.MAX_CONNECTIONS,
+                        min_cached=cls.MIN_CACHED,
+                        max_cached=cls.MAX_CACHED,
+                        timeout=cls.CHECKOUT_TIMEOUT,
+                        retry_after=cls.RETRY_AFTER,
+                        host=os.getenv('DB_HOST', 'localhost'),
+                        port=int(os.getenv('DB_PORT', 3306)),
+                        user=os.getenv('DB_USER', 'root'),
+                        password=os.getenv('DB_PASSWORD', ''),
+                        database=os.getenv('DB_DATABASE', 'listify')
+                    )
+                    if not cls._initialized:
+                        print("✅ DB Connection Pool 생성 완료")
+                        cls._initialized = True
         return cls._pool
-    
+
     @classmethod
     def get_connection(cls):
-        """Connection Pool에서 연결 가져오기"""
-        return cls.get_pool().connection()
+        """Connection Pool에서 연결 가져오기 (CHECKOUT_TIMEOUT 초과 시 PoolTimeout)"""
+        try:
+            return cls.get_pool().connection()
+        except PoolTimeout as e:
+            # 서비스 계층에서 예외를 잡아 에러 문자열로 바꿔도 응답 단계에서 503으로 바꿀 수 있도록 기록
+            if has_app_context():
+                g.pool_timeout = e
+            raise
+
+    @classmethod
+    def stats(cls):
+        """풀 통계 (풀이 아직 없으면 None)"""
+        return cls._pool.stats() if cls._pool else None
+
+    @classmethod
+    def get_replica_pool(cls):
+        if cls._replica_pool is None:
+            with cls._lock:
+                if cls._replica_pool is None:
+                    cls._replica_pool = ManagedPool(
+                        "replica",
+                        max_connections=cls.REPLICA_MAX_CONNECTIONS,
+                        min_cached=0,
+                        max_cached=cls.MAX_CACHED,
+                        timeout=cls.REPLICA_CHECKOUT_TIMEOUT,
+                        retry_after=cls.RETRY_AFTER,
+                        host=cls.REPLICA_HOST,
+                        port=int(os.getenv('DB_REPLICA_PORT', os.getenv('DB_PORT', 3306))),
+                        user=os.getenv('DB_REPLICA_USER', os.getenv('DB_USER', 'root')),
+                        password=os.getenv('DB_REPLICA_PASSWORD', os.getenv('DB_PASSWORD', '')),
+                        database=os.getenv('DB_DATABASE', 'listify')
+                    )
+                    print(f"✅ DB 복제본 Connection Pool 생성 완료 ({cls.REPLICA_HOST})")
+        return cls._replica_pool
+
+    @classmethod
+    def _replica_status(cls, conn):
+        """복제 상태 한 행 (복제 설정이 없으면 None)"""
+        with conn.cursor() as cursor:
+            try:
+                cursor.execute(cls._replica_status_sql)
+            except pymysql.err.ProgrammingError as e:
+                # 1064: 이전 버전 서버라 SHOW REPLICA STATUS 문법이 없음
+                if e.args[0] != 1064 or cls._replica_status_sql == "SHOW SLAVE STATUS":
+                    raise
+                cls._replica_status_sql = "SHOW SLAVE STATUS"
+                cursor.execute(cls._replica_status_sql)
+            return cursor.fetchone()
+
+    @classmethod
+    def _set_replica_state(cls, healthy, lag, error):
+        """확인 결과 저장 (사용 가능 여부나 오류가 바뀔 때만 로그)"""
+        changed = healthy != cls._replica_healthy or error != cls._replica_error
+        cls._replica_healthy = healthy
+        cls._replica_lag = lag
+        cls._replica_error = error
+        cls._replica_checked_at = time.monotonic()
+        if not changed:
+            return
+        if healthy:
+            print(f"✅ DB 복제본 사용 (지연 {lag}초)")
+        elif error:
+            print(f"⚠️ DB 복제본 확인 실패 → primary 사용: {error}")
+        else:
+            print(f"⚠️ DB 복제본 지연 {'알 수 없음(복제 중단)' if lag is None else f'{lag}초'} → primary 사용")
+
+    @classmethod
+    def _check_replica(cls):
+        """
+        복제본 사용 가능 여부 (REPLICA_CHECK_INTERVAL마다 한 스레드만 복제 지연을 확인, 나머지는 직전 결과 사용)
+        - 연결 실패, 복제 중단(Seconds_Behind_Source가 NULL), 지연이 REPLICA_MAX_LAG초 초과 → 사용 안 함
+        - 복제본 계정에 REPLICATION CLIENT(MariaDB 10.5+는 SLAVE MONITOR) 권한이 필요
+        """
+        if time.monotonic() - cls._replica_checked_at < cls.REPLICA_CHECK_INTERVAL:
+            return cls._replica_healthy
+        if not cls._replica_check_lock.acquire(blocking=False):
+            return cls._replica_healthy
+        try:
+            conn = cls.get_replica_pool().connection()
+            try:
+                status = cls._replica_status(conn)
+            finally:
+                conn.close()
+            # 복제 설정이 없는 서버(예: 개발 환경에서 primary를 그대로 지정)는 지연 0으로 취급
+            if status is None:
+                lag = 0
+            elif 'Seconds_Behind_Source' in status:
+                lag = status['Seconds_Behind_Source']
+            else:
+                lag = status.get('Seconds_Behind_Master')
+            cls._set_replica_state(lag is not None and lag <= cls.REPLICA_MAX_LAG, lag, None)
+        except Exception as e:
+            error = str(e)
+            if isinstance(e, pymysql.MySQLError) and e.args and e.args[0] == 1227:
+                error += " (복제본 계정에 REPLICATION CLIENT 또는 SLAVE MONITOR 권한 필요)"
+            cls._set_replica_state(False, None, error)
+        finally:
+            cls._replica_checked_at = time.monotonic()
+            cls._replica_check_lock.release()
+        return cls._replica_healthy
+
+    @classmethod
+    def get_replica_connection(cls):
+        """복제본 연결 (설정이 없거나, 지연 중이거나, 연결을 얻지 못하면 None → primary 사용)"""
+        if not cls.REPLICA_HOST or not cls._check_replica():
+            return None
+        try:
+            return cls.get_replica_pool().connection()
+        except PoolTimeout:
+            return None
+        except Exception as e:
+            # 연결 오류 → 다음 확인 시점까지 primary 사용
+            cls._set_replica_state(False, None, str(e))
+            return None
+
+    @classmethod
+    def replica_stats(cls):
+        """복제본 풀 통계 + 마지막 지연 확인 결과 (설정이 없으면 None)"""
+        if not cls.REPLICA_HOST:
+            return None
+        return {
+            "pool": cls._replica_pool.stats() if cls._replica_pool else None,
+            "healthy": cls._replica_healthy,
+            "lag_seconds": cls._replica_lag,
+            "max_lag_seconds": cls.REPLICA_MAX_LAG,
+            "error": cls._replica_error
+        }
+
+
+class _UnitOfWork:
+    """
+    요청 하나(또는 요청 밖의 transaction() 블록)가 공유하는 연결
+    - 처음 get_connection() 할 때 풀에서 빌리고, release() 때 반납
+    - model 함수의 commit()은 dirty 표시만 하고 실제 commit은 단위가 끝날 때 한 번
+    - commit 대기 중인 쓰기가 있으면 get_connection()마다 SAVEPOINT → model 함수의 rollback()은 그 지점까지만 되돌림
+    - @read_only 함수는 복제본 연결을 따로 빌려 씀 (쓰기 이후/transaction() 안/sticky 요청은 primary)
+    """
+
+    def __init__(self, sticky=False):
+        # context를 복사해 간 다른 스레드(executor 작업 등)는 이 연결을 쓰지 않음 (pymysql 연결은 스레드 안전하지 않음)
+        self.owner = threading.get_ident()
+        self.conn = None
+        self.replica = None
+        self.dirty = False
+        self.wrote = False      # 이번 단위에서 쓰기가 있었음 → 이후 읽기도 primary (read-your-writes)
+        self.sticky = sticky    # 직전 요청에서 쓰기를 한 클라이언트 → 처음부터 primary
+        self.savepoints = 0
+
+    def connection(self, read_only=False):
+        if read_only and not self.wrote and not self.sticky:
+            if self.replica is None:
+                self.replica = DatabaseManager.get_replica_connection()
+            if self.replica is not None:
+                return _SharedConnection(self, self.replica)
+        if self.conn is None:
+            self.conn = DatabaseManager.get_connection()
+        savepoint = self.savepoint() if self.dirty else None
+        return _SharedConnection(self, self.conn, savepoint)
+
+    def savepoint(self):
+        """primary 연결에 SAVEPOINT를 만들고 이름 반환"""
+        self.savepoints += 1
+        name = f"uow_{self.savepoints}"
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"SAVEPOINT {name}")
+        return name
+
+    def rollback_to(self, savepoint):
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+
+    def commit(self):
+        if self.conn is not None and self.dirty:
+            self.conn.commit()
+        self.dirty = False
+
+    def rollback(self):
+        if self.conn is not None:
+            self.conn.rollback()
+        self.dirty = False
+
+    def release(self):
+        """연결 반납 (commit하지 않은 내용은 풀에서 rollback됨)"""
+        for attr in ("conn", "replica"):
+            conn = getattr(self, attr)
+            if conn is not None:
+                setattr(self, attr, None)
+                conn.close()
+        self.dirty = False
+
+
+class _SharedConnection:
+    """
+    공유 연결 프록시: close()는 무시, commit()은 단위가 끝날 때로 미룸
+    - rollback()은 이 프록시를 받은 시점의 SAVEPOINT까지만 되돌림 (그 전에 commit한 쓰기는 유지)
+    """
+
+    def __init__(self, unit, conn, savepoint=None):
+        self._unit = unit
+        self._conn = conn
+        self._savepoint = savepoint
+
+    def commit(self):
+        if self._conn is self._unit.conn:
+            self._unit.dirty = self._unit.wrote = True
+
+    def rollback(self):
+        if self._conn is not self._unit.conn:
+            self._conn.rollback()
+        elif self._savepoint is not None:
+            self._unit.rollback_to(self._savepoint)
+        else:
+            self._unit.rollback()
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class _RecentWriters:
+    """
+    쓰기를 한 클라이언트 → STICKY_SECONDS 동안 primary에서만 읽기 (복제 지연 중에도 방금 쓴 내용이 보이도록)
+    - 워커 프로세스마다 따로 기록 (다른 워커로 간 요청은 복제 지연 확인(REPLICA_MAX_LAG)에 의존)
+    """
+    STICKY_SECONDS = float(os.getenv('DB_PRIMARY_STICKY_SECONDS', 5))
+    MAX_ENTRIES = 10000
+
+    _until = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def client_key():
+        return request.headers.get('Authorization') or request.remote_addr
+
+    @classmethod
+    def mark(cls, key):
+        now = time.monotonic()
+        with cls._lock:
+            if len(cls._until) >= cls.MAX_ENTRIES:
+                cls._until = {k: t for k, t in cls._until.items() if t > now}
+            cls._until[key] = now + cls.STICKY_SECONDS
+
+    @classmethod
+    def is_sticky(cls, key):
+        with cls._lock:
+            return cls._until.get(key, 0) > time.monotonic()
+
+
+_read_only = contextvars.ContextVar("db_read_only", default=False)
+_transaction_unit = contextvars.ContextVar("db_transaction_unit", default=None)
+
+
+def read_only(fn):
+    """SELECT만 하는 model 함수 표시 → 복제본이 있으면 복제본에서 실행"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+    return wrapper
+
+
+def _current_unit():
+    unit = _transaction_unit.get()
+    if unit is None and has_request_context():
+        unit = g.get('_db_unit')
+    if unit is None or unit.owner != threading.get_ident():
+        return None
+    return unit
 
 
 def get_connection():
-    """외부에서 사용할 통합 연결 함수"""
+    """
+    외부에서 사용할 통합 연결 함수
+    - 요청 처리 중이거나 transaction() 블록 안이면 공유 연결 (close()/commit()은 단위가 끝날 때 처리)
+    - 그 밖(스크립트, 백그라운드 스레드)에서는 풀에서 바로 빌린 연결
+    - @read_only 함수 안에서는 가능하면 복제본 연결
+    """
+    unit = _current_unit()
+    if unit is not None:
+        return unit.connection(read_only=_read_only.get())
+    if _read_only.get():
+        conn = DatabaseManager.get_replica_connection()
+        if conn is not None:
+            return conn
+    return DatabaseManager.get_connection()
+
+
+@contextmanager
+def transaction():
+    """
+    블록 안의 쓰기를 한 트랜잭션으로 묶음 (with transaction() as conn)
+    - 요청 처리 중이거나 다른 transaction() 안이면 공유 연결에 SAVEPOINT
+      → 예외 시 그 지점까지만 rollback 후 다시 raise, commit은 바깥 단위가 끝날 때
+    - 그 밖(스크립트, 백그라운드 스레드)이면 연결을 새로 빌려 블록이 끝날 때 commit (예외 시 rollback) 후 반납
+    - 블록 안의 model 호출도 같은 연결을 씀
+    """
+    unit = _current_unit()
+    owned = unit is None
+    if owned:
+        unit = _UnitOfWork()
+    token = _transaction_unit.set(unit)
+    try:
+        if unit.conn is None:
+            unit.conn = DatabaseManager.get_connection()
+        savepoint = None if owned else unit.savepoint()
+        # 블록 안에서 commit() 없이 실행한 쓰기도 단위가 끝날 때 commit되도록 처음부터 dirty
+        unit.dirty = unit.wrote = True
+        try:
+            yield _SharedConnection(unit, unit.conn, savepoint)
+        except BaseException:
+            if savepoint is not None:
+                unit.rollback_to(savepoint)
+            else:
+                unit.rollback()
+            raise
+        if owned:
+            unit.commit()
+    finally:
+        _transaction_unit.reset(token)
+        if owned:
+            unit.release()
+
+
+def get_dedicated_connection(read_only=False):
+    """
+    요청 공유 연결과 별개로 빌린 연결 (close() 하면 바로 반납)
+    - 서버 측 커서처럼 연결을 오래 점유하는 작업용
+    - read_only면 복제본 사용 (현재 요청이 쓰기를 했으면 primary)
+    """
+    unit = _current_unit()
+    if read_only and not (unit is not None and (unit.wrote or unit.sticky)):
+        conn = DatabaseManager.get_replica_connection()
+        if conn is not None:
+            return conn
     return DatabaseManager.get_connection()
 
 
+class RowStream:
+    """
+    서버 측 커서(SSDictCursor) 결과를 chunk_size행씩 내보내는 이터레이터
+    - 결과 전체를 메모리에 올리지 않으므로 행 수와 관계없이 메모리 사용량이 일정
+    - 끝까지 읽거나 close() 하면 커서를 닫고 연결 반납 (응답 전송이 중단돼도 close()가 호출됨)
+    """
+
+    def __init__(self, conn, cursor, chunk_size):
+        self._conn = conn
+        self._cursor = cursor
+        self._chunk_size = chunk_size
+        self._transform = None
+
+    def map(self, fn):
+        """각 행에 fn 적용 (서비스 계층의 날짜 포맷 등)"""
+        self._transform = fn
+        return self
+
+    def __iter__(self):
+        try:
+            while self._conn is not None:
+                rows = self._cursor.fetchmany(self._chunk_size)
+                if not rows:
+                    break
+                yield [self._transform(r) for r in rows] if self._transform else rows
+        finally:
+            self.close()
+
+    def close(self):
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        try:
+            # 남은 결과를 서버에서 마저 읽어 버린 뒤 닫힘
+            self._cursor.close()
+        finally:
+            conn.close()
+
+
+def stream_query(sql, params=None, chunk_size=500, read_only=True):
+    """
+    SELECT를 서버 측 커서로 실행 → RowStream
+    - 쿼리 오류/연결 대기 시간 초과는 스트리밍을 시작하기 전에 여기서 발생
+    """
+    conn = get_dedicated_connection(read_only)
+    try:
+        cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+        cursor.execute(sql, params)
+    except Exception:
+        conn.close()
+        raise
+    return RowStream(conn, cursor, chunk_size)
+
+
+def release_idle_connection():
+    """요청 연결에 commit할 쓰기가 없으면 풀에 먼저 반납 (Spotify 호출처럼 오래 걸리는 작업 전에 호출)"""
+    unit = _current_unit()
+    if unit is not None and not unit.dirty:
+        unit.release()
+
+
+def init_app(app):
+    """
+    요청마다 연결 하나를 공유 (처음 get_connection() 할 때 빌림)
+    - 응답 전에 쓰기가 있었으면 한 번 commit (5xx 응답이면 rollback), 읽기만 한 요청은 commit 없이 반납
+    - 쓰기를 한 클라이언트의 다음 요청들은 잠시 primary에서만 읽음
+    """
+
+    @app.before_request
+    def _begin_request_unit():
+        sticky = bool(DatabaseManager.REPLICA_HOST) and _RecentWriters.is_sticky(_RecentWriters.client_key())
+        g._db_unit = _UnitOfWork(sticky=sticky)
+
+    @app.after_request
+    def _commit_request_unit(response):
+        unit = g.get('_db_unit')
+        if unit is not None and unit.dirty:
+            if response.status_code >= 500:
+                unit.rollback()
+            else:
+                unit.commit()
+        if unit is not None and unit.wrote and DatabaseManager.REPLICA_HOST:
+            _RecentWriters.mark(_RecentWriters.client_key())
+        return response
+
+    @app.teardown_request
+    def _release_request_unit(exc):
+        unit = g.pop('_db_unit', None)
+        if unit is None:
+            return
+        try:
+            if exc is not None:
+                unit.rollback()
+        finally:
+            unit.release()
+
+
 # 기존 호환성 유지용 함수 (deprecated)
 def connect_to_mysql(host, port, user, password, database):
     """
@@ -0,0 +1,402 @@
+# gen_dataset.py - 부하 테스트용 대규모 합성 데이터 생성 (Spotify 불필요, 같은 --seed면 같은 데이터)
+# 실행: python gen_dataset.py --users 10000 --playlists 5 --songs 30 --tracks 50000 --seed 42
+#   - 곡 인기도는 Zipf 분포, 사용자는 선호 장르가 있고, 곡 추가 시각은 저녁/주말에 몰림
+#   - 기본은 multi-row INSERT, --load-data는 LOAD DATA LOCAL INFILE (서버 local_infile=ON 필요)
+#   - 삭제: python gen_dataset.py --purge --seed 42 (해당 seed로 만든 사용자/플레이리스트/곡, AUTO_INCREMENT도 되돌림)
+#   - 모든 사용자 비밀번호: synthetic123! (해시도 seed로 고정)
+#   - seed는 0~99, PK는 seed별 고정 구간(SYNTH_ID_BASE + seed * SEED_ID_SPAN부터)을 사용하므로 DB 상태와 무관하게 같은 행이 생김
+#     (데이터가 남아 있는 동안은 실제 데이터의 AUTO_INCREMENT도 이 구간(최대 2억) 뒤로 밀리므로 부하 테스트용 DB에서만 실행)
+#   - 그 구간에 이미 행이 있으면 아무것도 하지 않음 (다시 만들려면 --purge 후 실행)
+import argparse
+import base64
+import bisect
+import itertools
+import math
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import bcrypt
+import pymysql
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from db import get_connection
+from services import genre as genre_service
+
+PASSWORD = "synthetic123!"
+EMAIL_DOMAIN = "listify.test"
+
+# seed별 PK 구간 (music/user/playlist 각각 SYNTH_ID_BASE + seed * SEED_ID_SPAN부터 SEED_ID_SPAN개)
+# - 전체 구간이 1억~2억이라 AUTO_INCREMENT가 밀려도 INT 최댓값(약 21억)까지 여유가 있음
+SYNTH_ID_BASE = 100_000_000
+SEED_ID_SPAN = 1_000_000
+SEED_SLOTS = 100
+SYNTH_TABLES = (("music", "music_no"), ("user", "user_no"), ("playlist", "playlist_no"))
+
+# bcrypt salt는 표준 base64와 글자 순서만 다른 자체 base64를 사용
+_B64 = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+_BCRYPT_B64 = b"./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+
+# 장르별 오디오 특성 평균 (energy, danceability, valence, acousticness, instrumentalness), 0~100
+GENRE_PROFILES = {
+    "K-Pop": (75, 75, 65, 15, 2),
+    "Pop": (65, 68, 55, 20, 2),
+    "Hip-Hop": (65, 80, 50, 12, 3),
+    "R&B": (50, 65, 45, 30, 3),
+    "Rock": (80, 50, 45, 10, 8),
+    "Metal": (92, 40, 30, 4, 15),
+    "Indie": (55, 55, 45, 40, 12),
+    "Jazz": (35, 55, 50, 70, 40),
+    "Electronic": (85, 70, 45, 5, 50),
+    "Classical": (20, 25, 30, 90, 85),
+}
+DEFAULT_PROFILE = (55, 55, 50, 30, 10)
+
+# 곡 추가 시각 분포 (0~23시 가중치, 저녁 시간대에 몰림)
+HOUR_WEIGHTS = [2, 1, 1, 1, 1, 1, 2, 4, 5, 5, 5, 6, 7, 6, 6, 6, 7, 8, 10, 12, 14, 14, 12, 6]
+WEEKEND_BONUS = 1.5
+
+WORDS = ["love", "night", "dream", "blue", "summer", "star", "heart", "fire", "rain", "moon",
+         "dance", "city", "light", "wave", "gold", "sky", "road", "home", "baby", "forever",
+         "사랑", "밤", "꿈", "여름", "별", "바다", "하늘", "봄날", "비", "너"]
+NAME_PARTS = ["Kim", "Lee", "Park", "Choi", "Jung", "Neon", "Lunar", "Velvet", "Echo", "Nova",
+              "Crystal", "Midnight", "Golden", "Silver", "Urban", "Blue", "Seoul", "Paper", "Red", "Wild"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="부하 테스트용 합성 데이터 생성")
+    parser.add_argument("--seed", type=int, default=42, help=f"난수 시드 0~{SEED_SLOTS - 1} (같으면 같은 데이터)")
+    parser.add_argument("--users", type=int, default=1000, help="사용자 수")
+    parser.add_argument("--playlists", type=float, default=5, help="사용자당 평균 플레이리스트 수")
+    parser.add_argument("--songs", type=float, default=30, help="플레이리스트당 평균 곡 수")
+    parser.add_argument("--tracks", type=int, default=20000, help="곡 수")
+    parser.add_argument("--zipf", type=float, default=1.1, help="곡 선택 편향 (클수록 인기곡에 몰림)")
+    parser.add_argument("--now", default="2025-12-31T23:00:00", help="기준 시각 (재현성을 위해 고정)")
+    parser.add_argument("--batch", type=int, default=2000, help="INSERT 한 번에 넣을 행 수")
+    parser.add_argument("--load-data", action="store_true", help="LOAD DATA LOCAL INFILE 사용")
+    parser.add_argument("--purge", action="store_true", help="이 seed로 만든 데이터 삭제 후 종료")
+    return parser.parse_args()
+
+
+# ---------------------------------------------------------------------------
+# 저장 방식
+# ---------------------------------------------------------------------------
+
+class InsertWriter:
+    """multi-row INSERT (executemany) + batch마다 commit"""
+
+    def __init__(self, conn, batch):
+        self.conn = conn
+        self.batch = batch
+
+    def write(self, table, columns, rows):
+        sql = f"INSERT INTO `{table}` ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        count = 0
+        with self.conn.cursor() as c:
+            while True:
+                chunk = list(itertools.islice(rows, self.batch))
+                if not chunk:
+                    break
+                c.executemany(sql, chunk)
+                self.conn.commit()
+                count += len(chunk)
+        return count
+
+
+def _tsv_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+class LoadDataWriter:
+    """임시 TSV 파일 → LOAD DATA LOCAL INFILE (테이블마다 한 번)"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def write(self, table, columns, rows):
+        fd, path = tempfile.mkstemp(prefix=f"gen-{table}-", suffix=".tsv")
+        count = 0
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for row in rows:
+                    f.write("\t".join(_tsv_value(v) for v in row) + "\n")
+                    count += 1
+            with self.conn.cursor() as c:
+                c.execute(
+                    f"LOAD DATA LOCAL INFILE %s INTO TABLE `{table}` CHARACTER SET utf8mb4 "
+                    f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({', '.join(columns)})",
+                    (path,)
+                )
+            self.conn.commit()
+            return count
+        finally:
+            os.remove(path)
+
+
+def _local_infile_connection():
+    """LOAD DATA LOCAL은 커넥션 옵션이 필요해서 풀 대신 별도 연결 사용"""
+    return pymysql.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', 3306)),
+        user=os.getenv('DB_USER', 'root'),
+        password=os.getenv('DB_PASSWORD', ''),
+        database=os.getenv('DB_DATABASE', 'listify'),
+        cursorclass=pymysql.cursors.DictCursor,
+        local_infile=True,
+        autocommit=False
+    )
+
+
+# ---------------------------------------------------------------------------
+# 데이터 생성
+# ---------------------------------------------------------------------------
+
+def _clamp(value, low=0, high=100):
+    return max(low, min(high, int(round(value))))
+
+
+def _title(rng, words=(1, 3)):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(*words))).title()
+
+
+def _zipf_cum_weights(n, s):
+    """순위 0..n-1의 Zipf 누적 가중치"""
+    total = 0.0
+    cum = []
+    for rank in range(n):
+        total += 1.0 / (rank + 1) ** s
+        cum.append(total)
+    return cum
+
+
+def _random_time(rng, start, end):
+    """start~end 사이 시각 (저녁/주말 편향)"""
+    span_days = max(0, (end - start).days)
+    while True:
+        day = start + timedelta(days=rng.randint(0, span_days))
+        weight = WEEKEND_BONUS if day.weekday() >= 5 else 1.0
+        if rng.random() * WEEKEND_BONUS < weight:
+            break
+    hour = rng.choices(range(24), weights=HOUR_WEIGHTS)[0]
+    t = day.replace(hour=hour, minute=rng.randint(0, 59), second=rng.randint(0, 59))
+    return min(max(t, start), end)
+
+
+class Generator:
+    def __init__(self, args, genres, ids):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.now = datetime.fromisoformat(args.now)
+        self.genres = genres            # [(genre_no, name)]
+        self.music_start, self.user_start, self.playlist_start = ids
+        self.tag = f"synth{args.seed}"
+        self.user_created = []          # 사용자별 가입 시각 (플레이리스트 생성 시각의 하한)
+        self.playlists = []             # 저장 대기 중인 playlist 행
+        self.songs = []                 # 저장 대기 중인 music_list 행
+
+        # 곡 순위(인기순)를 섞어서 music_no 순서와 인기도가 상관없도록 함
+        self.track_rank = list(range(args.tracks))
+        self.rng.shuffle(self.track_rank)
+        self.track_genre = [self.rng.randrange(len(genres)) for _ in range(args.tracks)]
+
+        # 전체/장르별 Zipf 표본 (순위 순으로 정렬한 곡 index + 누적 가중치)
+        by_rank = sorted(range(args.tracks), key=lambda i: self.track_rank[i])
+        self.all_tracks = by_rank
+        self.all_cum = _zipf_cum_weights(len(by_rank), args.zipf)
+        self.genre_tracks = [[i for i in by_rank if self.track_genre[i] == g] for g in range(len(genres))]
+        self.genre_cum = [_zipf_cum_weights(len(t), args.zipf) for t in self.genre_tracks]
+
+    def _pick(self, tracks, cum):
+        return tracks[bisect.bisect_left(cum, self.rng.random() * cum[-1])]
+
+    def music_rows(self):
+        rng = self.rng
+        artists = [f"{rng.choice(NAME_PARTS)} {rng.choice(NAME_PARTS)}" for _ in range(max(1, self.args.tracks // 8))]
+        artist_cum = _zipf_cum_weights(len(artists), 0.8)
+        for i in range(self.args.tracks):
+            genre_no, genre_name = self.genres[self.track_genre[i]]
+            profile = GENRE_PROFILES.get(genre_name, DEFAULT_PROFILE)
+            features = [_clamp(rng.gauss(mean, 12)) for mean in profile]
+            popularity = _clamp(100 * (1 - math.log1p(self.track_rank[i]) / math.log1p(self.args.tracks)) + rng.gauss(0, 5))
+            release = self.now - timedelta(days=int(rng.expovariate(1 / 2500)))
+            track_id = f"{self.tag}-{i:08d}"
+            yield (
+                self.music_start + i, track_id, _title(rng), self._pick(artists, artist_cum), _title(rng, (1, 2)),
+                f"https://i.scdn.co/image/{track_id}", _clamp(rng.gauss(210000, 40000), 60000, 600000),
+                popularity, f"https://open.spotify.com/track/{track_id}", genre_no,
+                release.date(), release.year, *features
+            )
+
+    def user_rows(self, password_hash):
+        rng = self.rng
+        for i in range(self.args.users):
+            created = self.now - timedelta(days=rng.randint(30, 3 * 365), seconds=rng.randint(0, 86399))
+            self.user_created.append(created)
+            yield (self.user_start + i, 1, f"{self.tag}-{i}@{EMAIL_DOMAIN}", password_hash,
+                   f"합성유저{i}"[:30], created, created, 0)
+
+    def fill_playlists(self):
+        """플레이리스트/담긴 곡을 만들어 self.playlists/self.songs에 쌓고, 일정량마다 yield"""
+        rng = self.rng
+        playlist_no = self.playlist_start
+        for u in range(self.args.users):
+            user_no = self.user_start + u
+            favorite = rng.randrange(len(self.genres))
+            count = int(rng.expovariate(1 / self.args.playlists)) if self.args.playlists > 0 else 0
+            for _ in range(count):
+                if playlist_no >= self.playlist_start + SEED_ID_SPAN:
+                    raise ValueError(f"플레이리스트가 seed별 PK 구간({SEED_ID_SPAN:,}개)을 넘음")
+                created = _random_time(rng, self.user_created[u], self.now)
+                size = min(500, int(rng.lognormvariate(math.log(max(self.args.songs, 1)) - 0.32, 0.8)))
+                picked = {}
+                for _ in range(size * 2):
+                    if len(picked) >= size:
+                        break
+                    if rng.random() < 0.6 and self.genre_tracks[favorite]:
+                        track = self._pick(self.genre_tracks[favorite], self.genre_cum[favorite])
+                    else:
+                        track = self._pick(self.all_tracks, self.all_cum)
+                    if track not in picked:
+                        picked[track] = _random_time(rng, created, self.now)
+                updated = max(picked.values(), default=created)
+                self.playlists.append((playlist_no, user_no, _title(rng, (1, 3))[:40], None, created, updated))
+                self.songs.extend((playlist_no, self.music_start + t, added) for t, added in picked.items())
+                playlist_no += 1
+                if len(self.songs) >= self.args.batch * 10:
+                    yield
+        yield
+
+
+# ---------------------------------------------------------------------------
+# 실행
+# ---------------------------------------------------------------------------
+
+def _id_start(seed):
+    return SYNTH_ID_BASE + seed * SEED_ID_SPAN
+
+
+def _password_hash(seed):
+    """seed로 만든 고정 salt의 bcrypt 해시 (실행할 때마다 같은 값)"""
+    raw = random.Random(f"password-{seed}").randbytes(16)
+    salt = b"$2b$12$" + base64.b64encode(raw).translate(bytes.maketrans(_B64, _BCRYPT_B64))[:22]
+    return bcrypt.hashpw(PASSWORD.encode('utf-8'), salt).decode('utf-8')
+
+
+def _occupied_tables(conn, start):
+    """PK 구간 [start, start + SEED_ID_SPAN)에 이미 행이 있는 테이블 목록"""
+    occupied = []
+    with conn.cursor() as c:
+        for table, pk in SYNTH_TABLES:
+            c.execute(f"SELECT 1 FROM `{table}` WHERE {pk} BETWEEN %s AND %s LIMIT 1",
+                      (start, start + SEED_ID_SPAN - 1))
+            if c.fetchone():
+                occupied.append(table)
+    return occupied
+
+
+def _load_genres():
+    """genre 테이블 (비어 있으면 GENRE_PROFILES의 장르 생성)"""
+    for name in GENRE_PROFILES:
+        genre_service.get_or_create_genre(name)
+    genre_service.load()
+    return sorted((genre_service.get_genre_no(name), name) for name in GENRE_PROFILES)
+
+
+def purge(conn, seed):
+    tag = f"synth{seed}"
+    with conn.cursor() as c:
+        c.execute(
+            "DELETE ml FROM music_list ml JOIN playlist p ON ml.playlist_no = p.playlist_no "
+            "JOIN user u ON p.user_no = u.user_no WHERE u.email LIKE %s", (f"{tag}-%@{EMAIL_DOMAIN}",)
+        )
+        c.execute(
+            "DELETE p FROM playlist p JOIN user u ON p.user_no = u.user_no WHERE u.email LIKE %s",
+            (f"{tag}-%@{EMAIL_DOMAIN}",)
+        )
+        c.execute("DELETE FROM user WHERE email LIKE %s", (f"{tag}-%@{EMAIL_DOMAIN}",))
+        c.execute("DELETE FROM music_list WHERE music_no IN "
+                  "(SELECT music_no FROM music WHERE spotify_track_id LIKE %s)", (f"{tag}-%",))
+        c.execute("DELETE FROM music WHERE spotify_track_id LIKE %s", (f"{tag}-%",))
+    conn.commit()
+    # 합성 데이터 때문에 밀린 AUTO_INCREMENT를 남은 행의 최댓값 + 1로 되돌림 (더 작은 값을 지정하면 InnoDB가 그렇게 맞춤)
+    with conn.cursor() as c:
+        for table, _ in SYNTH_TABLES:
+            c.execute(f"ALTER TABLE `{table}` AUTO_INCREMENT = 1")
+    print(f"🧹 seed {seed} 데이터 삭제 완료")
+
+
+def main():
+    args = parse_args()
+    conn = _local_infile_connection() if args.load_data else get_connection()
+    try:
+        if args.purge:
+            purge(conn, args.seed)
+            return
+
+        if not 0 <= args.seed < SEED_SLOTS:
+            print(f"❌ --seed는 0~{SEED_SLOTS - 1}만 가능 (seed마다 PK 구간이 따로 있음)")
+            return
+        if max(args.tracks, args.users) > SEED_ID_SPAN:
+            print(f"❌ --tracks/--users는 {SEED_ID_SPAN:,} 이하만 가능")
+            return
+        start = _id_start(args.seed)
+        occupied = _occupied_tables(conn, start)
+        if occupied:
+            print(f"⏭️ seed {args.seed}의 PK 구간에 이미 데이터가 있음 ({', '.join(occupied)}) "
+                  f"(다시 만들려면 --purge --seed {args.seed} 후 실행)")
+            return
+
+        writer = LoadDataWriter(conn) if args.load_data else InsertWriter(conn, args.batch)
+        genres = _load_genres()
+        gen = Generator(args, genres, (start, start, start))
+
+        def timed(name, fn):
+            started = time.perf_counter()
+            count = fn()
+            elapsed = time.perf_counter() - started
+            print(f"  ✅ {name:<11} {count:>10,}행  {elapsed:7.1f}s  ({count / max(elapsed, 1e-9):,.0f}행/s)")
+            return count
+
+        print(f"🎲 합성 데이터 생성 (seed={args.seed}, {'LOAD DATA' if args.load_data else 'INSERT'})")
+        timed("music", lambda: writer.write("music", (
+            "music_no", "spotify_track_id", "track_name", "artist_name", "album_name", "album_image_url",
+            "duration_ms", "popularity", "spotify_url", "genre_no", "release_date", "release_year",
+            "energy", "danceability", "valence", "acousticness", "instrumentalness"
+        ), gen.music_rows()))
+
+        password_hash = _password_hash(args.seed)
+        timed("user", lambda: writer.write("user", (
+            "user_no", "role_no", "email", "password", "nickname", "created_at", "updated_at", "is_deleted"
+        ), gen.user_rows(password_hash)))
+
+        # 플레이리스트/곡은 일정량씩 만들어서 저장 (메모리 제한)
+        totals = {"playlist": 0, "music_list": 0}
+
+        def write_playlists():
+            for _ in gen.fill_playlists():
+                totals["playlist"] += writer.write("playlist", (
+                    "playlist_no", "user_no", "title", "content", "created_at", "updated_at"
+                ), iter(gen.playlists))
+                totals["music_list"] += writer.write("music_list", (
+                    "playlist_no", "music_no", "added_at"
+                ), iter(gen.songs))
+                gen.playlists.clear()
+                gen.songs.clear()
+            return totals["playlist"] + totals["music_list"]
+
+        timed("playlists", write_playlists)
+        print(f"🎉 완료: 플레이리스트 {totals['playlist']:,}개, 담긴 곡 {totals['music_list']:,}개")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# migrate.py - migrations/*.sql 파일을 파일명 순서대로 적용
+# 실행: python migrate.py
+import glob
+import os
+
+import pymysql
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from db import get_connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# 이미 적용된 변경으로 보고 건너뛸 에러 코드
+# 1050: 테이블 존재, 1060: 컬럼 존재, 1061: 인덱스 이름 중복, 1091: 삭제할 키 없음
+IGNORABLE_ERRORS = {1050, 1060, 1061, 1091}
+
+
+def split_statements(sql):
+    """주석(--) 제거 후 ';' 기준으로 SQL 문장 분리"""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [s.strip() for s in "\n".join(lines).split(";") if s.strip()]
+
+
+def apply_file(conn, path):
+    with open(path, encoding="utf-8") as f:
+        statements = split_statements(f.read())
+
+    with conn.cursor() as c:
+        for stmt in statements:
+            try:
+                c.execute(stmt)
+            except (pymysql.err.OperationalError, pymysql.err.InternalError) as e:
+                if e.args[0] in IGNORABLE_ERRORS:
+                    print(f"  ⏭️  이미 적용됨: {e.args[1]}")
+                    continue
+                raise
+    conn.commit()
+
+
+def main():
+    paths = sorted(glob.glob(os.path.join(MIGRATIONS_DIR, "*.sql")))
+    conn = get_connection()
+    try:
+        for path in paths:
+            print(f"▶ {os.path.basename(path)}")
+            apply_file(conn, path)
+    finally:
+        conn.close()
+    print(f"🎉 마이그레이션 {len(paths)}개 적용 완료")
+
+
+if __name__ == "__main__":
+    main()
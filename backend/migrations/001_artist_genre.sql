@@ -0,0 +1,9 @@
+-- Spotify 아티스트 → 장르 캐시 (재시작/워커 간 공유)
+-- 원본 장르만 저장하고 genre_no는 읽을 때 다시 매칭 (매칭 규칙이 바뀌어도 Spotify를 다시 조회하지 않음)
+-- genres가 빈 문자열이면 "조회했지만 장르 정보 없음"
+CREATE TABLE IF NOT EXISTS artist_genre (
+    spotify_artist_id VARCHAR(50) NOT NULL PRIMARY KEY,
+    genres            VARCHAR(1000) NOT NULL DEFAULT '',
+    updated_at        DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    KEY idx_artist_genre_updated_at (updated_at)
+);
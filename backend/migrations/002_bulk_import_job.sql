@@ -0,0 +1,18 @@
+-- 대량 가져오기(bulk import) 작업 진행 상황
+-- status: queued → running → done / failed
+-- 페이지마다 next_offset과 카운트를 기록해서 중단되면 이어서 진행
+CREATE TABLE IF NOT EXISTS bulk_import_job (
+    job_id        CHAR(32) NOT NULL PRIMARY KEY,
+    query         VARCHAR(255) NOT NULL,
+    target_count  INT(11) NOT NULL,
+    next_offset   INT(11) NOT NULL DEFAULT 0,
+    fetched_count INT(11) NOT NULL DEFAULT 0,
+    saved_count   INT(11) NOT NULL DEFAULT 0,
+    new_count     INT(11) NOT NULL DEFAULT 0,
+    status        VARCHAR(20) NOT NULL DEFAULT 'queued',
+    error         VARCHAR(1000) NULL,
+    heartbeat_at  DATETIME NULL,
+    created_at    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    KEY idx_bulk_import_job_status (status)
+);
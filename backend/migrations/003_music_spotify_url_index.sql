@@ -0,0 +1,2 @@
+-- spotify_url 중복 체크가 풀 스캔이 되지 않도록 인덱스 추가
+CREATE INDEX idx_music_spotify_url ON music (spotify_url);
@@ -0,0 +1,19 @@
+-- Spotify 차트 플레이리스트 스냅샷
+-- chart: 차트별 플레이리스트/마켓과 마지막으로 저장한 snapshot_id
+-- chart_entry: 해당 스냅샷의 순위별 곡
+CREATE TABLE IF NOT EXISTS chart (
+    chart_key    VARCHAR(50) NOT NULL PRIMARY KEY,
+    playlist_id  VARCHAR(50) NOT NULL,
+    market       VARCHAR(2) NULL,
+    snapshot_id  VARCHAR(100) NULL,
+    checked_at   DATETIME NULL,
+    refreshed_at DATETIME NULL
+);
+
+CREATE TABLE IF NOT EXISTS chart_entry (
+    chart_key VARCHAR(50) NOT NULL,
+    position  INT(11) NOT NULL,
+    music_no  INT(11) NOT NULL,
+    PRIMARY KEY (chart_key, position),
+    KEY idx_chart_entry_music_no (music_no)
+);
@@ -0,0 +1,3 @@
+-- 로컬 검색용 FULLTEXT 인덱스 (한글 검색을 위해 ngram 파서 사용, MySQL 5.7.6+)
+-- 기본 ngram_token_size=2 → 두 글자 이상 검색어부터 인덱스 사용
+CREATE FULLTEXT INDEX ft_music_search ON music (track_name, artist_name, album_name) WITH PARSER ngram;
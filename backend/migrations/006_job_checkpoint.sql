@@ -0,0 +1,7 @@
+-- 오래 걸리는 배치 작업의 진행 위치 (중단 후 이어서 실행)
+-- last_key: 마지막으로 처리한 기본키 (예: music_no)
+CREATE TABLE IF NOT EXISTS job_checkpoint (
+    job_name   VARCHAR(50) NOT NULL PRIMARY KEY,
+    last_key   BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
@@ -0,0 +1,4 @@
+-- bulk import 작업을 실행 중인 워커 표시
+-- claim_job 때마다 새 토큰을 기록하고, 진행 기록/heartbeat/종료는 토큰이 같을 때만 반영
+-- (heartbeat가 끊겨 다른 워커가 가져간 작업을 이전 워커가 계속 기록하지 않도록)
+ALTER TABLE bulk_import_job ADD COLUMN claim_token CHAR(32) NULL AFTER status;
@@ -0,0 +1,43 @@
+from db import get_connection
+
+
+def find_by_artist_ids(artist_ids, max_age_days):
+    """아티스트 id 목록으로 저장된 원본 장르 조회 (max_age_days보다 오래된 row 제외)"""
+    if not artist_ids:
+        return []
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            placeholders = ",".join(["%s"] * len(artist_ids))
+            sql = f"""
+            SELECT spotify_artist_id, genres
+            FROM artist_genre
+            WHERE spotify_artist_id IN ({placeholders})
+              AND updated_at >= NOW() - INTERVAL %s DAY
+            """
+            c.execute(sql, (*artist_ids, max_age_days))
+            return c.fetchall()
+    finally:
+        conn.close()
+
+
+def upsert_many(rows):
+    """원본 장르 일괄 저장 (rows: [{spotify_artist_id, genres}])"""
+    if not rows:
+        return
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            sql = """
+            INSERT INTO artist_genre (spotify_artist_id, genres)
+            VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE
+                genres = VALUES(genres),
+                updated_at = NOW()
+            """
+            c.executemany(sql, [(r['spotify_artist_id'], r['genres']) for r in rows])
+            conn.commit()
+    finally:
+        conn.close()
@@ -0,0 +1,120 @@
+from db import get_connection
+
+
+def insert_job(job_id: str, query: str, target_count: int):
+    """작업 생성 (status=queued)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                "INSERT INTO bulk_import_job (job_id, query, target_count) VALUES (%s, %s, %s)",
+                (job_id, query, target_count)
+            )
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def find_by_job_id(job_id: str):
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute("SELECT * FROM bulk_import_job WHERE job_id = %s", (job_id,))
+            return c.fetchone()
+    finally:
+        conn.close()
+
+
+def claim_job(job_id: str, stale_seconds: int, claim_token: str) -> bool:
+    """
+    작업 실행권 획득 (성공하면 claim_token 기록)
+    - queued 상태이거나, running이지만 heartbeat가 stale_seconds 이상 끊긴 작업만 획득 가능
+    - 여러 워커가 동시에 시도해도 한 곳만 성공
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            sql = """
+            UPDATE bulk_import_job
+            SET status = 'running', claim_token = %s, heartbeat_at = NOW()
+            WHERE job_id = %s
+              AND (status = 'queued'
+                   OR (status = 'running'
+                       AND (heartbeat_at IS NULL OR heartbeat_at < NOW() - INTERVAL %s SECOND)))
+            """
+            c.execute(sql, (claim_token, job_id, stale_seconds))
+            conn.commit()
+            return c.rowcount == 1
+    finally:
+        conn.close()
+
+
+def heartbeat(job_id: str, claim_token: str) -> bool:
+    """실행 중 표시 갱신 (다른 워커가 가져간 작업이면 False)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                "UPDATE bulk_import_job SET heartbeat_at = NOW()"
+                " WHERE job_id = %s AND claim_token = %s AND status = 'running'",
+                (job_id, claim_token)
+            )
+            conn.commit()
+            return c.rowcount == 1
+    finally:
+        conn.close()
+
+
+def record_page(job_id: str, claim_token: str, next_offset: int, fetched: int, saved: int, new: int) -> bool:
+    """한 페이지 처리 결과 기록 (heartbeat 갱신 포함, 다른 워커가 가져간 작업이면 기록하지 않고 False)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            sql = """
+            UPDATE bulk_import_job
+            SET next_offset = %s,
+                fetched_count = fetched_count + %s,
+                saved_count = saved_count + %s,
+                new_count = new_count + %s,
+                heartbeat_at = NOW()
+            WHERE job_id = %s AND claim_token = %s AND status = 'running'
+            """
+            c.execute(sql, (next_offset, fetched, saved, new, job_id, claim_token))
+            conn.commit()
+            return c.rowcount == 1
+    finally:
+        conn.close()
+
+
+def finish_job(job_id: str, claim_token: str, status: str, error: str = None) -> bool:
+    """작업 종료/대기열 복귀 (다른 워커가 가져간 작업이면 False)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                "UPDATE bulk_import_job SET status = %s, error = %s, claim_token = NULL, heartbeat_at = NOW()"
+                " WHERE job_id = %s AND claim_token = %s",
+                (status, error[:1000] if error else None, job_id, claim_token)
+            )
+            conn.commit()
+            return c.rowcount == 1
+    finally:
+        conn.close()
+
+
+def find_resumable_job_ids(stale_seconds: int):
+    """대기 중이거나 heartbeat가 끊긴 작업 id 목록 (오래된 순)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            sql = """
+            SELECT job_id FROM bulk_import_job
+            WHERE status = 'queued'
+               OR (status = 'running'
+                   AND (heartbeat_at IS NULL OR heartbeat_at < NOW() - INTERVAL %s SECOND))
+            ORDER BY created_at
+            """
+            c.execute(sql, (stale_seconds,))
+            return [row['job_id'] for row in c.fetchall()]
+    finally:
+        conn.close()
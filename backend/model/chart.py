@@ -0,0 +1,83 @@
+from db import get_connection, read_only, transaction
+
+
+def upsert_chart(chart_key: str, playlist_id: str, market: str = None):
+    """차트 설정 등록 (플레이리스트/마켓이 바뀌면 갱신)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            sql = """
+            INSERT INTO chart (chart_key, playlist_id, market)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE playlist_id = VALUES(playlist_id), market = VALUES(market)
+            """
+            c.execute(sql, (chart_key, playlist_id, market))
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def find_by_chart_key(chart_key: str):
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute("SELECT * FROM chart WHERE chart_key = %s", (chart_key,))
+            return c.fetchone()
+    finally:
+        conn.close()
+
+
+@read_only
+def find_entries(chart_key: str):
+    """저장된 스냅샷의 곡 목록 (순위순, snapshot_id/마지막 확인 후 경과 시간(초) 포함)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            sql = """
+            SELECT ce.position, c.snapshot_id, c.refreshed_at,
+                   TIMESTAMPDIFF(SECOND, c.checked_at, NOW()) AS checked_age, m.*
+            FROM chart_entry ce
+            JOIN chart c ON ce.chart_key = c.chart_key
+            JOIN music m ON ce.music_no = m.music_no
+            WHERE ce.chart_key = %s
+            ORDER BY ce.position
+            """
+            c.execute(sql, (chart_key,))
+            return c.fetchall()
+    finally:
+        conn.close()
+
+
+def claim_check(chart_key: str, interval_seconds: int) -> bool:
+    """
+    snapshot_id 확인 권한 획득 (마지막 확인 후 interval_seconds가 지났을 때만)
+    - 여러 워커가 동시에 시도해도 한 곳만 성공
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            sql = """
+            UPDATE chart SET checked_at = NOW()
+            WHERE chart_key = %s
+              AND (checked_at IS NULL OR checked_at < NOW() - INTERVAL %s SECOND)
+            """
+            c.execute(sql, (chart_key, interval_seconds))
+            conn.commit()
+            return c.rowcount == 1
+    finally:
+        conn.close()
+
+
+def replace_entries(chart_key: str, snapshot_id: str, music_nos):
+    """스냅샷 교체 (기존 순위 삭제 → 새 순위 저장을 한 트랜잭션으로)"""
+    with transaction() as conn, conn.cursor() as c:
+        c.execute("DELETE FROM chart_entry WHERE chart_key = %s", (chart_key,))
+        if music_nos:
+            c.executemany(
+                "INSERT INTO chart_entry (chart_key, position, music_no) VALUES (%s, %s, %s)",
+                [(chart_key, position, music_no) for position, music_no in enumerate(music_nos, start=1)]
+            )
+        c.execute(
+            "UPDATE chart SET snapshot_id = %s, refreshed_at = NOW(), checked_at = NOW() WHERE chart_key = %s",
+            (snapshot_id, chart_key)
+        )
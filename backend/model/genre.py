@@ -1,12 +1,32 @@
 from db import get_connection
 
 
-def find_genre_no_by_name(name):
+def find_all():
+    """장르 전체 조회"""
     conn = get_connection()
     try:
         with conn.cursor() as c:
-            c.execute("SELECT genre_no FROM genre WHERE name = %s", (name,))
-            row = c.fetchone()
-            return row["genre_no"] if row else None
+            c.execute("SELECT genre_no, name FROM genre ORDER BY genre_no")
+            return c.fetchall()
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+
+def insert_genre(name):
+    """
+    장르 생성, genre_no 반환
+    - 다른 프로세스가 같은 이름을 먼저 만들었으면(UNIQUE name) 그 genre_no 반환
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            # LAST_INSERT_ID(genre_no): 중복일 때도 lastrowid가 기존 행의 genre_no가 됨
+            c.execute(
+                "INSERT INTO genre (name) VALUES (%s) "
+                "ON DUPLICATE KEY UPDATE genre_no = LAST_INSERT_ID(genre_no)",
+                (name,)
+            )
+            conn.commit()
+            return c.lastrowid
+    finally:
+        conn.close()
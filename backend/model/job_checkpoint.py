@@ -0,0 +1,35 @@
+from db import get_connection
+
+
+def find_last_key(job_name):
+    """마지막으로 처리한 키 (기록이 없으면 0)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute("SELECT last_key FROM job_checkpoint WHERE job_name = %s", (job_name,))
+            row = c.fetchone()
+            return row['last_key'] if row else 0
+    finally:
+        conn.close()
+
+
+def save(cursor, job_name, last_key):
+    """진행 위치 저장 (호출한 쪽 트랜잭션에서 실행, commit은 호출한 쪽에서)"""
+    cursor.execute(
+        """
+        INSERT INTO job_checkpoint (job_name, last_key) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE last_key = VALUES(last_key)
+        """,
+        (job_name, last_key)
+    )
+
+
+def reset(job_name):
+    """처음부터 다시 실행하도록 진행 위치 초기화"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            save(c, job_name, 0)
+            conn.commit()
+    finally:
+        conn.close()
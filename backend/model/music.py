@@ -1,4 +1,5 @@
-from db import get_connection
+from db import get_connection, read_only, stream_query, transaction
+from model import job_checkpoint as job_checkpoint_model
 
 
 def find_by_spotify_url(spotify_url):
@@ -12,95 +13,296 @@ def find_by_spotify_url(spotify_url):
         conn.close()
 
 
-def insert_music(m):
+# IN (...) 한 번에 넣을 최대 값 개수
+IN_QUERY_CHUNK_SIZE = 500
+
+
+def find_by_spotify_urls(spotify_urls):
+    """여러 spotify_url을 IN 쿼리로 한 번에 조회 → {spotify_url: row}"""
+    urls = list(dict.fromkeys(u for u in spotify_urls if u))
+    if not urls:
+        return {}
+
+    found = {}
     conn = get_connection()
     try:
         with conn.cursor() as c:
-            sql = """
-            INSERT INTO music
-            (track_name, artist_name, album_name, album_image_url,
-             duration_ms, popularity, spotify_url, genre_no, preview_url,
-             spotify_track_id, energy, danceability, valence, acousticness, instrumentalness)
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            """
-            c.execute(sql, (
-                m['track_name'],
-                m['artist_name'],
-                m['album_name'],
-                m['album_image_url'],
-                m['duration_ms'],
-                m['popularity'],
-                m['spotify_url'],
-                m['genre_no'],
-                m.get('preview_url'),
-                m.get('spotify_track_id'),
-                m.get('energy'),
-                m.get('danceability'),
-                m.get('valence'),
-                m.get('acousticness'),
-                m.get('instrumentalness')
-            ))
-            conn.commit()
-            print(f"  ✅ 저장: {m['track_name']}")
-            return c.lastrowid
-    except Exception as e:
-        print(f"  ❌ 저장 실패: {m['track_name']} - {e}")
-        return None
+            for i in range(0, len(urls), IN_QUERY_CHUNK_SIZE):
+                chunk = urls[i:i + IN_QUERY_CHUNK_SIZE]
+                placeholders = ",".join(["%s"] * len(chunk))
+                c.execute(f"SELECT * FROM music WHERE spotify_url IN ({placeholders})", chunk)
+                for row in c.fetchall():
+                    found.setdefault(row['spotify_url'], row)
+            return found
     finally:
         conn.close()
 
 
-def find_all(category=None, value=None):
+@read_only
+def find_by_music_nos(music_nos, genre_no=None):
+    """여러 music_no를 IN 쿼리로 조회 (입력 순서 유지, 없는 곡은 제외, genre_no가 있으면 그 장르만)"""
+    music_nos = list(dict.fromkeys(music_nos))
+    if not music_nos:
+        return []
+
+    found = {}
     conn = get_connection()
     try:
         with conn.cursor() as c:
-            if category == "genre":
-                sql = """
-                SELECT m.*
-                FROM music m
-                JOIN genre g ON m.genre_no = g.genre_no
-                WHERE g.name = %s
-                ORDER BY m.popularity DESC
+            for i in range(0, len(music_nos), IN_QUERY_CHUNK_SIZE):
+                chunk = music_nos[i:i + IN_QUERY_CHUNK_SIZE]
+                placeholders = ",".join(["%s"] * len(chunk))
+                sql = f"SELECT * FROM music WHERE music_no IN ({placeholders})"
+                if genre_no is not None:
+                    sql += " AND genre_no = %s"
+                    chunk = chunk + [genre_no]
+                c.execute(sql, chunk)
+                for row in c.fetchall():
+                    found[row['music_no']] = row
+            return [found[no] for no in music_nos if no in found]
+    finally:
+        conn.close()
+
+
+MUSIC_COLUMNS = (
+    'track_name', 'artist_name', 'album_name', 'album_image_url',
+    'duration_ms', 'popularity', 'spotify_url', 'genre_no', 'preview_url',
+    'spotify_track_id', 'energy', 'danceability', 'valence', 'acousticness', 'instrumentalness',
+    'release_date', 'release_year'
+)
+
+
+def _music_values(m):
+    return tuple(m.get(col) for col in MUSIC_COLUMNS)
+
+
+def upsert_many(rows):
+    """
+    여러 곡을 한 트랜잭션으로 저장 (spotify_track_id 기준 multi-row upsert)
+    - 이미 있는 곡은 popularity만 갱신
+    - 반환: 입력 순서대로 music_no 목록 (실패 시 전부 None)
+    """
+    if not rows:
+        return []
+
+    columns = ", ".join(MUSIC_COLUMNS)
+    placeholders = ",".join(["%s"] * len(MUSIC_COLUMNS))
+
+    try:
+        with transaction() as conn, conn.cursor() as c:
+            with_id = [m for m in rows if m.get('spotify_track_id')]
+            if with_id:
+                sql = f"""
+                INSERT INTO music ({columns})
+                VALUES ({placeholders})
+                ON DUPLICATE KEY UPDATE popularity = VALUES(popularity)
                 """
-                c.execute(sql, (value,))
-            else:
-                c.execute("SELECT * FROM music ORDER BY popularity DESC")
+                c.executemany(sql, [_music_values(m) for m in with_id])
+
+            music_no_by_track_id = {}
+            if with_id:
+                track_ids = list({m['spotify_track_id'] for m in with_id})
+                id_placeholders = ",".join(["%s"] * len(track_ids))
+                # 잠금 읽기: 트랜잭션 스냅샷이 아니라 최신 커밋 기준으로 읽음
+                # (다른 요청이 같은 곡을 먼저 저장해서 upsert가 아무것도 바꾸지 않은 경우에도 music_no를 찾음)
+                c.execute(
+                    f"SELECT music_no, spotify_track_id FROM music WHERE spotify_track_id IN ({id_placeholders})"
+                    " LOCK IN SHARE MODE",
+                    track_ids
+                )
+                music_no_by_track_id = {r['spotify_track_id']: r['music_no'] for r in c.fetchall()}
+
+            music_nos = []
+            for m in rows:
+                track_id = m.get('spotify_track_id')
+                if track_id:
+                    music_nos.append(music_no_by_track_id.get(track_id))
+                else:
+                    # spotify_track_id가 없는 곡은 upsert 키가 없으므로 개별 INSERT
+                    c.execute(f"INSERT INTO music ({columns}) VALUES ({placeholders})", _music_values(m))
+                    music_nos.append(c.lastrowid)
+
+            print(f"  ✅ 저장: {len(rows)}곡")
+            return music_nos
+    except Exception as e:
+        print(f"  ❌ 저장 실패: {len(rows)}곡 - {e}")
+        return [None] * len(rows)
+
+
+def insert_music(m):
+    """단건 저장 (spotify_track_id가 이미 있으면 popularity 갱신 후 기존 music_no 반환)"""
+    return upsert_many([m])[0]
+
+
+def _find_all_query(genre_no):
+    if genre_no is not None:
+        return "SELECT * FROM music WHERE genre_no = %s ORDER BY popularity DESC", (genre_no,)
+    return "SELECT * FROM music ORDER BY popularity DESC", None
+
+
+@read_only
+def find_all(genre_no=None):
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(*_find_all_query(genre_no))
+            return c.fetchall()
+    finally:
+        conn.close()
+
+
+def stream_all(genre_no=None, chunk_size=500):
+    """find_all과 같은 결과를 서버 측 커서로 chunk_size행씩 (RowStream, 다 읽거나 close() 하면 연결 반납)"""
+    sql, params = _find_all_query(genre_no)
+    return stream_query(sql, params, chunk_size=chunk_size)
+
+
+@read_only
+def find_by_genre_no(genre_no):
+    return find_all(genre_no)
+
+
+# 자동완성 색인에 필요한 컬럼
+INDEX_COLUMNS = (
+    'music_no', 'track_name', 'artist_name', 'album_name', 'album_image_url', 'popularity'
+)
+
+
+@read_only
+def find_index_rows():
+    """자동완성 색인용 전체 곡 (필요한 컬럼만)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(f"SELECT {', '.join(INDEX_COLUMNS)} FROM music")
             return c.fetchall()
     finally:
         conn.close()
 
 
-def find_by_genre(genre_name):
+# BOOLEAN MODE에서 연산자로 해석되는 문자
+_FULLTEXT_OPERATORS = str.maketrans({ch: " " for ch in '+-<>()~*"@'})
+
+# ngram_token_size (MySQL 기본 2): 이보다 짧은 단어는 접두 검색으로만 찾을 수 있음
+NGRAM_TOKEN_SIZE = 2
+
+_MATCH = "MATCH(track_name, artist_name, album_name)"
+
+
+def fulltext_terms(keyword):
+    """검색어 → FULLTEXT 연산자를 제거한 단어 목록"""
+    return (keyword or "").translate(_FULLTEXT_OPERATORS).split()
+
+
+def _fulltext_query(keyword):
+    """검색어 → BOOLEAN MODE 쿼리 (모든 단어 필수, ngram보다 짧은 단어는 접두 검색)"""
+    return " ".join(
+        f"+{t}*" if len(t) < NGRAM_TOKEN_SIZE else f"+{t}" for t in fulltext_terms(keyword)
+    )
+
+
+def _escape_like(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@read_only
+def search_fulltext(keyword, category=None, offset=0, limit=None, min_score=None, genre_no=None):
+    """
+    FULLTEXT(ngram) 인덱스로 track_name/artist_name/album_name 검색
+    - 모든 단어가 들어 있는 곡 중 NATURAL LANGUAGE MODE 관련도 순 (같으면 인기순)
+    - min_score: 관련도가 이보다 낮은 곡은 제외 (부분 문자열만 겹치는 곡 걸러내기)
+    - category=artist: 아티스트명에 검색어가 포함된 곡만
+    - genre_no: 그 장르의 곡만 (LIMIT 전에 걸러야 장르 곡이 잘리지 않음)
+    - 반환: (rows, total), 검색할 단어가 없으면 ([], 0)
+    """
+    query = _fulltext_query(keyword)
+    if not query:
+        return [], 0
+    text = " ".join(fulltext_terms(keyword))
+
+    where = f"{_MATCH} AGAINST (%s IN BOOLEAN MODE)"
+    params = [query]
+    if min_score is not None:
+        where += f" AND {_MATCH} AGAINST (%s IN NATURAL LANGUAGE MODE) >= %s"
+        params += [text, min_score]
+    if category == "artist":
+        where += " AND artist_name LIKE %s"
+        params.append(f"%{_escape_like(keyword.strip())}%")
+    if genre_no is not None:
+        where += " AND genre_no = %s"
+        params.append(genre_no)
+
     conn = get_connection()
     try:
         with conn.cursor() as c:
-            sql = """
-            SELECT m.*
-            FROM music m
-            JOIN genre g ON m.genre_no = g.genre_no
-            WHERE g.name = %s
-            ORDER BY m.popularity DESC
+            c.execute(f"SELECT COUNT(*) AS total FROM music WHERE {where}", params)
+            total = c.fetchone()['total']
+            if total <= offset:
+                return [], total
+
+            sql = f"""
+            SELECT *, {_MATCH} AGAINST (%s IN NATURAL LANGUAGE MODE) AS score
+            FROM music
+            WHERE {where}
+            ORDER BY score DESC, popularity DESC
             """
-            c.execute(sql, (genre_name,))
-            return c.fetchall()
+            select_params = [text] + params
+            if limit is not None:
+                sql += " LIMIT %s OFFSET %s"
+                select_params += [limit, offset]
+            c.execute(sql, select_params)
+            rows = c.fetchall()
+            for row in rows:
+                row.pop('score', None)
+            return rows, total
     finally:
         conn.close()
 
 
-def find_genre_no_by_name(name):
+def find_after(music_no, limit):
+    """music_no 순서로 music_no보다 큰 곡 limit개 (갱신 작업용)"""
     conn = get_connection()
     try:
         with conn.cursor() as c:
             c.execute(
-                "SELECT genre_no FROM genre WHERE name = %s",
-                (name,)
+                """
+                SELECT music_no, spotify_track_id, spotify_url
+                FROM music
+                WHERE music_no > %s
+                ORDER BY music_no
+                LIMIT %s
+                """,
+                (music_no, limit)
             )
-            row = c.fetchone()
-            return row['genre_no'] if row else None
+            return c.fetchall()
     finally:
         conn.close()
 
 
+def update_metadata_many(rows, job_name=None, last_music_no=None):
+    """
+    여러 곡의 popularity/release_date/release_year를 UPDATE 한 번으로 갱신
+    - job_name이 있으면 같은 트랜잭션에서 작업 진행 위치(last_music_no)도 저장
+    """
+    with transaction() as conn, conn.cursor() as c:
+        if rows:
+            sets, params = [], []
+            for col in ('popularity', 'release_date', 'release_year'):
+                cases = " ".join(["WHEN %s THEN %s"] * len(rows))
+                # 값이 없으면(None) 기존 값 유지
+                sets.append(f"{col} = COALESCE(CASE music_no {cases} END, {col})")
+                for r in rows:
+                    params += [r['music_no'], r.get(col)]
+            placeholders = ",".join(["%s"] * len(rows))
+            params += [r['music_no'] for r in rows]
+            c.execute(
+                f"UPDATE music SET {', '.join(sets)} WHERE music_no IN ({placeholders})",
+                params
+            )
+        if job_name:
+            job_checkpoint_model.save(c, job_name, last_music_no)
+
+
 def find_by_spotify_track_id(track_id):
     conn = get_connection()
     try:
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from db import get_connection
+from db import get_connection, read_only
 
 
 def insert_music_to_playlist(playlist_no: int, music_no: int) -> bool:
@@ -43,6 +43,7 @@ def delete_all_music_from_playlist(playlist_no: int) -> bool:
         conn.close()
 
 
+@read_only
 def find_by_playlist_no(playlist_no: int):
     """플레이리스트의 음악 목록 조회"""
     conn = get_connection()
@@ -61,6 +62,7 @@ def find_by_playlist_no(playlist_no: int):
         conn.close()
 
 
+@read_only
 def find_by_music_no(music_no: int):
     """특정 음악이 포함된 플레이리스트 목록 조회"""
     conn = get_connection()
@@ -90,6 +92,7 @@ def exists(playlist_no: int, music_no: int) -> bool:
         conn.close()
 
 
+@read_only
 def count_by_playlist_no(playlist_no: int) -> int:
     """플레이리스트의 음악 개수 조회"""
     conn = get_connection()
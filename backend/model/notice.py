@@ -1,4 +1,4 @@
-from db import get_connection
+from db import get_connection, read_only
 from db import connect_to_mysql
 import os
 
@@ -58,6 +58,7 @@ def find_by_notice_no(notice_no: int):
         conn.close()
 
 # 리스트 조회(작성자 닉네임 포함) 
+@read_only
 def list_all_with_user():
     conn = get_connection()
     try:
@@ -74,6 +75,7 @@ def list_all_with_user():
         conn.close()
 
 # 상세 조회(작성자 닉네임 포함)
+@read_only
 def find_detail_with_user(notice_no: int):
     conn = get_connection()
     try:
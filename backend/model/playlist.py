@@ -1,4 +1,4 @@
-from db import get_connection
+from db import get_connection, read_only, stream_query
 
 
 def insert_playlist(user_no: int, title: str, content: str = None) -> int:
@@ -60,23 +60,32 @@ def find_by_playlist_no(playlist_no: int):
         conn.close()
 
 
+_LIST_ALL_WITH_USER_SQL = (
+    "SELECT p.playlist_no, p.user_no, p.title, p.content,"
+    " p.created_at, p.updated_at, u.nickname"
+    " FROM playlist p LEFT JOIN user u ON p.user_no = u.user_no"
+    " ORDER BY p.created_at DESC"
+)
+
+
+@read_only
 def list_all_with_user():
     """전체 리스트 조회 (작성자 닉네임 포함)"""
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
-            sql = (
-                "SELECT p.playlist_no, p.user_no, p.title, p.content,"
-                " p.created_at, p.updated_at, u.nickname"
-                " FROM playlist p LEFT JOIN user u ON p.user_no = u.user_no"
-                " ORDER BY p.created_at DESC"
-            )
-            cursor.execute(sql)
+            cursor.execute(_LIST_ALL_WITH_USER_SQL)
             return cursor.fetchall()
     finally:
         conn.close()
 
 
+def stream_all_with_user(chunk_size=500):
+    """list_all_with_user와 같은 결과를 서버 측 커서로 chunk_size행씩 (RowStream)"""
+    return stream_query(_LIST_ALL_WITH_USER_SQL, chunk_size=chunk_size)
+
+
+@read_only
 def list_by_user_no(user_no: int):
     """특정 유저의 플레이리스트 목록 조회"""
     conn = get_connection()
@@ -93,6 +102,7 @@ def list_by_user_no(user_no: int):
         conn.close()
 
 
+@read_only
 def find_detail_with_user(playlist_no: int):
     """상세 조회 (작성자 닉네임 포함)"""
     conn = get_connection()
@@ -110,6 +120,7 @@ def find_detail_with_user(playlist_no: int):
         conn.close()
 
 
+@read_only
 def get_genre_distribution(user_no: int):
     """사용자 플레이리스트의 장르 분포 조회"""
     conn = get_connection()
@@ -131,6 +142,7 @@ def get_genre_distribution(user_no: int):
         conn.close()
 
 
+@read_only
 def get_user_audio_features(user_no: int):
     """사용자 플레이리스트 곡들의 평균 오디오 특성 조회"""
     conn = get_connection()
@@ -156,6 +168,7 @@ def get_user_audio_features(user_no: int):
         conn.close()
 
 
+@read_only
 def get_weekly_activity(user_no: int):
     """사용자의 주간 활동 패턴 (플레이리스트 생성 + 곡 추가, 별도 집계)"""
     conn = get_connection()
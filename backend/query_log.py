@@ -0,0 +1,174 @@
+# query_log.py - 모든 SQL의 실행 시간/행 수 기록 (요청별 집계, 느린 쿼리 로그, 문장별 누적 통계)
+import os
+import re
+import threading
+import time
+
+from flask import g, has_app_context, has_request_context, request
+
+# 이 시간(ms)을 넘는 쿼리는 로그로 출력
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))
+
+# 요청 하나가 이보다 많은 쿼리를 실행하면 경고 (N+1 등)
+QUERY_COUNT_WARN = int(os.getenv("QUERY_COUNT_WARN", 20))
+
+# 문장별 누적 통계에 보관할 최대 문장 수
+MAX_STATEMENTS = 500
+
+# 서버 측 커서(SSCursor)는 결과를 다 읽기 전까지 행 수를 알 수 없음 (rowcount가 2^64-1)
+_UNKNOWN_ROWCOUNT = 2 ** 63
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s")
+_REPEATED_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_REPEATED_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+# SAVEPOINT/ROLLBACK TO SAVEPOINT/RELEASE SAVEPOINT의 이름(uow_1, uow_2, ...)
+_SAVEPOINT_NAME = re.compile(r"\bSAVEPOINT\s+`?\w+`?", re.IGNORECASE)
+
+
+def normalize_sql(sql):
+    """
+    같은 모양의 쿼리를 하나로 묶기 위한 정규화
+    - 값/파라미터 → ?, IN (?, ?, ...)·다중 VALUES → (...), SAVEPOINT 이름 → ?, 공백 정리
+    """
+    if isinstance(sql, bytes):
+        sql = sql.decode("utf-8", "replace")
+    sql = _SAVEPOINT_NAME.sub("SAVEPOINT ?", sql)
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _REPEATED_LIST.sub("(...)", sql)
+    sql = _REPEATED_ROWS.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class QueryStats:
+    """프로세스 전체의 문장별 누적 통계 (실행 횟수, 총/최대 시간, 행 수)"""
+    _stats = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def record(cls, statement, duration_ms, rows):
+        with cls._lock:
+            entry = cls._stats.get(statement)
+            if entry is None:
+                if len(cls._stats) >= MAX_STATEMENTS:
+                    return
+                entry = cls._stats[statement] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0}
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["rows"] += rows or 0
+
+    @classmethod
+    def top(cls, limit=20):
+        """총 실행 시간이 긴 순서로 문장 목록"""
+        with cls._lock:
+            items = [dict(statement=s, **v) for s, v in cls._stats.items()]
+        items.sort(key=lambda item: item["total_ms"], reverse=True)
+        for item in items[:limit]:
+            item["total_ms"] = round(item["total_ms"], 2)
+            item["max_ms"] = round(item["max_ms"], 2)
+            item["avg_ms"] = round(item["total_ms"] / item["count"], 2)
+        return items[:limit]
+
+
+class _RequestQueries:
+    """요청 하나에서 실행된 쿼리 목록 (context를 복사해 간 다른 스레드에서도 기록될 수 있어 lock 사용)"""
+
+    def __init__(self):
+        self.queries = []       # (statement, duration_ms, rows)
+        self._lock = threading.Lock()
+
+    def add(self, statement, duration_ms, rows):
+        with self._lock:
+            self.queries.append((statement, duration_ms, rows))
+
+    def totals(self):
+        with self._lock:
+            return len(self.queries), sum(q[1] for q in self.queries)
+
+    def summary(self, limit=5):
+        """같은 문장끼리 묶어서 실행 횟수가 많은 순서로"""
+        grouped = {}
+        with self._lock:
+            for statement, duration_ms, _ in self.queries:
+                count, total = grouped.get(statement, (0, 0.0))
+                grouped[statement] = (count + 1, total + duration_ms)
+        return sorted(grouped.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+
+
+def record(sql, duration_ms, rows):
+    statement = normalize_sql(sql)
+    QueryStats.record(statement, duration_ms, rows)
+
+    if has_app_context():
+        queries = g.get("_queries")
+        if queries is not None:
+            queries.add(statement, duration_ms, rows)
+
+    if duration_ms >= SLOW_QUERY_MS:
+        where = f" [{request.method} {request.path}]" if has_request_context() else ""
+        print(f"🐢 느린 쿼리 {duration_ms:.1f}ms, {rows if rows is not None else '?'}행{where}: {statement}")
+
+
+class InstrumentedCursor:
+    """execute/executemany 실행 시간과 행 수를 record()로 남기는 커서 래퍼 (나머지는 원래 커서로 위임)"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def _timed(self, method, query, args):
+        started = time.perf_counter()
+        try:
+            return method(query, args)
+        finally:
+            rows = self._cursor.rowcount
+            if rows is None or rows < 0 or rows >= _UNKNOWN_ROWCOUNT:
+                rows = None
+            record(query, (time.perf_counter() - started) * 1000, rows)
+
+    def execute(self, query, args=None):
+        return self._timed(self._cursor.execute, query, args)
+
+    def executemany(self, query, args):
+        return self._timed(self._cursor.executemany, query, args)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+
+
+def init_app(app):
+    """
+    요청마다 쿼리 수/총 시간을 Server-Timing 헤더로 응답 (브라우저 개발자 도구의 Timing 탭에서 확인)
+    - QUERY_COUNT_WARN개를 넘으면 많이 실행된 문장과 함께 경고 출력
+    """
+
+    @app.before_request
+    def _begin_query_log():
+        g._queries = _RequestQueries()
+
+    @app.after_request
+    def _report_query_log(response):
+        queries = g.get("_queries")
+        if queries is None:
+            return response
+        count, total_ms = queries.totals()
+        response.headers.add("Server-Timing", f'db;dur={total_ms:.1f};desc="{count} queries"')
+
+        if count > QUERY_COUNT_WARN:
+            print(f"⚠️ 쿼리 {count}개 ({total_ms:.1f}ms): {request.method} {request.path}")
+            for statement, (n, ms) in queries.summary():
+                print(f"    {n}회 {ms:.1f}ms  {statement}")
+        return response
@@ -0,0 +1,98 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 잠금 없이 프로세스 단위로만 제한
+    fcntl = None
+
+
+class RateLimitExceeded(Exception):
+    """허용된 대기 시간 안에 호출 가능한 토큰을 얻지 못함"""
+
+    def __init__(self, retry_after, message="요청이 많아 잠시 후 다시 시도해주세요."):
+        super().__init__(message)
+        self.retry_after = max(1, int(retry_after + 0.999))
+
+
+class SharedTokenBucket:
+    """
+    토큰 버킷 rate limiter
+    - path가 있으면 상태를 파일에 두고 fcntl 잠금으로 같은 호스트의 모든 워커 프로세스가 공유
+    - reserve: 버킷에 남겨둘 비율 (낮은 우선순위 호출은 이 아래로 토큰을 쓰지 못함)
+    - block_for(): 서버가 알려준 Retry-After 동안 모든 호출 중단
+    """
+
+    def __init__(self, rate, capacity, path=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.path = path if fcntl else None
+        self._lock = threading.Lock()
+        self._state = self._initial_state()
+
+    def _initial_state(self):
+        return {"tokens": float(self.capacity), "updated": time.time(), "blocked_until": 0.0}
+
+    @contextmanager
+    def _locked_state(self):
+        with self._lock:
+            if not self.path:
+                yield self._state
+                return
+
+            with open(self.path, "a+", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read() or "null") or self._initial_state()
+                    except ValueError:
+                        state = self._initial_state()
+                    yield state
+                    f.seek(0)
+                    f.truncate()
+                    json.dump(state, f)
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def try_acquire(self, reserve=0.0):
+        """토큰 1개 획득 시도 → 더 기다려야 하는 시간(초), 0이면 획득 성공"""
+        with self._locked_state() as state:
+            now = time.time()
+            if state["blocked_until"] > now:
+                return state["blocked_until"] - now
+
+            tokens = min(self.capacity, state["tokens"] + (now - state["updated"]) * self.rate)
+            state["updated"] = now
+            floor = reserve * self.capacity
+            if tokens - 1 >= floor:
+                state["tokens"] = tokens - 1
+                return 0.0
+
+            state["tokens"] = tokens
+            return (floor + 1 - tokens) / self.rate
+
+    def acquire(self, reserve=0.0, max_wait=10.0):
+        """토큰을 얻을 때까지 대기 (max_wait 안에 못 얻으면 RateLimitExceeded)"""
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self.try_acquire(reserve)
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitExceeded(wait)
+            time.sleep(min(wait, 1.0))
+
+    def block_for(self, seconds):
+        """seconds 동안 모든 워커의 호출 중단 (Retry-After 반영)"""
+        with self._locked_state() as state:
+            state["blocked_until"] = max(state["blocked_until"], time.time() + seconds)
+            state["tokens"] = 0.0
+            state["updated"] = time.time()
+
+    def blocked_for(self):
+        with self._locked_state() as state:
+            return max(0.0, state["blocked_until"] - time.time())
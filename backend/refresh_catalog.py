@@ -0,0 +1,30 @@
+# refresh_catalog.py - 저장된 곡의 popularity/release_date/release_year를 Spotify 기준으로 갱신
+# 실행: python refresh_catalog.py --rate 2
+#   - 중단 후 다시 실행하면 마지막으로 저장한 music_no 다음부터 이어서 진행
+#   - --reset: 처음부터 다시, --limit N: 이번 실행에서 N곡만
+import argparse
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from services import catalog_refresh
+
+
+def main():
+    parser = argparse.ArgumentParser(description="music 테이블 popularity/발매일 일괄 갱신")
+    parser.add_argument("--rate", type=float, default=1.0,
+                        help="초당 Spotify 요청 수 (요청 1번에 50곡, 기본 1)")
+    parser.add_argument("--limit", type=int, default=None, help="이번 실행에서 처리할 최대 곡 수")
+    parser.add_argument("--reset", action="store_true", help="진행 위치를 무시하고 처음부터")
+    args = parser.parse_args()
+
+    if args.rate <= 0:
+        parser.error("--rate는 0보다 커야 합니다.")
+
+    scanned, updated = catalog_refresh.refresh_metadata(args.rate, args.limit, args.reset)
+    print(f"🎉 {scanned}곡 확인, {updated}곡 갱신")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,16 @@ def search_music():
     return music_controller.search_music()
 
 
+@music_bp.route('/search/cache', methods=['GET'])
+def get_search_cache_stats():
+    return music_controller.get_search_cache_stats()
+
+
+@music_bp.route('/suggest', methods=['GET'])
+def suggest_music():
+    return music_controller.suggest_music()
+
+
 @music_bp.route('', methods=['GET'])
 def get_music_list():
     return music_controller.get_music_list()
@@ -18,7 +28,17 @@ def get_music_list():
 def get_global_top_50():
     return music_controller.get_global_top_50()
 
+
+@music_bp.route('/charts/<chart_key>', methods=['GET'])
+def get_chart(chart_key):
+    return music_controller.get_chart(chart_key)
+
 @music_bp.route('/bulk-import', methods=['POST'])
 def bulk_import():
     return music_controller.bulk_import()
 
+
+@music_bp.route('/bulk-import/<job_id>', methods=['GET'])
+def get_bulk_import_job(job_id):
+    return music_controller.get_bulk_import_job(job_id)
+
@@ -1,135 +1,186 @@
-# seed_music.py - Spotify API를 사용한 music 테이블 테스트 데이터 삽입
+# seed_music.py - Spotify 검색 결과로 music 테이블 채우기 (스테이징/테스트 데이터)
+# 실행: python seed_music.py                          (기본 장르 목록)
+#       python seed_music.py K-pop:5000 Pop:3000 Jazz:500 --workers 4
+#   - 장르별로 병렬 수집, 50곡씩 페이지를 넘기며 offset 1000 이후는 검색어를 바꿔서 계속
+#   - 페이지마다 한 트랜잭션으로 저장 (spotify_track_id 기준 upsert라 다시 실행해도 중복 없음)
+#   - 진행 상황을 체크포인트 파일에 저장 → 다시 실행하면 멈춘 곳부터 (--fresh: 처음부터)
+import argparse
+import json
 import os
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from dotenv import load_dotenv
-from db import connect_to_mysql
 
 load_dotenv()
 
-# Spotify 클라이언트 설정
-sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
-    client_id=os.getenv('SPOTIFY_CLIENT_ID'),
-    client_secret=os.getenv('SPOTIFY_CLIENT_SECRET')
-))
-
-# DB 연결
-def get_conn():
-    return connect_to_mysql(
-        os.getenv("DB_HOST"),
-        int(os.getenv("DB_PORT")),
-        os.getenv("DB_USER"),
-        os.getenv("DB_PASSWORD"),
-        os.getenv("DB_DATABASE")
-    )
-
-# 장르별 검색 키워드 (다양한 음악 수집)
+from model import music as music_model
+from services import genre as genre_service
+from services import music as music_service
+from services.music import SPOTIFY_SEARCH_MAX_OFFSET
+from spotify_client import BACKGROUND, get_spotify_client, spotify_priority
+
+# 기본 장르별 수집 곡 수
 SEARCH_QUERIES = [
-    ("K-pop", 15),      # K-pop 15곡
-    ("Pop", 15),        # Pop 15곡
-    ("Hip hop", 10),    # Hip hop 10곡
-    ("R&B", 10),        # R&B 10곡
-    ("Rock", 10),       # Rock 10곡
-    ("Jazz", 5),        # Jazz 5곡
-    ("Electronic", 5),  # Electronic 5곡
+    ("K-pop", 15),
+    ("Pop", 15),
+    ("Hip hop", 10),
+    ("R&B", 10),
+    ("Rock", 10),
+    ("Jazz", 5),
+    ("Electronic", 5),
 ]
 
-def get_or_create_genre(conn, genre_name):
-    """장르 번호 조회 (없으면 생성)"""
-    with conn.cursor() as c:
-        c.execute("SELECT genre_no FROM genre WHERE name = %s", (genre_name,))
-        row = c.fetchone()
-        if row:
-            return row['genre_no']
-        
-        # 장르 생성
-        c.execute("INSERT INTO genre (name) VALUES (%s)", (genre_name,))
-        conn.commit()
-        return c.lastrowid
-
-def fetch_tracks_from_spotify(query, limit):
-    """Spotify에서 트랙 검색"""
-    results = sp.search(q=query, type='track', limit=limit, market='KR')
-    tracks = []
-    
-    for item in results['tracks']['items']:
-        tracks.append({
-            'track_name': item['name'],
-            'artist_name': ', '.join([a['name'] for a in item['artists']]),
-            'album_name': item['album']['name'],
-            'album_image_url': item['album']['images'][0]['url'] if item['album']['images'] else None,
-            'duration_ms': item['duration_ms'],
-            'popularity': item['popularity'],
-            'spotify_url': item['external_urls']['spotify']
-        })
-    
-    return tracks
-
-def insert_music(conn, music_data, genre_no):
-    """음악 데이터 삽입 (중복 체크)"""
-    with conn.cursor() as c:
-        # 중복 체크
-        c.execute("SELECT music_no FROM music WHERE spotify_url = %s", (music_data['spotify_url'],))
-        if c.fetchone():
-            print(f"  ⏭️  중복 스킵: {music_data['track_name']}")
-            return False
-        
-        sql = """
-        INSERT INTO music 
-        (track_name, artist_name, album_name, album_image_url, duration_ms, popularity, spotify_url, genre_no)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        c.execute(sql, (
-            music_data['track_name'],
-            music_data['artist_name'],
-            music_data['album_name'],
-            music_data['album_image_url'],
-            music_data['duration_ms'],
-            music_data['popularity'],
-            music_data['spotify_url'],
-            genre_no
-        ))
-        conn.commit()
-        print(f"  ✅ 저장: {music_data['track_name']} - {music_data['artist_name']}")
-        return True
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".seed_checkpoint.json")
+
+# offset 1000을 넘기면 연도 범위로 검색어를 나눠서 계속 수집
+YEAR_RANGES = ["2020-2025", "2015-2019", "2010-2014", "2000-2009", "1990-1999", "1970-1989"]
+
+
+def query_variants(genre_name):
+    """장르 하나의 검색어 목록 (각 검색어마다 최대 offset 1000까지)"""
+    tag = f'genre:"{genre_name.lower()}"'
+    return [genre_name, tag] + [f"{tag} year:{years}" for years in YEAR_RANGES]
+
+
+def parse_spec(spec):
+    """'K-pop:5000' → ('K-pop', 5000)"""
+    name, _, count = spec.rpartition(":")
+    if not name or not count.isdigit() or int(count) < 1:
+        raise argparse.ArgumentTypeError(f"'{spec}': 장르:곡수 형식이어야 합니다 (예: K-pop:5000)")
+    return name, int(count)
+
+
+class Checkpoint:
+    """장르별 진행 상황 {장르: {variant(검색어 순번), offset, saved}}을 JSON 파일에 저장"""
+
+    def __init__(self, path, fresh=False):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state = {}
+        if not fresh:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError):
+                self.state = {}
+
+    def get(self, genre_name):
+        with self._lock:
+            return dict(self.state.get(genre_name) or {"variant": 0, "offset": 0, "saved": 0})
+
+    def save(self, genre_name, progress):
+        with self._lock:
+            self.state[genre_name] = progress
+            directory = os.path.dirname(self.path) or "."
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".seed-checkpoint-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def save_page(sp, tracks, genre_no, with_features):
+    """한 페이지를 한 트랜잭션으로 저장 → 새로 추가된 곡 수"""
+    rows = {}
+    for track in tracks:
+        music, _ = music_service.build_music_row(track or {})
+        if music:
+            # 시드 데이터는 기존처럼 참여 아티스트 전체를 저장 (검색 저장은 첫 번째 아티스트만)
+            music["artist_name"] = ", ".join(a["name"] for a in track.get("artists") or [] if a.get("name"))
+            music["genre_no"] = genre_no
+            rows.setdefault(music["spotify_url"], music)
+    if not rows:
+        return 0
+
+    existing = music_model.find_by_spotify_urls(list(rows))
+    new_rows = [m for url, m in rows.items() if url not in existing]
+    if not new_rows:
+        return 0
+
+    if with_features:
+        features = music_service.fetch_audio_features_batch(sp, [m["spotify_track_id"] for m in new_rows])
+        for m in new_rows:
+            m.update(features.get(m["spotify_track_id"]) or {})
+
+    music_nos = music_model.upsert_many(new_rows)
+    return sum(1 for no in music_nos if no)
+
+
+def seed_genre(genre_name, target, checkpoint, with_features):
+    """장르 하나를 target곡(새로 추가된 곡 기준)까지 수집"""
+    progress = checkpoint.get(genre_name)
+    variants = query_variants(genre_name)
+    if progress["saved"] >= target or progress["variant"] >= len(variants):
+        print(f"⏭️  [{genre_name}] 이미 완료 ({progress['saved']}곡)")
+        return progress["saved"]
+
+    sp = get_spotify_client()
+    genre_no = genre_service.get_or_create_genre(genre_name)
+
+    with spotify_priority(BACKGROUND):
+        while progress["saved"] < target and progress["variant"] < len(variants):
+            query = variants[progress["variant"]]
+            results = sp.search(
+                q=query, type="track", limit=music_service.SEARCH_PAGE_LIMIT,
+                offset=progress["offset"], market="KR"
+            )
+            tracks_obj = results.get("tracks") or {}
+            items = tracks_obj.get("items") or []
+
+            progress["saved"] += save_page(sp, items, genre_no, with_features)
+            progress["offset"] += music_service.SEARCH_PAGE_LIMIT
+
+            # 결과가 끝났거나 offset 한도에 닿으면 다음 검색어로
+            total = min(tracks_obj.get("total") or 0, SPOTIFY_SEARCH_MAX_OFFSET)
+            if not items or progress["offset"] >= total:
+                progress["variant"] += 1
+                progress["offset"] = 0
+
+            checkpoint.save(genre_name, progress)
+            print(f"  [{genre_name}] {progress['saved']}/{target}곡 ({query} @ {progress['offset']})")
+
+    if progress["saved"] < target:
+        print(f"⚠️ [{genre_name}] 검색 결과가 부족해서 {progress['saved']}곡에서 종료")
+    return progress["saved"]
+
 
 def main():
+    parser = argparse.ArgumentParser(description="장르별 Spotify 검색 결과로 music 테이블 채우기")
+    parser.add_argument("specs", nargs="*", type=parse_spec, metavar="장르:곡수",
+                        help="예: K-pop:5000 Pop:3000 (생략하면 기본 장르 목록)")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 수집할 장르 수 (기본 4)")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="체크포인트 파일 경로")
+    parser.add_argument("--fresh", action="store_true", help="체크포인트를 무시하고 처음부터")
+    parser.add_argument("--no-features", action="store_true", help="오디오 특성 조회 생략 (더 빠름)")
+    args = parser.parse_args()
+
+    specs = args.specs or SEARCH_QUERIES
+    checkpoint = Checkpoint(args.checkpoint, fresh=args.fresh)
+
     print("🎵 Spotify 음악 데이터 삽입 시작...")
     print("=" * 50)
-    
-    conn = get_conn()
-    if not conn:
-        print("❌ DB 연결 실패")
-        return
-    
+    started = time.perf_counter()
     total_inserted = 0
-    
-    try:
-        for genre_name, count in SEARCH_QUERIES:
-            print(f"\n📂 [{genre_name}] {count}곡 수집 중...")
-            
-            # 장르 번호 가져오기/생성
-            genre_no = get_or_create_genre(conn, genre_name)
-            
-            # Spotify에서 트랙 가져오기
-            tracks = fetch_tracks_from_spotify(genre_name, count)
-            
-            for track in tracks:
-                if insert_music(conn, track, genre_no):
-                    total_inserted += 1
-                
-                # 70개 도달 시 종료
-                if total_inserted >= 70:
-                    break
-            
-            if total_inserted >= 70:
-                break
-    
-    finally:
-        conn.close()
-    
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers), thread_name_prefix="seed") as executor:
+        futures = {
+            executor.submit(seed_genre, name, count, checkpoint, not args.no_features): name
+            for name, count in specs
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                saved = future.result()
+                total_inserted += saved
+                print(f"✅ [{name}] {saved}곡")
+            except Exception as e:
+                print(f"❌ [{name}] 실패 (다시 실행하면 이어서 진행): {e}")
+
     print("\n" + "=" * 50)
-    print(f"🎉 완료! 총 {total_inserted}개 음악 데이터 삽입됨")
+    print(f"🎉 완료! 총 {total_inserted}개 음악 데이터 ({time.perf_counter() - started:.0f}초)")
+
 
 if __name__ == "__main__":
     main()
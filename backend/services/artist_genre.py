@@ -0,0 +1,84 @@
+from model import artist_genre as artist_genre_model
+from services import genre as genre_service
+from services.genre_matcher import match_genre
+from cache import TTLCache
+import os
+
+# sp.artists는 한 번에 최대 50개 id까지 받음
+ARTISTS_BATCH_SIZE = 50
+
+# DB에 저장된 매핑을 다시 Spotify에서 확인하기까지의 기간(일)
+ARTIST_GENRE_MAX_AGE_DAYS = int(os.getenv("ARTIST_GENRE_MAX_AGE_DAYS", 30))
+
+_cache = TTLCache(
+    maxsize=int(os.getenv("ARTIST_GENRE_CACHE_SIZE", 10000)),
+    ttl=int(os.getenv("ARTIST_GENRE_CACHE_TTL", 3600))
+)
+
+
+def map_genres_to_genre_no(spotify_genres):
+    """Spotify 장르 목록 → 우리 DB genre_no (매핑 없으면 None)"""
+    genre_name = match_genre(spotify_genres)
+    return genre_service.get_genre_no(genre_name) if genre_name else None
+
+
+def _fetch_artist_genres(sp, artist_ids):
+    """sp.artists로 50개씩 묶어서 장르 조회 → {artist_id: [genres]}"""
+    result = {}
+    for i in range(0, len(artist_ids), ARTISTS_BATCH_SIZE):
+        chunk = artist_ids[i:i + ARTISTS_BATCH_SIZE]
+        try:
+            artists = (sp.artists(chunk) or {}).get("artists") or []
+        except Exception as e:
+            print(f"  ⚠️ 아티스트 장르 조회 실패 ({len(chunk)}명): {e}")
+            continue
+
+        for artist in artists:
+            if artist and artist.get("id"):
+                result[artist["id"]] = artist.get("genres") or []
+    return result
+
+
+def resolve_genre_nos(sp, artist_ids):
+    """
+    아티스트 id 목록 → {artist_id: genre_no}
+    인메모리 LRU → artist_genre 테이블 → Spotify(sp.artists) 순서로 조회
+    - 매핑되는 장르가 없는 아티스트도 None으로 캐시해서 재조회하지 않음
+    - Spotify 조회에 실패한 아티스트는 결과에서 제외
+    """
+    ids = list(dict.fromkeys(a for a in artist_ids if a))
+    result = _cache.get_many(ids)
+
+    missing = [a for a in ids if a not in result]
+    if missing:
+        try:
+            rows = artist_genre_model.find_by_artist_ids(missing, ARTIST_GENRE_MAX_AGE_DAYS)
+        except Exception as e:
+            print(f"  ⚠️ 아티스트 장르 캐시 조회 실패: {e}")
+            rows = []
+
+        # 저장된 원본 장르로 다시 매칭 → GENRE_MAP이 바뀌어도 Spotify를 다시 조회하지 않음
+        stored = {
+            row['spotify_artist_id']: map_genres_to_genre_no(row['genres'].split(',') if row['genres'] else [])
+            for row in rows
+        }
+        _cache.set_many(stored)
+        result.update(stored)
+        missing = [a for a in missing if a not in stored]
+
+    if missing:
+        fetched = {}
+        rows = []
+        for artist_id, genres in _fetch_artist_genres(sp, missing).items():
+            fetched[artist_id] = map_genres_to_genre_no(genres)
+            rows.append({"spotify_artist_id": artist_id, "genres": ",".join(genres)[:1000]})
+
+        try:
+            artist_genre_model.upsert_many(rows)
+        except Exception as e:
+            print(f"  ⚠️ 아티스트 장르 저장 실패: {e}")
+
+        _cache.set_many(fetched)
+        result.update(fetched)
+
+    return result
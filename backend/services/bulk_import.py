@@ -0,0 +1,160 @@
+from model import bulk_import_job as job_model
+from services import music as music_service
+from concurrent.futures import ThreadPoolExecutor
+from spotify_client import BACKGROUND, SpotifyRateLimitError, spotify_priority
+import os
+import threading
+import time
+import uuid
+
+# Spotify 검색은 offset 1000까지만 조회 가능
+SPOTIFY_SEARCH_MAX_OFFSET = music_service.SPOTIFY_SEARCH_MAX_OFFSET
+BULK_IMPORT_MAX_COUNT = SPOTIFY_SEARCH_MAX_OFFSET
+
+# heartbeat가 이 시간(초) 이상 끊긴 running 작업은 중단된 것으로 보고 이어서 실행
+# (실행 중에는 별도 스레드가 이 값의 1/3 간격으로 heartbeat를 갱신)
+JOB_STALE_SECONDS = int(os.getenv("BULK_IMPORT_STALE_SECONDS", 120))
+POLL_INTERVAL = int(os.getenv("BULK_IMPORT_POLL_INTERVAL", 30))
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("BULK_IMPORT_WORKERS", 1)),
+    thread_name_prefix="bulk-import"
+)
+_active = set()
+_active_lock = threading.Lock()
+_watcher_started = False
+
+
+def _serialize(job):
+    for key in ('heartbeat_at', 'created_at', 'updated_at'):
+        if job.get(key):
+            job[key] = job[key].isoformat() if hasattr(job[key], 'isoformat') else str(job[key])
+    target = job.get('target_count') or 0
+    job['progress'] = min(100, round(job.get('saved_count', 0) / target * 100)) if target else 0
+    return job
+
+
+def _submit(job_id):
+    """이 프로세스에서 아직 처리 중이 아닌 작업만 실행 큐에 추가"""
+    with _active_lock:
+        if job_id in _active:
+            return
+        _active.add(job_id)
+    _executor.submit(_run_job, job_id)
+
+
+class _JobLost(Exception):
+    """heartbeat가 끊긴 사이 다른 워커가 작업을 가져감"""
+
+
+def _keep_alive(job_id, claim_token, stop):
+    """
+    실행 중인 동안 heartbeat를 JOB_STALE_SECONDS보다 자주 갱신
+    - 한 페이지가 Spotify 토큰 대기로 오래 걸려도 다른 워커가 작업을 중단된 것으로 보지 않도록
+    """
+    interval = max(1, JOB_STALE_SECONDS // 3)
+    while not stop.wait(interval):
+        try:
+            if not job_model.heartbeat(job_id, claim_token):
+                return
+        except Exception as e:
+            print(f"⚠️ bulk import heartbeat 실패: {job_id} - {e}")
+
+
+def _run_job(job_id):
+    claim_token = uuid.uuid4().hex
+    stop = threading.Event()
+    try:
+        if not job_model.claim_job(job_id, JOB_STALE_SECONDS, claim_token):
+            return
+        threading.Thread(
+            target=_keep_alive, args=(job_id, claim_token, stop),
+            name=f"bulk-import-heartbeat-{job_id[:8]}", daemon=True
+        ).start()
+
+        job = job_model.find_by_job_id(job_id)
+        sp = music_service.get_spotify_client()
+        offset = job['next_offset']
+        saved_count = job['saved_count']
+
+        with spotify_priority(BACKGROUND):
+            while saved_count < job['target_count'] and offset < SPOTIFY_SEARCH_MAX_OFFSET:
+                limit = min(
+                    music_service.SEARCH_PAGE_LIMIT,
+                    job['target_count'] - saved_count,
+                    SPOTIFY_SEARCH_MAX_OFFSET - offset
+                )
+                saved, fetched = music_service.import_search_page(sp, job['query'], offset, limit)
+                if not fetched:
+                    break
+
+                offset += fetched
+                saved_count += len(saved)
+                new_count = sum(1 for m in saved if m.get('is_new'))
+                if not job_model.record_page(job_id, claim_token, offset, fetched, len(saved), new_count):
+                    raise _JobLost()
+
+        job_model.finish_job(job_id, claim_token, 'done')
+        print(f"✅ bulk import 완료: {job_id} ({saved_count}곡)")
+
+    except _JobLost:
+        print(f"⏹️ bulk import 중단 (다른 워커가 이어서 실행 중): {job_id}")
+    except SpotifyRateLimitError as e:
+        # 한도 초과는 실패가 아니라 대기열로 되돌림 → 감시 스레드가 마지막 offset부터 다시 실행
+        print(f"⏸️ bulk import 일시 중지 (Spotify 한도 초과): {job_id}")
+        try:
+            job_model.finish_job(job_id, claim_token, 'queued', str(e))
+        except Exception:
+            pass
+    except Exception as e:
+        print(f"❌ bulk import 실패: {job_id} - {e}")
+        try:
+            job_model.finish_job(job_id, claim_token, 'failed', str(e))
+        except Exception:
+            pass
+    finally:
+        stop.set()
+        with _active_lock:
+            _active.discard(job_id)
+
+
+def _watch_resumable_jobs():
+    """중단된(heartbeat가 끊긴) 작업을 주기적으로 찾아서 마지막 offset부터 이어서 실행"""
+    while True:
+        try:
+            for job_id in job_model.find_resumable_job_ids(JOB_STALE_SECONDS):
+                _submit(job_id)
+        except Exception as e:
+            print(f"⚠️ bulk import 작업 조회 실패: {e}")
+        time.sleep(POLL_INTERVAL)
+
+
+def start_worker():
+    """앱 시작 시 호출: 중단된 작업 재개용 감시 스레드 시작"""
+    global _watcher_started
+    if _watcher_started:
+        return
+    _watcher_started = True
+    threading.Thread(target=_watch_resumable_jobs, name="bulk-import-watcher", daemon=True).start()
+
+
+def create_job(query: str, count: int):
+    """작업 생성 후 바로 백그라운드 실행 → (job, error)"""
+    try:
+        job_id = uuid.uuid4().hex
+        job_model.insert_job(job_id, query, count)
+        _submit(job_id)
+        return _serialize(job_model.find_by_job_id(job_id)), None
+    except Exception as e:
+        return None, str(e)
+
+
+def get_job(job_id: str):
+    """작업 진행 상황 조회 → (job, error)"""
+    try:
+        job = job_model.find_by_job_id(job_id)
+        if not job:
+            return None, "존재하지 않는 작업입니다."
+        return _serialize(job), None
+    except Exception as e:
+        return None, str(e)
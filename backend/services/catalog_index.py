@@ -0,0 +1,284 @@
+from bisect import bisect_left, insort
+from model import music as music_model
+import heapq
+import os
+import re
+import threading
+import time
+import unicodedata
+
+# 한 번에 돌려줄 수 있는 최대 추천 수
+SUGGEST_MAX_LIMIT = 20
+
+# 이 길이 이하의 접두어는 인기순 상위 목록을 미리 계산 (짧은 접두어는 매칭 범위가 넓음)
+PRECOMPUTED_PREFIX_LEN = int(os.getenv("SUGGEST_PRECOMPUTED_PREFIX_LEN", 3))
+
+# 매칭 키가 이보다 많은 긴 접두어는 첫 조회 때 계산한 인기순 목록을 보관
+HEAVY_PREFIX_ENTRIES = 1000
+
+# 다른 프로세스(seed_music.py, 다른 워커)에서 추가한 곡을 반영하기 위한 전체 재구성 주기(초)
+RELOAD_INTERVAL = int(os.getenv("CATALOG_INDEX_RELOAD_INTERVAL", 600))
+
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+# 한글 음절 분해용 (호환용 자모, 겹자모는 입력 순서대로 나눔: ㅘ → ㅗㅏ, ㄺ → ㄹㄱ)
+_HANGUL_BASE, _HANGUL_LAST = 0xAC00, 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ",
+              "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+_JONGSEONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ",
+              "ㄹㅌ", "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 사용자가 직접 입력한 겹자모도 같은 규칙으로 나눔
+_COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+_CONSONANT_FIRST, _CONSONANT_LAST = ord("ㄱ"), ord("ㅎ")
+
+
+def normalize(text):
+    """대소문자/전각/기호 차이를 없앤 비교용 문자열 ("IU - Love wins!" → "iu love wins")"""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return " ".join(_NON_WORD_RE.sub(" ", text).replace("_", " ").split())
+
+
+def _split_syllable(ch):
+    """한글 음절 → (초성, 중성, 종성), 음절이 아니면 None"""
+    code = ord(ch)
+    if not _HANGUL_BASE <= code <= _HANGUL_LAST:
+        return None
+    code -= _HANGUL_BASE
+    return _CHOSEONG[code // 588], _JUNGSEONG[(code % 588) // 28], _JONGSEONG[code % 28]
+
+
+def to_jamo(text):
+    """한글 음절을 자모로 분해 ("밤편지" → "ㅂㅏㅁㅍㅕㄴㅈㅣ") - 조합 중인 글자도 접두어로 매칭됨"""
+    out = []
+    for ch in text:
+        parts = _split_syllable(ch)
+        out.append("".join(parts) if parts else _COMPOUND_JAMO.get(ch, ch))
+    return "".join(out)
+
+
+def to_choseong(text):
+    """한글 음절 → 초성, 공백 제거 ("좋은 날" → "ㅈㅇㄴ"), 한글이 아닌 글자는 그대로"""
+    out = []
+    for ch in text:
+        if ch.isspace():
+            continue
+        parts = _split_syllable(ch)
+        out.append(parts[0] if parts else ch)
+    return "".join(out)
+
+
+def _is_consonant(ch):
+    return _CONSONANT_FIRST <= ord(ch) <= _CONSONANT_LAST
+
+
+def is_choseong_query(query):
+    """초성만으로 이루어진 검색어인지 ("ㅇㅇㅇ", "ㅂㅍ ㅈ")"""
+    chars = [ch for ch in (query or "") if not ch.isspace()]
+    return bool(chars) and all(_is_consonant(ch) for ch in chars)
+
+
+def _word_suffixes(name):
+    """정규화한 이름 전체와 각 단어에서 시작하는 부분 ("love dive" → "love dive", "dive")"""
+    words = normalize(name).split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def _name_keys(row):
+    """이름 색인 키: 곡명/아티스트명 (한글은 자모로 분해)"""
+    keys = set()
+    for name in (row.get('track_name'), row.get('artist_name')):
+        keys.update(to_jamo(suffix) for suffix in _word_suffixes(name))
+    return keys
+
+
+def _choseong_keys(row):
+    """초성 색인 키: 곡명/아티스트명의 초성 (한글이 들어간 이름만)"""
+    keys = set()
+    for name in (row.get('track_name'), row.get('artist_name')):
+        for suffix in _word_suffixes(name):
+            key = to_choseong(suffix)
+            if any(_is_consonant(ch) for ch in key):
+                keys.add(key)
+    return keys
+
+
+class PrefixIndex:
+    """
+    (키, music_no) 정렬 배열 기반 접두어 색인
+    - 짧은 접두어와 자주 걸리는 긴 접두어는 인기순 상위 목록을 보관
+    - 읽기/쓰기는 모듈 잠금(_lock) 안에서 호출
+    """
+
+    def __init__(self, key_fn):
+        self.key_fn = key_fn
+        self.entries = []
+        self.top = {}
+
+    def build(self, docs):
+        entries = []
+        candidates = {}
+        for music_no, doc in docs.items():
+            for key in self.key_fn(doc):
+                entries.append((key, music_no))
+                for n in range(1, min(len(key), PRECOMPUTED_PREFIX_LEN) + 1):
+                    candidates.setdefault(key[:n], set()).add(music_no)
+        entries.sort()
+
+        def popularity(music_no):
+            return docs[music_no].get('popularity') or 0
+
+        self.entries = entries
+        self.top = {
+            prefix: heapq.nlargest(SUGGEST_MAX_LIMIT, nos, key=popularity)
+            for prefix, nos in candidates.items()
+        }
+
+    def add(self, row, popularity):
+        music_no = row['music_no']
+        for key in self.key_fn(row):
+            insort(self.entries, (key, music_no))
+            for n in range(1, len(key) + 1):
+                if n > PRECOMPUTED_PREFIX_LEN and key[:n] not in self.top:
+                    continue
+                top = self.top.setdefault(key[:n], [])
+                if music_no not in top:
+                    top.append(music_no)
+                    top.sort(key=popularity, reverse=True)
+                    del top[SUGGEST_MAX_LIMIT:]
+
+    def find(self, prefix, limit, popularity):
+        """prefix로 시작하는 키의 music_no를 인기순으로 (limit=None이면 전부)"""
+        if limit is not None and limit <= SUGGEST_MAX_LIMIT and (
+                len(prefix) <= PRECOMPUTED_PREFIX_LEN or prefix in self.top):
+            return self.top.get(prefix, [])[:limit]
+
+        lo = bisect_left(self.entries, (prefix,))
+        hi = bisect_left(self.entries, (prefix + "\uffff",), lo)
+        matched = {music_no for _, music_no in self.entries[lo:hi]}
+        if limit is None:
+            return sorted(matched, key=popularity, reverse=True)
+        if hi - lo > HEAVY_PREFIX_ENTRIES:
+            self.top[prefix] = heapq.nlargest(SUGGEST_MAX_LIMIT, matched, key=popularity)
+        return heapq.nlargest(limit, matched, key=popularity)
+
+
+_docs = {}          # music_no -> 추천 응답용 곡 정보
+_names = PrefixIndex(_name_keys)            # 곡명/아티스트명 (한글은 자모 분해)
+_choseong = PrefixIndex(_choseong_keys)     # 곡명/아티스트명 초성
+_loaded = False
+_pending = None     # load() 중에 add_many로 들어온 행 (새 색인에 다시 적용)
+_lock = threading.Lock()
+_reloader_started = False
+
+
+def _doc(row):
+    return {col: row.get(col) for col in music_model.INDEX_COLUMNS}
+
+
+def _popularity(music_no):
+    return _docs[music_no].get('popularity') or 0
+
+
+def _apply(docs, names, choseong, rows):
+    """색인 한 벌(docs/names/choseong)에 곡 추가 (이미 있는 곡은 건너뜀)"""
+    def popularity(music_no):
+        return docs[music_no].get('popularity') or 0
+
+    for row in rows:
+        if row['music_no'] in docs:
+            continue
+        docs[row['music_no']] = _doc(row)
+        names.add(row, popularity)
+        choseong.add(row, popularity)
+
+
+def load():
+    """
+    music 테이블 전체로 색인을 다시 만듦
+    - 구성하는 동안 add_many로 들어온 곡은 따로 모아 두었다가 교체 직전에 새 색인에도 추가
+    """
+    global _docs, _names, _choseong, _loaded, _pending
+    started = time.perf_counter()
+    with _lock:
+        _pending = []
+    try:
+        docs = {row['music_no']: _doc(row) for row in music_model.find_index_rows()}
+        names, choseong = PrefixIndex(_name_keys), PrefixIndex(_choseong_keys)
+        names.build(docs)
+        choseong.build(docs)
+        with _lock:
+            _apply(docs, names, choseong, _pending)
+            _docs, _names, _choseong = docs, names, choseong
+            _loaded = True
+    finally:
+        with _lock:
+            _pending = None
+    print(f"✅ 자동완성 색인 구성: {len(docs)}곡, 키 {len(names.entries)}개, 초성 키 {len(choseong.entries)}개 "
+          f"({(time.perf_counter() - started) * 1000:.0f}ms)")
+
+
+def _reload_loop():
+    while True:
+        try:
+            load()
+        except Exception as e:
+            print(f"⚠️ 자동완성 색인 구성 실패: {e}")
+        time.sleep(RELOAD_INTERVAL)
+
+
+def start_loader():
+    """앱 시작 시 호출: 백그라운드에서 색인 구성 후 RELOAD_INTERVAL마다 재구성"""
+    global _reloader_started
+    if _reloader_started:
+        return
+    _reloader_started = True
+    threading.Thread(target=_reload_loop, name="catalog-index-loader", daemon=True).start()
+
+
+def add_many(rows):
+    """새로 저장된 곡을 색인에 추가 (music_no가 있는 행만)"""
+    rows = [r for r in rows if r.get('music_no')]
+    if not rows:
+        return
+
+    with _lock:
+        _apply(_docs, _names, _choseong, rows)
+        if _pending is not None:
+            _pending.extend(rows)
+
+
+def is_loaded():
+    return _loaded
+
+
+def find(query, limit=None):
+    """
+    검색어로 시작하는(단어 단위 포함) 곡의 music_no를 인기순으로
+    - 초성만 입력하면 초성 색인, 그 외에는 자모 분해한 이름 색인에서 찾음
+    - limit=None이면 매칭된 곡 전부
+    """
+    if is_choseong_query(query):
+        prefix = to_choseong(query)
+        use_choseong = True
+    else:
+        prefix = to_jamo(normalize(query))
+        use_choseong = False
+    if not prefix or not _loaded:
+        return []
+
+    with _lock:
+        index = _choseong if use_choseong else _names
+        return index.find(prefix, limit, _popularity)
+
+
+def suggest(query, limit=10):
+    """자동완성: 곡명/아티스트명 접두어(또는 초성) 기준 인기순 최대 limit개 (색인 구성 전이면 빈 목록)"""
+    limit = max(1, min(int(limit), SUGGEST_MAX_LIMIT))
+    music_nos = find(query, limit)
+    with _lock:
+        return [dict(_docs[music_no]) for music_no in music_nos if music_no in _docs]
@@ -0,0 +1,109 @@
+from model import music as music_model
+from model import job_checkpoint as job_checkpoint_model
+from services import music as music_service
+from rate_limiter import SharedTokenBucket
+from spotify_client import BACKGROUND, spotify_priority
+from spotipy.exceptions import SpotifyException
+import time
+
+# job_checkpoint에 기록하는 작업 이름
+JOB_NAME = "music-metadata-refresh"
+
+# tracks 엔드포인트는 한 번에 최대 50개 id까지 받음
+TRACKS_BATCH_SIZE = 50
+
+
+def _track_id(row):
+    """spotify_track_id가 없는 예전 곡은 spotify_url 끝에서 id를 꺼냄"""
+    if row.get('spotify_track_id'):
+        return row['spotify_track_id']
+    url = (row.get('spotify_url') or '').split('?')[0].rstrip('/')
+    return url.rsplit('/', 1)[-1] or None
+
+
+def _fetch_tracks(sp, budget, track_ids):
+    """
+    tracks 조회 (요청마다 budget 토큰 사용)
+    - 잘못되거나 삭제된 id가 섞이면 묶음 전체가 400 → 반으로 나눠 다시 조회하고, 문제 id는 로그 후 건너뜀
+    """
+    budget.acquire(max_wait=float("inf"))
+    try:
+        return [t for t in sp.tracks(track_ids, market="KR").get('tracks') or [] if t]
+    except SpotifyException as e:
+        if e.http_status != 400:
+            raise
+        if len(track_ids) == 1:
+            print(f"  ⚠️ 조회할 수 없는 track id 건너뜀: {track_ids[0]} ({e.msg})")
+            return []
+        mid = len(track_ids) // 2
+        return _fetch_tracks(sp, budget, track_ids[:mid]) + _fetch_tracks(sp, budget, track_ids[mid:])
+
+
+def _fetch_metadata(sp, budget, rows):
+    """곡 목록 → [{music_no, popularity, release_date, release_year}] (Spotify에 없는 곡은 제외)"""
+    ids = {row['music_no']: _track_id(row) for row in rows}
+    track_ids = list(dict.fromkeys(i for i in ids.values() if i))
+    if not track_ids:
+        return []
+    by_id = {}
+    for t in _fetch_tracks(sp, budget, track_ids):
+        by_id[t['id']] = t
+        # market을 지정하면 다른 id로 대체된(relinked) 트랙이 올 수 있음 → 요청한 id(linked_from)로도 찾음
+        linked_from = (t.get('linked_from') or {}).get('id')
+        if linked_from:
+            by_id[linked_from] = t
+
+    updates = []
+    for music_no, track_id in ids.items():
+        track = by_id.get(track_id)
+        if not track:
+            continue
+        release_date, release_year = music_service.parse_release_date(track.get('album'))
+        updates.append({
+            "music_no": music_no,
+            "popularity": track.get('popularity'),
+            "release_date": release_date,
+            "release_year": release_year
+        })
+    return updates
+
+
+def refresh_metadata(rate=1.0, limit=None, reset=False):
+    """
+    music_no 순서로 전체 곡의 popularity/발매일을 Spotify 기준으로 갱신
+    - 50곡씩 조회하고, 50곡 UPDATE와 진행 위치 저장을 한 트랜잭션으로 처리 → 중단돼도 이어서 실행
+    - rate: 이 작업이 쓸 초당 Spotify 요청 수 (공유 rate limiter와 별도로 추가 제한)
+    - limit: 이번 실행에서 처리할 최대 곡 수 (None이면 끝까지)
+    - 끝까지 처리하면 진행 위치를 0으로 되돌려 다음 실행은 처음부터
+    - 반환: (처리한 곡 수, 갱신한 곡 수)
+    """
+    if reset:
+        job_checkpoint_model.reset(JOB_NAME)
+    last_music_no = job_checkpoint_model.find_last_key(JOB_NAME)
+    print(f"▶ music_no > {last_music_no} 부터 갱신 (초당 {rate}회)")
+
+    sp = music_service.get_spotify_client()
+    budget = SharedTokenBucket(rate=rate, capacity=1)
+    scanned = updated = 0
+    started = time.perf_counter()
+
+    with spotify_priority(BACKGROUND):
+        while limit is None or scanned < limit:
+            batch = TRACKS_BATCH_SIZE if limit is None else min(TRACKS_BATCH_SIZE, limit - scanned)
+            rows = music_model.find_after(last_music_no, batch)
+            if not rows:
+                job_checkpoint_model.reset(JOB_NAME)
+                print("✅ 전체 곡 갱신 완료 (다음 실행은 처음부터)")
+                break
+
+            updates = _fetch_metadata(sp, budget, rows)
+            last_music_no = rows[-1]['music_no']
+            music_model.update_metadata_many(updates, JOB_NAME, last_music_no)
+
+            scanned += len(rows)
+            updated += len(updates)
+            elapsed = time.perf_counter() - started
+            print(f"  ✅ music_no ~{last_music_no}: {len(updates)}/{len(rows)}곡 갱신 "
+                  f"(누적 {scanned}곡, {scanned / elapsed:.1f}곡/s)")
+
+    return scanned, updated
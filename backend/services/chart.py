@@ -0,0 +1,188 @@
+from model import chart as chart_model
+from services import music as music_service
+from spotify_client import BACKGROUND, SpotifyRateLimitError, spotify_priority
+import json
+import os
+import threading
+import time
+
+# 차트 목록: chart_key → {playlist_id, market}
+# - SPOTIFY_CHARTS 환경변수(JSON)로 추가/변경 가능
+#   예) {"kr-top-50": {"playlist_id": "37i9dQZEVXbNxXF4SkHj9F", "market": "KR"}}
+DEFAULT_CHART_KEY = "global-top-50"
+
+
+def _load_charts():
+    """기본 차트 + SPOTIFY_CHARTS (형식이 잘못된 값은 경고 후 무시, 앱 시작은 막지 않음)"""
+    charts = {DEFAULT_CHART_KEY: {"playlist_id": music_service.GLOBAL_TOP_50_PLAYLIST_ID, "market": None}}
+    raw = os.getenv("SPOTIFY_CHARTS")
+    if not raw:
+        return charts
+    try:
+        extra = json.loads(raw)
+    except ValueError as e:
+        print(f"⚠️ SPOTIFY_CHARTS JSON 형식 오류, 기본 차트만 사용: {e}")
+        return charts
+    if not isinstance(extra, dict):
+        print("⚠️ SPOTIFY_CHARTS는 {chart_key: {playlist_id, market}} 형식이어야 합니다. 기본 차트만 사용")
+        return charts
+    for chart_key, config in extra.items():
+        if not isinstance(config, dict) or not config.get("playlist_id"):
+            print(f"⚠️ SPOTIFY_CHARTS의 '{chart_key}'에 playlist_id가 없어 무시합니다.")
+            continue
+        charts[chart_key] = {"playlist_id": config["playlist_id"], "market": config.get("market")}
+    return charts
+
+
+CHARTS = _load_charts()
+
+# snapshot_id 확인 주기(초)
+CHART_CHECK_INTERVAL = int(os.getenv("CHART_CHECK_INTERVAL", 3600))
+
+# 스냅샷이 아직 없는 차트의 첫 갱신을 다시 시도하기까지의 간격(초)
+CHART_COLD_RETRY_INTERVAL = int(os.getenv("CHART_COLD_RETRY_INTERVAL", 30))
+
+# 플레이리스트 항목 조회 한 번에 가져올 수 있는 최대 개수
+PLAYLIST_ITEMS_LIMIT = 100
+
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+_scheduler_started = False
+
+
+def _fetch_playlist_tracks(sp, playlist_id, market):
+    """플레이리스트 전체 트랙 (순서 유지)"""
+    tracks = []
+    offset = 0
+    while True:
+        page = sp.playlist_items(
+            playlist_id, limit=PLAYLIST_ITEMS_LIMIT, offset=offset,
+            market=market, additional_types=("track",)
+        )
+        items = page.get('items') or []
+        tracks.extend(item['track'] for item in items if item.get('track'))
+        if not page.get('next') or not items:
+            return tracks
+        offset += len(items)
+
+
+def _register(chart_key):
+    """차트 설정을 chart 테이블에 반영"""
+    config = CHARTS[chart_key]
+    chart_model.upsert_chart(chart_key, config['playlist_id'], config.get('market'))
+    return config
+
+
+def refresh_chart(chart_key, force=False):
+    """
+    snapshot_id가 바뀌었을 때만 플레이리스트를 다시 가져와서 저장
+    - 반환: 스냅샷을 교체했으면 True
+    """
+    config = _register(chart_key)
+    stored = chart_model.find_by_chart_key(chart_key)
+
+    sp = music_service.get_spotify_client()
+    with spotify_priority(BACKGROUND):
+        playlist = sp.playlist(
+            config['playlist_id'], fields="snapshot_id", market=config.get('market')
+        )
+        snapshot_id = playlist.get('snapshot_id')
+        if not force and stored and stored.get('refreshed_at') and stored.get('snapshot_id') == snapshot_id:
+            return False
+
+        tracks = _fetch_playlist_tracks(sp, config['playlist_id'], config.get('market'))
+        saved = music_service.save_tracks(sp, tracks)
+
+    chart_model.replace_entries(chart_key, snapshot_id, [music['music_no'] for music, _ in saved])
+    print(f"✅ 차트 스냅샷 갱신: {chart_key} ({snapshot_id}, {len(saved)}곡)")
+    return True
+
+
+def _refresh_in_background(chart_key, cold=False):
+    """
+    한 프로세스에서 같은 차트를 동시에 갱신하지 않도록 하고 백그라운드 실행
+    - 여러 워커 중 claim_check에 성공한 한 곳만 갱신
+    - cold: 스냅샷이 없는 차트 → 짧은 간격(CHART_COLD_RETRY_INTERVAL)으로 강제 갱신
+    """
+    with _refreshing_lock:
+        if chart_key in _refreshing:
+            return
+        _refreshing.add(chart_key)
+
+    interval = CHART_COLD_RETRY_INTERVAL if cold else CHART_CHECK_INTERVAL
+
+    def run():
+        try:
+            _register(chart_key)
+            if chart_model.claim_check(chart_key, interval):
+                refresh_chart(chart_key, force=cold)
+        except Exception as e:
+            print(f"⚠️ 차트 갱신 실패: {chart_key} - {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(chart_key)
+
+    threading.Thread(target=run, name=f"chart-refresh-{chart_key}", daemon=True).start()
+
+
+def _scheduled_refresh():
+    """모든 차트의 snapshot_id를 주기적으로 확인"""
+    while True:
+        for chart_key in CHARTS:
+            _refresh_in_background(chart_key)
+        time.sleep(CHART_CHECK_INTERVAL)
+
+
+def start_scheduler():
+    """앱 시작 시 호출: 차트 갱신 스케줄러 시작"""
+    global _scheduler_started
+    if _scheduler_started:
+        return
+    _scheduler_started = True
+    threading.Thread(target=_scheduled_refresh, name="chart-scheduler", daemon=True).start()
+
+
+def get_chart(chart_key=DEFAULT_CHART_KEY):
+    """
+    저장된 차트 스냅샷 조회 → (chart, error)
+    - 스냅샷이 없으면 백그라운드 갱신을 시작하고 빈 목록 반환 (refreshing=True)
+      → 콜드 스타트에 모든 워커가 동시에 Spotify를 호출하지 않도록 한 워커만 갱신
+    - 마지막 확인 후 CHART_CHECK_INTERVAL이 지났으면 저장된 스냅샷을 반환하고 백그라운드에서 확인
+    """
+    if chart_key not in CHARTS:
+        return None, "존재하지 않는 차트입니다."
+
+    try:
+        rows = chart_model.find_entries(chart_key)
+        if not rows:
+            _refresh_in_background(chart_key, cold=True)
+            return {
+                "chart_key": chart_key,
+                "snapshot_id": None,
+                "refreshed_at": None,
+                "refreshing": True,
+                "musics": []
+            }, None
+
+        meta = rows[0]
+        checked_age = meta.get('checked_age')
+        if checked_age is None or checked_age >= CHART_CHECK_INTERVAL:
+            _refresh_in_background(chart_key)
+
+        refreshed_at = meta.get('refreshed_at')
+        musics = [
+            {k: v for k, v in row.items() if k not in ('snapshot_id', 'checked_age', 'refreshed_at')}
+            for row in rows
+        ]
+        return {
+            "chart_key": chart_key,
+            "snapshot_id": meta.get('snapshot_id'),
+            "refreshed_at": refreshed_at.isoformat() if hasattr(refreshed_at, 'isoformat') else refreshed_at,
+            "refreshing": False,
+            "musics": musics
+        }, None
+
+    except SpotifyRateLimitError:
+        raise
+    except Exception as e:
+        return None, str(e)
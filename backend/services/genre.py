@@ -0,0 +1,66 @@
+from model import genre as genre_model
+import os
+import threading
+import time
+
+# 없는 장르 이름이 조회됐을 때 다시 읽어오는 최소 간격(초)
+# - 다른 프로세스(seed_music.py 등)에서 추가한 장르를 반영하기 위함
+MISS_RELOAD_INTERVAL = int(os.getenv("GENRE_MISS_RELOAD_INTERVAL", 30))
+
+_by_name = {}       # name.casefold() -> genre_no
+_by_no = {}         # genre_no -> name
+_loaded = False
+_last_load = 0.0
+_lock = threading.Lock()
+
+
+def load():
+    """genre 테이블 전체를 메모리로 읽어옴"""
+    global _by_name, _by_no, _loaded, _last_load
+    rows = genre_model.find_all()
+    with _lock:
+        _by_name = {row['name'].casefold(): row['genre_no'] for row in rows}
+        _by_no = {row['genre_no']: row['name'] for row in rows}
+        _loaded = True
+        _last_load = time.monotonic()
+
+
+def invalidate():
+    """장르가 추가/변경됐을 때 호출"""
+    load()
+
+
+def _ensure_loaded():
+    if not _loaded:
+        load()
+
+
+def get_genre_no(name):
+    """장르 이름 → genre_no (없으면 None)"""
+    if not name:
+        return None
+    _ensure_loaded()
+
+    key = name.casefold()
+    genre_no = _by_name.get(key)
+    if genre_no is None and time.monotonic() - _last_load >= MISS_RELOAD_INTERVAL:
+        load()
+        genre_no = _by_name.get(key)
+    return genre_no
+
+
+def get_genre_name(genre_no):
+    """genre_no → 장르 이름 (없으면 None)"""
+    if genre_no is None:
+        return None
+    _ensure_loaded()
+    return _by_no.get(genre_no)
+
+
+def get_or_create_genre(name):
+    """장르 번호 조회 (없으면 생성 후 레지스트리 갱신, 동시에 생성해도 같은 genre_no)"""
+    genre_no = get_genre_no(name)
+    if genre_no is None:
+        genre_no = genre_model.insert_genre(name)
+        invalidate()
+    return genre_no
@@ -0,0 +1,88 @@
+import re
+from functools import lru_cache
+
+# Spotify 장르 문구 → 우리 DB 장르 이름
+# 위에 있을수록 우선순위가 높음 (아티스트 장르 여러 개가 매칭되면 가장 위의 항목 선택)
+# - 구체적인 문구를 일반적인 문구보다 먼저 둠 (예: "k-pop" > "pop", "metal" > "rock")
+GENRE_MAP = {
+    "k-pop": "K-Pop",
+    "korean pop": "K-Pop",
+    "k-rap": "Hip-Hop",
+    "korean hip hop": "Hip-Hop",
+    "korean r&b": "R&B",
+    "hip hop": "Hip-Hop",
+    "hip-hop": "Hip-Hop",
+    "rap": "Hip-Hop",
+    "trap": "Hip-Hop",
+    "r&b": "R&B",
+    "rnb": "R&B",
+    "soul": "R&B",
+    "jazz": "Jazz",
+    "metal": "Metal",
+    "metalcore": "Metal",
+    "edm": "Electronic",
+    "electronic": "Electronic",
+    "electronica": "Electronic",
+    "house": "Electronic",
+    "techno": "Electronic",
+    "indie": "Indie",
+    "rock": "Rock",
+    "dance pop": "Pop",
+    "pop": "Pop",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9&]+")
+
+
+def _tokenize(text):
+    """소문자 변환 후 단어 단위로 분리 ("k-pop girl group" → ["k", "pop", "girl", "group"])"""
+    return tuple(_TOKEN_RE.findall((text or "").lower()))
+
+
+class GenreMatcher:
+    """
+    GENRE_MAP을 첫 단어 기준으로 색인한 다중 문구 매칭기
+    - 장르 문자열을 한 번 훑으면서 각 단어 위치에서 시작하는 문구만 비교
+    - 단어 경계 기준으로 매칭하므로 "k-pop girl group", "korean r&b"처럼 수식어가 붙어도 매칭됨
+    """
+
+    def __init__(self, genre_map):
+        # 첫 단어 → [(문구 단어들, 우선순위, 장르 이름)]
+        self._index = {}
+        for rank, (phrase, genre_name) in enumerate(genre_map.items()):
+            tokens = _tokenize(phrase)
+            if tokens:
+                self._index.setdefault(tokens[0], []).append((tokens, rank, genre_name))
+        self._match_one = lru_cache(maxsize=4096)(self._match_one_uncached)
+
+    def _match_one_uncached(self, spotify_genre):
+        """장르 문자열 하나 → (우선순위, 장르 이름) 또는 None"""
+        tokens = _tokenize(spotify_genre)
+        best = None
+        for i, token in enumerate(tokens):
+            for phrase, rank, genre_name in self._index.get(token, ()):
+                if best is not None and rank >= best[0]:
+                    continue
+                if tokens[i:i + len(phrase)] == phrase:
+                    best = (rank, genre_name)
+        return best
+
+    def match(self, spotify_genres):
+        """아티스트의 Spotify 장르 목록 → 가장 우선순위가 높은 장르 이름 (없으면 None)"""
+        best = None
+        for g in spotify_genres or ():
+            found = self._match_one(g or "")
+            if found and (best is None or found[0] < best[0]):
+                best = found
+        return best[1] if best else None
+
+    def match_many(self, genres_list):
+        """여러 아티스트의 장르 목록을 한 번에 매칭"""
+        return [self.match(genres) for genres in genres_list]
+
+
+default_matcher = GenreMatcher(GENRE_MAP)
+
+
+def match_genre(spotify_genres):
+    return default_matcher.match(spotify_genres)
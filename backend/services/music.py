@@ -1,105 +1,133 @@
 from model import music as music_model
-from spotipy import Spotify
-from spotipy.oauth2 import SpotifyClientCredentials
+from services import artist_genre as artist_genre_service
+from services import genre as genre_service
+from services import catalog_index
+from cache import StaleWhileRevalidateCache
+from concurrent.futures import ThreadPoolExecutor
+from spotify_client import BACKGROUND, PREFETCH, SpotifyRateLimitError, spotify_priority
+import threading
+from db import release_idle_connection
+import spotify_client
 import os
 
-GENRE_MAP = {
-    "k-pop": "K-Pop",
-    "korean pop": "K-Pop",
-    "dance pop": "Pop",
-    "pop": "Pop",
-    "hip hop": "Hip-Hop",
-    "hip-hop": "Hip-Hop",
-    "r&b": "R&B",
-    "jazz": "Jazz",
-    "electronic": "Electronic",
-    "edm": "Electronic",
-    "rock": "Rock",
-    "metal": "Metal",
-    "indie": "Indie",
-}
+# 검색 한 번에 가져올 수 있는 최대 트랙 수
+SEARCH_PAGE_LIMIT = 50
+
+# Spotify 검색은 offset 1000까지만 조회 가능
+SPOTIFY_SEARCH_MAX_OFFSET = 1000
 
 # Spotify 글로벌 Top 50 플레이리스트 ID
 GLOBAL_TOP_50_PLAYLIST_ID = "37i9dQZEVXbMDoHDwVN2tF"
 
+# /music/search 결과 캐시 (저장/정렬까지 끝난 musics 목록을 보관)
+search_cache = StaleWhileRevalidateCache(
+    maxsize=int(os.getenv("SEARCH_CACHE_SIZE", 1000)),
+    ttl=int(os.getenv("SEARCH_CACHE_TTL", 60)),
+    stale_ttl=int(os.getenv("SEARCH_CACHE_STALE_TTL", 600)),
+    name="search-cache",
+    # 만료된 결과의 백그라운드 갱신은 사용자 요청보다 낮은 우선순위로
+    refresh_context=lambda: spotify_priority(PREFETCH)
+)
 
-def get_spotify_client():
-    client_id = os.getenv("SPOTIFY_CLIENT_ID")
-    client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
+# 로컬 검색 결과를 Spotify 대신 쓰기 위한 최소 FULLTEXT 관련도 (NATURAL LANGUAGE MODE 점수)
+SEARCH_LOCAL_MIN_SCORE = float(os.getenv("SEARCH_LOCAL_MIN_SCORE", 1.0))
 
-    if not client_id or not client_secret:
-        raise RuntimeError("Spotify 환경변수(SPOTIY_CLIENT_ID/SECRET)가 설정되지 않았습니다.")
+# GET /music?q= 검색 결과 최대 곡 수
+MUSIC_LIST_SEARCH_LIMIT = int(os.getenv("MUSIC_LIST_SEARCH_LIMIT", 200))
 
-    return Spotify(
-        auth_manager=SpotifyClientCredentials(
-            client_id=client_id,
-            client_secret=client_secret
-        )
-    )
+# /music/search에서 DB FULLTEXT 검색을 먼저 할지 여부
+SEARCH_LOCAL_FIRST = os.getenv("SEARCH_LOCAL_FIRST", "true").lower() == "true"
+
+# 검색 결과를 돌려준 뒤 다음 페이지를 미리 가져와서 search_cache에 저장할지 여부
+# - 사용자(클라이언트)마다 대기 중인 prefetch는 최대 1개, 검색 조건이 바뀌면 취소
+SEARCH_PREFETCH = os.getenv("SEARCH_PREFETCH", "true").lower() == "true"
+prefetch_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SEARCH_PREFETCH_WORKERS", 2)), thread_name_prefix="search-prefetch"
+)
+_prefetches = {}    # client_key -> (다음 페이지 캐시 키, Future)
+# Future.cancel()이 잠금 안에서 완료 콜백(forget)을 바로 실행하므로 재진입 가능한 잠금 사용
+_prefetch_lock = threading.RLock()
+
+
+def get_spotify_client():
+    """프로세스 전체에서 공유하는 Spotify 클라이언트"""
+    return spotify_client.get_spotify_client()
 
 
 def extract_genre_no(sp, artist_id):
     """Spotify artist → genres → 우리 DB genre_no"""
-    try:
-        artist = sp.artist(artist_id)
-        spotify_genres = artist.get("genres", [])
-    except Exception:
-        spotify_genres = []
+    return artist_genre_service.resolve_genre_nos(sp, [artist_id]).get(artist_id)
+
 
-    for g in spotify_genres:
-        key = (g or "").lower()
-        if key in GENRE_MAP:
-            genre_name = GENRE_MAP[key]
-            return music_model.find_genre_no_by_name(genre_name)
+# audio_features 엔드포인트는 한 번에 최대 100개 id까지 받음
+AUDIO_FEATURES_BATCH_SIZE = 100
 
-    return None
+
+def _to_audio_features(f):
+    """Spotify 오디오 특성(0~1) → DB 저장용 정수(0~100)"""
+    return {
+        "energy": round((f.get("energy") or 0) * 100),
+        "danceability": round((f.get("danceability") or 0) * 100),
+        "valence": round((f.get("valence") or 0) * 100),
+        "acousticness": round((f.get("acousticness") or 0) * 100),
+        "instrumentalness": round((f.get("instrumentalness") or 0) * 100)
+    }
+
+
+def fetch_audio_features_batch(sp, track_ids):
+    """
+    여러 트랙의 오디오 특성을 100개 단위로 묶어서 조회
+    - 반환: {track_id: 오디오 특성 dict} (조회 실패한 트랙은 제외)
+    """
+    ids = list(dict.fromkeys(t for t in track_ids if t))
+    result = {}
+
+    for i in range(0, len(ids), AUDIO_FEATURES_BATCH_SIZE):
+        chunk = ids[i:i + AUDIO_FEATURES_BATCH_SIZE]
+        try:
+            features = sp.audio_features(chunk) or []
+        except Exception as e:
+            print(f"  ⚠️ 오디오 특성 조회 실패 ({len(chunk)}곡): {e}")
+            continue
+
+        for track_id, f in zip(chunk, features):
+            if f:
+                result[track_id] = _to_audio_features(f)
+
+    return result
 
 
 def fetch_audio_features(sp, track_id):
-    """Spotify API에서 오디오 특성 가져오기"""
+    """Spotify API에서 오디오 특성 가져오기 (단건)"""
+    return fetch_audio_features_batch(sp, [track_id]).get(track_id)
+
+
+def parse_release_date(album):
+    """Spotify album → (release_date, release_year), 일 단위 정밀도가 아니면 release_date는 None"""
+    value = (album or {}).get("release_date") or ""
     try:
-        features = sp.audio_features([track_id])
-        if features and features[0]:
-            f = features[0]
-            return {
-                "energy": round(f.get("energy", 0) * 100),
-                "danceability": round(f.get("danceability", 0) * 100),
-                "valence": round(f.get("valence", 0) * 100),
-                "acousticness": round(f.get("acousticness", 0) * 100),
-                "instrumentalness": round(f.get("instrumentalness", 0) * 100)
-            }
-    except Exception as e:
-        print(f"  ⚠️ 오디오 특성 조회 실패: {e}")
-    return None
+        year = int(value[:4])
+    except ValueError:
+        return None, None
+    if (album.get("release_date_precision") or "day") == "day" and len(value) == 10:
+        return value, year
+    return None, year
 
 
-def save_track_if_not_exists(sp, track):
-    """트랙이 DB에 없으면 저장, 있으면 기존 데이터 반환"""
+def build_music_row(track):
+    """Spotify track 객체 → music 테이블 row (장르/오디오 특성 제외)"""
     spotify_url = track.get("external_urls", {}).get("spotify")
     if not spotify_url:
-        return None, False
-
-    # 중복 체크
-    existing = music_model.find_by_spotify_url(spotify_url)
-    if existing:
-        return existing, False  # 이미 존재
+        return None, None
 
-    # 새로 저장
     artists = track.get("artists") or []
     artist_id = artists[0].get("id") if artists else None
     artist_name = artists[0].get("name") if artists else ""
 
-    genre_no = extract_genre_no(sp, artist_id) if artist_id else None
-
     album = track.get("album") or {}
     images = album.get("images") or []
     album_image_url = images[0].get("url") if images else None
-
-    # Spotify track_id 추출
-    track_id = track.get("id")
-
-    # 오디오 특성 가져오기
-    audio_features = fetch_audio_features(sp, track_id) if track_id else None
+    release_date, release_year = parse_release_date(album)
 
     music = {
         "track_name": track.get("name") or "",
@@ -109,112 +137,312 @@ def save_track_if_not_exists(sp, track):
         "duration_ms": track.get("duration_ms") or 0,
         "popularity": track.get("popularity") or 0,
         "spotify_url": spotify_url,
-        "genre_no": genre_no,
+        "genre_no": None,
         "preview_url": track.get("preview_url"),
-        "spotify_track_id": track_id
+        "spotify_track_id": track.get("id"),
+        "release_date": release_date,
+        "release_year": release_year
     }
+    return music, artist_id
+
+
+def save_tracks(sp, tracks):
+    """
+    한 페이지 분량의 트랙을 저장 (중복 제외)
+    1) 페이지 전체를 IN 쿼리 한 번으로 조회해서 기존 트랙과 신규 트랙 분리
+    2) 신규 트랙의 장르(아티스트 일괄 조회)/오디오 특성(100곡 단위 조회)을 row에 병합
+    3) 병합된 row를 한 트랜잭션으로 upsert
+    - 반환: [(music, is_new), ...] (입력 순서 유지, 저장 실패한 트랙은 제외)
+    """
+    results = [None] * len(tracks)
+    candidates = []     # (index, row, artist_id)
+    duplicates = []     # (index, 같은 페이지에서 먼저 나온 index)
+    seen = {}
+
+    for i, track in enumerate(tracks):
+        music, artist_id = build_music_row(track)
+        if not music:
+            continue
+
+        url = music["spotify_url"]
+        if url in seen:
+            duplicates.append((i, seen[url]))
+            continue
+        seen[url] = i
+        candidates.append((i, music, artist_id))
+
+    existing_rows = music_model.find_by_spotify_urls(
+        [music["spotify_url"] for _, music, _ in candidates]
+    )
+
+    pending = []        # (index, row, artist_id)
+    for i, music, artist_id in candidates:
+        existing = existing_rows.get(music["spotify_url"])
+        if existing:
+            results[i] = (existing, False)
+        else:
+            pending.append((i, music, artist_id))
+
+    genre_nos = artist_genre_service.resolve_genre_nos(sp, [artist_id for _, _, artist_id in pending])
+    features = fetch_audio_features_batch(sp, [music["spotify_track_id"] for _, music, _ in pending])
+
+    for i, music, artist_id in pending:
+        music["genre_no"] = genre_nos.get(artist_id)
+
+        audio_features = features.get(music["spotify_track_id"])
+        if audio_features:
+            music.update(audio_features)
+
+    music_nos = music_model.upsert_many([music for _, music, _ in pending])
+
+    for (i, music, _), music_no in zip(pending, music_nos):
+        if music_no:
+            music["music_no"] = music_no
+            results[i] = (music, True)
+
+    # 자동완성 색인에 새 곡 반영
+    catalog_index.add_many([music for _, music, _ in pending])
+
+    for i, first in duplicates:
+        if results[first]:
+            results[i] = (results[first][0], False)
+
+    return [r for r in results if r]
+
+
+def save_track_if_not_exists(sp, track):
+    """트랙이 DB에 없으면 저장, 있으면 기존 데이터 반환"""
+    saved = save_tracks(sp, [track])
+    return saved[0] if saved else (None, False)
+
+
+def _normalize_search_key(keyword, category, page, size):
+    """검색 캐시 키: (공백 정리/소문자 검색어, category, page, size)"""
+    kw = " ".join((keyword or "").split()).lower()
+    return (kw, category or "", page, size)
 
-    # 오디오 특성이 있으면 추가
-    if audio_features:
-        music.update(audio_features)
 
-    music_no = music_model.insert_music(music)
-    if music_no:
-        music["music_no"] = music_no
-        return music, True
+def _search_spotify_and_save(keyword, category, page, size):
+    """Spotify 검색 → 저장 → 관련성 정렬 (실패 시 예외 발생)"""
+    sp = get_spotify_client()
+    offset = (page - 1) * size
+
+    # category 처리(원하는 방식으로 확장 가능)
+    # - category=artist: artist 필드 중심으로 검색되게 쿼리 강화
+    if category == "artist":
+        q = f"artist:{keyword}"
+    else:
+        q = keyword
+
+    # Spotify 응답을 기다리는 동안 요청 연결을 붙잡지 않도록 먼저 반납
+    release_idle_connection()
+    results = sp.search(
+        q=q,
+        type="track",
+        limit=size,
+        offset=offset,
+        market="KR"
+    )
+
+    tracks_obj = results.get("tracks") or {}
+    total = tracks_obj.get("total") or 0
+    items = tracks_obj.get("items") or []
+
+    musics = []
+    for music, is_new in save_tracks(sp, items):
+        music["is_new"] = is_new
+        musics.append(music)
 
-    return None, False
+    return _sort_by_relevance(musics, keyword), total
+
+
+def _sort_by_relevance(musics, keyword):
+    """아티스트명이 검색어와 일치하는 곡을 우선 정렬 (같은 순위는 기존 순서 유지)"""
+    kw = keyword.lower()
+    def relevance(m):
+        artist = (m.get("artist_name") or "").lower()
+        if artist == kw:
+            return 0  # 정확히 일치
+        elif kw in artist:
+            return 1  # 부분 일치
+        else:
+            return 2  # 불일치
+    musics.sort(key=relevance)
+    return musics
 
 
-def search_and_save_music(keyword, category, page, size):
+def _search_local(keyword, category, page, size):
     """
-    ✅ /music/search?q=...&category=...&page=1&size=12
-    - Spotify에서 track 검색
-    - DB에 저장(중복 제외)
-    - 반환: (musics, total, error)
+    DB FULLTEXT 인덱스로 먼저 검색
+    - 관련도가 SEARCH_LOCAL_MIN_SCORE 이상인 곡만으로 요청한 페이지를 채울 수 있으면 (musics, total), 아니면 None
+    - ngram보다 짧은 단어가 있으면 접두 검색이라 부분 문자열 매칭이 많으므로 Spotify 검색으로
+    - Spotify 결과와 같은 형태로 후처리 (관련도 정렬, is_new=False)
     """
+    terms = music_model.fulltext_terms(keyword)
+    if not terms or min(len(t) for t in terms) < music_model.NGRAM_TOKEN_SIZE:
+        return None
+
+    offset = (page - 1) * size
+    try:
+        musics, total = music_model.search_fulltext(
+            keyword, category, offset, size, min_score=SEARCH_LOCAL_MIN_SCORE
+        )
+    except Exception as e:
+        # 인덱스가 없거나(마이그레이션 전) DB 오류 → Spotify 검색으로 진행
+        print(f"⚠️ 로컬 검색 실패: {e}")
+        return None
+    if total < offset + size:
+        return None
+    for music in musics:
+        music["is_new"] = False
+    return _sort_by_relevance(musics, keyword), total
+
+
+def _search_choseong(keyword, page, size):
+    """초성 검색어 ("ㅇㅇㅇ")는 Spotify로 찾을 수 없으므로 초성 색인에서만 검색"""
+    music_nos = catalog_index.find(keyword)
+    offset = (page - 1) * size
+    return music_model.find_by_music_nos(music_nos[offset:offset + size]), len(music_nos)
+
+
+def _search(keyword, category, page, size):
+    """로컬 우선 검색 → (musics, total, source)"""
+    if catalog_index.is_choseong_query(keyword):
+        return (*_search_choseong(keyword, page, size), "local")
+    if SEARCH_LOCAL_FIRST:
+        local = _search_local(keyword, category, page, size)
+        if local is not None:
+            return (*local, "local")
+    return (*_search_spotify_and_save(keyword, category, page, size), "remote")
+
+
+def _prefetch_page(key, keyword, category, page, size):
+    """다음 페이지를 검색해서 search_cache에 저장 (실패해도 무시)"""
+    if search_cache.peek(key) is not None:
+        return
     try:
-        sp = get_spotify_client()
+        with spotify_priority(PREFETCH):
+            search_cache.set(key, _search(keyword, category, page, size))
+    except Exception as e:
+        print(f"⚠️ 다음 페이지 미리 가져오기 실패: {key} - {e}")
 
+
+def _schedule_prefetch(client_key, keyword, category, page, size, total):
+    """
+    page 다음 페이지를 백그라운드에서 미리 가져오기
+    - 같은 클라이언트의 이전 prefetch가 다른 검색 조건이면 취소 (아직 시작 전인 경우)
+    - 이전 prefetch가 실행 중이면 새로 예약하지 않음 (클라이언트당 최대 1개)
+    """
+    if not SEARCH_PREFETCH or client_key is None:
+        return
+
+    next_key = _normalize_search_key(keyword, category, page + 1, size)
+    # Spotify 검색은 offset + limit이 1000을 넘으면 실패하므로 그 뒤 페이지는 미리 가져오지 않음
+    has_next = (
+        page * size < total
+        and page * size + size <= SPOTIFY_SEARCH_MAX_OFFSET
+        and search_cache.peek(next_key) is None
+    )
+
+    with _prefetch_lock:
+        previous = _prefetches.get(client_key)
+        if previous and not previous[1].done():
+            if previous[0] == next_key or not previous[1].cancel():
+                return
+        _prefetches.pop(client_key, None)
+        if not has_next:
+            return
+
+        future = prefetch_executor.submit(_prefetch_page, next_key, keyword, category, page + 1, size)
+        _prefetches[client_key] = (next_key, future)
+
+    def forget(done):
+        with _prefetch_lock:
+            if _prefetches.get(client_key, (None, None))[1] is done:
+                del _prefetches[client_key]
+
+    future.add_done_callback(forget)
+
+
+def search_and_save_music(keyword, category, page, size, client_key=None):
+    """
+    ✅ /music/search?q=...&category=...&page=1&size=12
+    - DB에서 먼저 검색하고, 요청한 페이지를 채우지 못하면 Spotify에서 track 검색
+    - Spotify 결과는 DB에 저장(중복 제외)
+    - 같은 검색 조건은 search_cache에서 바로 반환
+    - client_key가 있으면 다음 페이지를 백그라운드에서 미리 가져옴
+    - 반환: (musics, total, source, error), source는 "local" 또는 "remote"
+    """
+    try:
         # page/size 안전 처리
         page = max(int(page or 1), 1)
         size = max(int(size or 12), 1)
-        offset = (page - 1) * size
+        keyword = keyword.strip()
 
-        # category 처리(원하는 방식으로 확장 가능)
-        # - category=artist: artist 필드 중심으로 검색되게 쿼리 강화
-        if category == "artist":
-            q = f"artist:{keyword}"
-        else:
-            q = keyword
-
-        results = sp.search(
-            q=q,
-            type="track",
-            limit=size,
-            offset=offset,
-            market="KR"
-        )
+        key = _normalize_search_key(keyword, category, page, size)
+        loaded = []
+
+        def load():
+            result = _search(keyword, category, page, size)
+            loaded.append(True)
+            return result
+
+        musics, total, source = search_cache.get_or_load(key, load)
+        _schedule_prefetch(client_key, keyword, category, page, size, total)
 
-        tracks_obj = results.get("tracks") or {}
-        total = tracks_obj.get("total") or 0
-        items = tracks_obj.get("items") or []
-
-        musics = []
-        for track in items:
-            music, is_new = save_track_if_not_exists(sp, track)
-            if music:
-                music["is_new"] = is_new
-                musics.append(music)
-
-        # 아티스트명이 검색어와 일치하는 곡을 우선 정렬
-        kw = keyword.lower()
-        def relevance(m):
-            artist = (m.get("artist_name") or "").lower()
-            if artist == kw:
-                return 0  # 정확히 일치
-            elif kw in artist:
-                return 1  # 부분 일치
-            else:
-                return 2  # 불일치
-        musics.sort(key=relevance)
-
-        return musics, total, None
+        # 캐시에 있는 dict는 여러 요청이 공유하므로 복사해서 반환
+        # - is_new는 이번 요청에서 새로 저장한 곡만 True (캐시에서 꺼낸 결과는 모두 False)
+        fresh = bool(loaded)
+        musics = [{**m, "is_new": fresh and bool(m.get("is_new"))} for m in musics]
+        return musics, total, source, None
 
+    except SpotifyRateLimitError:
+        raise
     except Exception as e:
-        return None, 0, str(e)
+        return None, 0, None, str(e)
+
+
+def get_search_cache_stats():
+    return search_cache.stats()
+
+
+def import_search_page(sp, query, offset, limit=SEARCH_PAGE_LIMIT):
+    """
+    검색 결과 한 페이지를 가져와서 저장
+    - 반환: (저장된 musics, Spotify에서 받은 트랙 수)
+    """
+    results = sp.search(
+        q=query,
+        type='track',
+        limit=limit,
+        offset=offset,
+        market='KR'
+    )
+    tracks = (results.get('tracks') or {}).get('items') or []
+
+    saved = []
+    for music, is_new in save_tracks(sp, tracks):
+        music['is_new'] = is_new
+        saved.append(music)
+    return saved, len(tracks)
 
 
 def bulk_import_music(query, total_count=100):
     """대량 음악 데이터 가져오기"""
     sp = get_spotify_client()
     all_tracks = []
-    limit = 50
     offset = 0
 
     try:
-        while len(all_tracks) < total_count:
-            results = sp.search(
-                q=query,
-                type='track',
-                limit=limit,
-                offset=offset,
-                market='KR'
-            )
-            tracks = (results.get('tracks') or {}).get('items') or []
-            if not tracks:
-                break
-
-            for track in tracks:
-                if len(all_tracks) >= total_count:
+        with spotify_priority(BACKGROUND):
+            while len(all_tracks) < total_count:
+                limit = min(SEARCH_PAGE_LIMIT, total_count - len(all_tracks))
+                saved, fetched = import_search_page(sp, query, offset, limit)
+                if not fetched:
                     break
 
-                music, is_new = save_track_if_not_exists(sp, track)
-                if music:
-                    music['is_new'] = is_new
-                    all_tracks.append(music)
-
-            offset += limit
+                all_tracks.extend(saved)
+                offset += fetched
 
         return all_tracks, None
 
@@ -222,29 +450,42 @@ def bulk_import_music(query, total_count=100):
         return None, str(e)
 
 
-def get_global_top_50():
-    """Spotify 글로벌 Top 50 가져와서 저장"""
-    sp = get_spotify_client()
-
+def suggest_music(query, limit=10):
+    """자동완성: 메모리 색인에서 곡명/아티스트명 접두어 검색 → (musics, error)"""
     try:
-        playlist = sp.playlist_tracks(GLOBAL_TOP_50_PLAYLIST_ID, limit=50)
-        items = playlist.get('items') or []
-
-        saved = []
-        for item in items:
-            track = item.get('track')
-            if not track:
-                continue
-            music, is_new = save_track_if_not_exists(sp, track)
-            if music:
-                music['is_new'] = is_new
-                saved.append(music)
-
-        return saved, None
-
+        return catalog_index.suggest(query, limit), None
     except Exception as e:
         return None, str(e)
 
 
-def get_music_list(category=None, value=None):
-    return music_model.find_all(category, value), None
+def get_music_list(category=None, value=None, keyword=None):
+    genre_no = None
+    if category == "genre":
+        genre_no = genre_service.get_genre_no(value)
+        if genre_no is None:
+            return [], None
+    if keyword:
+        # 짧은 검색어("a", "ㄱ")가 카탈로그 대부분을 불러오지 않도록 최대 MUSIC_LIST_SEARCH_LIMIT곡
+        if catalog_index.is_choseong_query(keyword):
+            # 초성 색인에는 장르가 없으므로 장르 검색이면 매칭된 곡 전부를 장르로 거른 뒤 자름
+            limit = MUSIC_LIST_SEARCH_LIMIT if genre_no is None else None
+            musics = music_model.find_by_music_nos(catalog_index.find(keyword, limit), genre_no)
+            musics = musics[:MUSIC_LIST_SEARCH_LIMIT]
+        else:
+            musics, _ = music_model.search_fulltext(
+                keyword, category, 0, MUSIC_LIST_SEARCH_LIMIT, genre_no=genre_no
+            )
+        return musics, None
+    if genre_no is not None:
+        return music_model.find_by_genre_no(genre_no), None
+    return music_model.find_all(), None
+
+
+def stream_music_list(category=None, value=None, chunk_size=500):
+    """get_music_list(검색어 없음)와 같은 목록을 chunk_size개씩 → (RowStream, error)"""
+    genre_no = None
+    if category == "genre":
+        genre_no = genre_service.get_genre_no(value)
+        if genre_no is None:
+            return [], None
+    return music_model.stream_all(genre_no, chunk_size), None
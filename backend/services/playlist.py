@@ -46,20 +46,33 @@ def delete_playlist(playlist_no: int):
         return False, str(e)
 
 
+def _format_dates(p):
+    if p.get('created_at'):
+        p['created_at'] = p['created_at'].isoformat() if hasattr(p['created_at'], 'isoformat') else str(p['created_at'])
+    if p.get('updated_at'):
+        p['updated_at'] = p['updated_at'].isoformat() if hasattr(p['updated_at'], 'isoformat') else str(p['updated_at'])
+    return p
+
+
 def get_playlist_list():
     """전체 플레이리스트 목록 조회"""
     try:
         playlists = playlist_model.list_all_with_user()
         for p in playlists:
-            if p.get('created_at'):
-                p['created_at'] = p['created_at'].isoformat() if hasattr(p['created_at'], 'isoformat') else str(p['created_at'])
-            if p.get('updated_at'):
-                p['updated_at'] = p['updated_at'].isoformat() if hasattr(p['updated_at'], 'isoformat') else str(p['updated_at'])
+            _format_dates(p)
         return playlists, None
     except Exception as e:
         return None, str(e)
 
 
+def stream_playlist_list(chunk_size=500):
+    """전체 플레이리스트 목록을 chunk_size개씩 → (RowStream, error)"""
+    try:
+        return playlist_model.stream_all_with_user(chunk_size).map(_format_dates), None
+    except Exception as e:
+        return None, str(e)
+
+
 def get_user_playlist_list(user_no: int):
     """특정 유저의 플레이리스트 목록 조회"""
     try:
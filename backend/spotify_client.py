@@ -0,0 +1,275 @@
+import contextvars
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from spotipy import Spotify
+from spotipy.cache_handler import CacheHandler
+from spotipy.exceptions import SpotifyException
+from spotipy.oauth2 import SpotifyClientCredentials
+
+from rate_limiter import RateLimitExceeded, SharedTokenBucket
+from spotify_fake import DEFAULT_FIXTURE_DIR, FakeTransport, RecordingTransport
+
+# 호출 우선순위: 사용자 요청(/music/search)이 대량 작업(bulk import, Top 50 갱신)보다 먼저
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+# 다음 페이지 미리 가져오기: background처럼 몫을 남기되 오래 기다리지 않음 (늦게 받으면 쓸모가 없음)
+PREFETCH = "prefetch"
+
+_priority = contextvars.ContextVar("spotify_priority", default=INTERACTIVE)
+
+# 우선순위별 (버킷에 남겨둘 비율, 최대 대기 시간(초))
+# - background는 버킷이 reserve 아래로 내려가면 기다리므로 interactive 몫이 항상 남음
+PRIORITY_POLICY = {
+    INTERACTIVE: (0.0, float(os.getenv("SPOTIFY_INTERACTIVE_MAX_WAIT", 5))),
+    BACKGROUND: (float(os.getenv("SPOTIFY_BACKGROUND_RESERVE", 0.5)),
+                 float(os.getenv("SPOTIFY_BACKGROUND_MAX_WAIT", 300))),
+    PREFETCH: (float(os.getenv("SPOTIFY_BACKGROUND_RESERVE", 0.5)),
+               float(os.getenv("SPOTIFY_PREFETCH_MAX_WAIT", 2))),
+}
+
+# 429 응답 시 재시도 횟수
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+class SpotifyRateLimitError(RateLimitExceeded):
+    """Spotify 호출 한도 초과 (Retry-After 이후 다시 시도)"""
+
+    def __init__(self, retry_after):
+        super().__init__(retry_after, "Spotify 요청이 많아 잠시 후 다시 시도해주세요.")
+
+
+@contextmanager
+def spotify_priority(priority):
+    """with 블록 안의 Spotify 호출 우선순위 지정"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def _retry_after_seconds(exc):
+    """
+    실제 Spotify 429 응답의 Retry-After(초), 없으면 None
+    - urllib3의 5xx 재시도가 모두 실패해도 spotipy는 헤더 없는 429(RetryError)를 던짐 → 한도 초과가 아님
+    """
+    headers = getattr(exc, "headers", None) or {}
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(1.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitedSpotify(Spotify):
+    """모든 API 호출 앞에서 공유 토큰 버킷을 거치고, Retry-After가 있는 429는 그만큼 전체 워커가 대기"""
+
+    def __init__(self, *args, bucket=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bucket = bucket
+
+    def _internal_call(self, method, url, payload, params):
+        reserve, max_wait = PRIORITY_POLICY[_priority.get()]
+
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            try:
+                self.bucket.acquire(reserve, max_wait)
+            except RateLimitExceeded as e:
+                raise SpotifyRateLimitError(e.retry_after)
+
+            try:
+                return super()._internal_call(method, url, payload, params)
+            except SpotifyException as e:
+                retry_after = _retry_after_seconds(e) if e.http_status == 429 else None
+                if retry_after is None:
+                    raise
+                self.bucket.block_for(retry_after)
+                print(f"⚠️ Spotify 429 - {retry_after:.0f}초 대기 ({attempt + 1}/{MAX_RATE_LIMIT_RETRIES + 1})")
+                if attempt == MAX_RATE_LIMIT_RETRIES or retry_after > max_wait:
+                    raise SpotifyRateLimitError(retry_after)
+
+
+class FakeSpotify(RateLimitedSpotify, FakeTransport):
+    """fixture 재생/합성 응답을 쓰는 오프라인 클라이언트 (SPOTIFY_BACKEND=fake)"""
+
+
+class RecordingSpotify(RateLimitedSpotify, RecordingTransport):
+    """실제 응답을 fixture로 저장하는 클라이언트 (SPOTIFY_BACKEND=record)"""
+
+
+class SharedTokenCacheHandler(CacheHandler):
+    """
+    같은 호스트의 모든 워커 프로세스가 함께 읽는 파일 기반 토큰 캐시
+    - 한 워커가 갱신한 토큰을 다른 워커가 그대로 사용
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def get_cached_token(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_token_to_cache(self, token_info):
+        # 임시 파일에 쓰고 교체해서 다른 워커가 쓰다 만 파일을 읽지 않도록 함
+        directory = os.path.dirname(self.path) or "."
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".spotify-token-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(token_info, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Spotify 토큰 캐시 저장 실패: {e}")
+
+
+class SpotifyManager:
+    """싱글톤 패턴의 Spotify 클라이언트 관리자 (HTTP 세션/토큰 공유)"""
+    _client = None
+    _auth_manager = None
+    _cache_handler = None
+    _lock = threading.Lock()
+
+    # 만료 몇 초 전에 토큰을 미리 갱신할지
+    REFRESH_MARGIN = int(os.getenv("SPOTIFY_TOKEN_REFRESH_MARGIN", 300))
+
+    @classmethod
+    def _build_session(cls):
+        """커넥션을 재사용하는 HTTP 세션 (spotipy 기본 재시도 정책, 429 제외)"""
+        session = requests.Session()
+        retry = Retry(
+            total=3,
+            connect=None,
+            read=False,
+            allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"]),
+            status=3,
+            backoff_factor=0.3,
+            # 429는 RateLimitedSpotify가 Retry-After를 보고 직접 처리
+            status_forcelist=(500, 502, 503, 504)
+        )
+        pool_size = int(os.getenv("SPOTIFY_HTTP_POOL_SIZE", 20))
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @classmethod
+    def _build_bucket(cls):
+        """배포 전체가 하나의 예산을 쓰도록 워커 간 공유되는 토큰 버킷"""
+        return SharedTokenBucket(
+            rate=float(os.getenv("SPOTIFY_RATE_LIMIT", 10)),
+            capacity=float(os.getenv("SPOTIFY_RATE_BURST", 20)),
+            path=os.getenv(
+                "SPOTIFY_RATE_STATE_PATH",
+                os.path.join(tempfile.gettempdir(), "listify-spotify-ratelimit.json")
+            )
+        )
+
+    @classmethod
+    def _build_fake_client(cls):
+        return FakeSpotify(
+            bucket=cls._build_bucket(),
+            fixture_dir=os.getenv("SPOTIFY_FIXTURE_DIR", DEFAULT_FIXTURE_DIR),
+            latency_ms=float(os.getenv("SPOTIFY_FAKE_LATENCY_MS", 0)),
+            error_rate=float(os.getenv("SPOTIFY_FAKE_ERROR_RATE", 0)),
+            rate_limit_rate=float(os.getenv("SPOTIFY_FAKE_429_RATE", 0)),
+            strict=os.getenv("SPOTIFY_FAKE_STRICT", "false").lower() == "true",
+            seed=os.getenv("SPOTIFY_FAKE_SEED")
+        )
+
+    @classmethod
+    def _build_live_client(cls, record=False):
+        client_id = os.getenv("SPOTIFY_CLIENT_ID")
+        client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
+        if not client_id or not client_secret:
+            raise RuntimeError("Spotify 환경변수(SPOTIFY_CLIENT_ID/SECRET)가 설정되지 않았습니다.")
+
+        session = cls._build_session()
+        cls._cache_handler = SharedTokenCacheHandler(os.getenv(
+            "SPOTIFY_TOKEN_CACHE_PATH",
+            os.path.join(tempfile.gettempdir(), "listify-spotify-token.json")
+        ))
+        cls._auth_manager = SpotifyClientCredentials(
+            client_id=client_id,
+            client_secret=client_secret,
+            requests_session=session,
+            cache_handler=cls._cache_handler
+        )
+        kwargs = dict(
+            auth_manager=cls._auth_manager,
+            requests_session=session,
+            requests_timeout=int(os.getenv("SPOTIFY_REQUEST_TIMEOUT", 10)),
+            bucket=cls._build_bucket()
+        )
+        if record:
+            client = RecordingSpotify(
+                fixture_dir=os.getenv("SPOTIFY_FIXTURE_DIR", DEFAULT_FIXTURE_DIR), **kwargs
+            )
+        else:
+            client = RateLimitedSpotify(**kwargs)
+
+        threading.Thread(
+            target=cls._refresh_loop, name="spotify-token-refresher", daemon=True
+        ).start()
+        return client
+
+    @classmethod
+    def get_client(cls):
+        """
+        SPOTIFY_BACKEND에 따라 클라이언트 생성
+        - live(기본): 실제 Spotify API
+        - record: 실제 API를 호출하면서 응답을 SPOTIFY_FIXTURE_DIR에 저장
+        - fake: 저장된 fixture 재생 (없으면 합성 응답), 인증 정보 불필요
+        """
+        if cls._client is None:
+            with cls._lock:
+                if cls._client is None:
+                    backend = os.getenv("SPOTIFY_BACKEND", "live").lower()
+                    if backend == "fake":
+                        cls._client = cls._build_fake_client()
+                    else:
+                        cls._client = cls._build_live_client(record=(backend == "record"))
+                    print(f"✅ Spotify 클라이언트 생성 완료 ({backend})")
+        return cls._client
+
+    @classmethod
+    def _refresh_loop(cls):
+        """토큰 만료 전에 미리 갱신 → 요청 처리 중에는 토큰 발급을 기다리지 않음"""
+        while True:
+            try:
+                token = cls._cache_handler.get_cached_token()
+                # 워커들이 동시에 갱신하지 않도록 여유 시간에 약간의 편차를 줌
+                margin = cls.REFRESH_MARGIN + random.uniform(0, 30)
+                if not token or token.get("expires_at", 0) - time.time() < margin:
+                    cls._auth_manager.get_access_token(as_dict=False, check_cache=False)
+                    token = cls._cache_handler.get_cached_token()
+
+                wait = (token or {}).get("expires_at", 0) - time.time() - margin
+                time.sleep(min(max(wait, 5), 60))
+            except Exception as e:
+                print(f"⚠️ Spotify 토큰 갱신 실패: {e}")
+                time.sleep(10)
+
+
+def get_spotify_client():
+    """외부에서 사용할 통합 Spotify 클라이언트"""
+    return SpotifyManager.get_client()
+
+
+def is_configured():
+    if os.getenv("SPOTIFY_BACKEND", "live").lower() == "fake":
+        return True
+    return bool(os.getenv("SPOTIFY_CLIENT_ID") and os.getenv("SPOTIFY_CLIENT_SECRET"))
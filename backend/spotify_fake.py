@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import parse_qsl
+
+from spotipy import Spotify
+from spotipy.exceptions import SpotifyException
+
+# 녹화/재생 fixture 기본 위치
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "spotify")
+
+_API_PREFIX = "https://api.spotify.com/v1/"
+
+# 합성 데이터용 장르 (GENRE_MAP에 매칭되는 것과 안 되는 것 섞음)
+_FAKE_GENRES = [
+    "k-pop", "k-pop girl group", "korean r&b", "dance pop", "pop", "hip hop",
+    "pop rap", "r&b", "jazz", "edm", "indie rock", "metal", "trot", "city pop",
+]
+_FAKE_ARTIST_COUNT = 300
+
+
+def _split_url(url, params):
+    """spotipy 호출 URL → (경로, 파라미터 dict) (None 값 제외, 정렬)"""
+    if url.startswith(_API_PREFIX):
+        url = url[len(_API_PREFIX):]
+    path, _, query = url.partition("?")
+    merged = dict(parse_qsl(query))
+    merged.update({k: v for k, v in (params or {}).items() if v is not None})
+    return path, {k: str(v) for k, v in sorted(merged.items())}
+
+
+def fixture_path(fixture_dir, method, url, params):
+    """요청 하나에 대응하는 fixture 파일 경로 (녹화/재생이 같은 규칙 사용)"""
+    path, query = _split_url(url, params)
+    digest = hashlib.sha1(json.dumps([method, path, query]).encode("utf-8")).hexdigest()[:20]
+    folder = path.strip("/").split("/")[0] or "root"
+    return os.path.join(fixture_dir, folder, f"{method.lower()}-{digest}.json")
+
+
+def _fake_id(*parts):
+    """결정적인 22자 Spotify 스타일 id"""
+    return hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).hexdigest()[:22]
+
+
+def _fake_artist(artist_id):
+    rng = random.Random(artist_id)
+    return {
+        "id": artist_id,
+        "name": f"Fake Artist {artist_id[:6]}",
+        "genres": rng.sample(_FAKE_GENRES, rng.randint(0, 3)),
+        "popularity": rng.randint(10, 100),
+    }
+
+
+def _fake_track(track_id):
+    rng = random.Random(track_id)
+    artist_id = _fake_id("artist", rng.randrange(_FAKE_ARTIST_COUNT))
+    return {
+        "id": track_id,
+        "name": f"Fake Track {track_id[:8]}",
+        "artists": [{"id": artist_id, "name": f"Fake Artist {artist_id[:6]}"}],
+        "album": {
+            "name": f"Fake Album {track_id[:4]}",
+            "images": [{"url": f"https://i.scdn.co/image/{track_id}"}],
+            "release_date": f"{rng.randint(1990, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "release_date_precision": "day",
+        },
+        "duration_ms": rng.randint(120000, 300000),
+        "popularity": rng.randint(0, 100),
+        "preview_url": None,
+        "external_urls": {"spotify": f"https://open.spotify.com/track/{track_id}"},
+    }
+
+
+def _fake_audio_features(track_id):
+    rng = random.Random(f"features|{track_id}")
+    return {
+        "id": track_id,
+        "energy": rng.random(),
+        "danceability": rng.random(),
+        "valence": rng.random(),
+        "acousticness": rng.random(),
+        "instrumentalness": rng.random() * 0.3,
+    }
+
+
+def synthesize_response(method, url, params):
+    """fixture가 없을 때 쓸 결정적인 합성 응답"""
+    path, query = _split_url(url, params)
+    parts = path.strip("/").split("/")
+    ids = [i for i in query.get("ids", "").split(",") if i]
+
+    if parts[0] == "search":
+        limit, offset = int(query.get("limit", 10)), int(query.get("offset", 0))
+        q = query.get("q", "")
+        total = 1000
+        items = [_fake_track(_fake_id("search", q, n)) for n in range(offset, min(offset + limit, total))]
+        return {"tracks": {"total": total, "items": items}}
+    if parts[0] == "artists":
+        if ids:
+            return {"artists": [_fake_artist(i) for i in ids]}
+        return _fake_artist(parts[1])
+    if parts[0] == "audio-features":
+        return {"audio_features": [_fake_audio_features(i) for i in ids]}
+    if parts[0] == "tracks":
+        if ids:
+            return {"tracks": [_fake_track(i) for i in ids]}
+        return _fake_track(parts[1])
+    if parts[0] == "playlists" and len(parts) == 3 and parts[2] == "tracks":
+        limit, offset = int(query.get("limit", 100)), int(query.get("offset", 0))
+        total = 50
+        items = [{"track": _fake_track(_fake_id("playlist", parts[1], n))}
+                 for n in range(offset, min(offset + limit, total))]
+        return {"items": items, "total": total, "next": None if offset + limit >= total else "next"}
+    if parts[0] == "playlists":
+        # 하루 단위로 snapshot_id가 바뀌는 것처럼 동작
+        return {"id": parts[1], "snapshot_id": _fake_id("snapshot", parts[1], time.strftime("%Y%m%d"))}
+
+    raise SpotifyException(404, -1, f"{path}: fake backend에 없는 요청입니다.")
+
+
+class FakeTransport(Spotify):
+    """
+    HTTP 대신 fixture 파일을 재생하는 Spotify 전송 계층
+    - fixture가 없으면 결정적인 합성 응답 반환 (strict=True면 404)
+    - latency_ms: 평균 응답 지연, error_rate: 500 비율, rate_limit_rate: 429 비율
+    """
+
+    def __init__(self, *args, fixture_dir=DEFAULT_FIXTURE_DIR, latency_ms=0.0, error_rate=0.0,
+                 rate_limit_rate=0.0, strict=False, seed=None, **kwargs):
+        kwargs.setdefault("requests_session", False)
+        super().__init__(*args, **kwargs)
+        self.fixture_dir = fixture_dir
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.strict = strict
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def _roll(self):
+        with self._rng_lock:
+            return self._rng.random(), self._rng.uniform(0.5, 1.5)
+
+    def _internal_call(self, method, url, payload, params):
+        roll, jitter = self._roll()
+        if self.latency_ms:
+            time.sleep(self.latency_ms * jitter / 1000)
+
+        if roll < self.rate_limit_rate:
+            raise SpotifyException(429, -1, f"{url}: fake rate limit", headers={"Retry-After": "1"})
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise SpotifyException(500, -1, f"{url}: fake server error")
+
+        path = fixture_path(self.fixture_dir, method, url, params)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            if self.strict:
+                raise SpotifyException(404, -1, f"{url}: fixture 없음 ({path})")
+        return synthesize_response(method, url, params)
+
+
+class RecordingTransport(Spotify):
+    """실제 Spotify 응답을 fixture 파일로 저장하는 전송 계층"""
+
+    def __init__(self, *args, fixture_dir=DEFAULT_FIXTURE_DIR, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fixture_dir = fixture_dir
+
+    def _internal_call(self, method, url, payload, params):
+        # spotipy가 params를 변경하기 전에 키를 계산
+        path = fixture_path(self.fixture_dir, method, url, dict(params or {}))
+        result = super()._internal_call(method, url, payload, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False)
+        return result
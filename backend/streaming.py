@@ -0,0 +1,59 @@
+# streaming.py - 큰 목록을 한 번에 만들지 않고 chunk 단위로 응답 (NDJSON 또는 JSON 배열)
+import os
+
+from flask import Response, current_app
+
+# ?stream= 으로 받을 수 있는 형식
+STREAM_FORMATS = ("ndjson", "json")
+
+# 서버 측 커서에서 한 번에 읽어 응답으로 내보낼 행 수
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", 500))
+
+_MIMETYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+
+class _ChunkedBody:
+    """
+    행 목록 chunk → 응답 본문 조각
+    - generator가 아니라 close()를 가진 객체라서, 본문을 읽기 전에 응답이 닫혀도 원본 스트림(DB 연결)이 닫힘
+    """
+
+    def __init__(self, chunks, fmt, dumps):
+        self._chunks = chunks
+        self._fmt = fmt
+        self._dumps = dumps
+
+    def __iter__(self):
+        dumps = self._dumps
+        try:
+            if self._fmt == "ndjson":
+                for rows in self._chunks:
+                    yield "".join(dumps(row) + "\n" for row in rows)
+                return
+
+            yield '{"success": true, "data": ['
+            separator = ""
+            for rows in self._chunks:
+                if rows:
+                    yield separator + ",".join(dumps(row) for row in rows)
+                    separator = ","
+            yield "]}"
+        finally:
+            self.close()
+
+    def close(self):
+        close = getattr(self._chunks, "close", None)
+        if close:
+            close()
+
+
+def stream_response(chunks, fmt):
+    """
+    chunks(행 목록의 이터레이터, 예: db.RowStream) → 스트리밍 Response
+    - ndjson: 한 줄에 한 행 / json: 일반 응답과 같은 {"success": true, "data": [...]}
+    - 전송 중 DB 오류가 나면 응답이 중간에 끊김 (json은 닫히지 않은 배열로 남음)
+    """
+    return Response(_ChunkedBody(chunks, fmt, current_app.json.dumps), mimetype=_MIMETYPES[fmt])
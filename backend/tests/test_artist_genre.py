@@ -0,0 +1,87 @@
+# services/artist_genre 테스트: LRU → artist_genre 테이블 → Spotify(50명 단위) 순서로 장르 조회
+import unittest
+from unittest import mock
+
+from services import artist_genre as artist_genre_service
+
+
+class FakeSpotify:
+    def __init__(self, genres):
+        self.genres = genres        # artist_id -> [genres] (없는 id는 응답에서 빠짐)
+        self.calls = []
+
+    def artists(self, ids):
+        self.calls.append(list(ids))
+        return {"artists": [{"id": a, "genres": self.genres[a]} if a in self.genres else None for a in ids]}
+
+
+class ResolveGenreNosTest(unittest.TestCase):
+
+    def setUp(self):
+        artist_genre_service._cache.clear()
+        self.addCleanup(artist_genre_service._cache.clear)
+        self.stored = {}        # DB에 저장된 원본 장르: artist_id -> "genre,genre"
+        self.upserted = []
+        patches = [
+            mock.patch.object(artist_genre_service.artist_genre_model, "find_by_artist_ids",
+                              side_effect=self.find_by_artist_ids),
+            mock.patch.object(artist_genre_service.artist_genre_model, "upsert_many",
+                              side_effect=self.upserted.extend),
+            mock.patch.object(artist_genre_service.genre_service, "get_genre_no",
+                              side_effect={"K-Pop": 1, "Rock": 2}.get),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def find_by_artist_ids(self, artist_ids, max_age_days):
+        return [{"spotify_artist_id": a, "genres": self.stored[a]} for a in artist_ids if a in self.stored]
+
+    def test_spotify_lookup_is_cached_in_memory_and_db(self):
+        sp = FakeSpotify({"a1": ["k-pop"], "a2": ["modern rock", "rock"], "a3": ["polka"]})
+        result = artist_genre_service.resolve_genre_nos(sp, ["a1", "a2", "a3", "a1", None])
+        self.assertEqual(result, {"a1": 1, "a2": 2, "a3": None})
+        self.assertEqual(sp.calls, [["a1", "a2", "a3"]])
+        # DB에는 원본 장르만 저장 (genre_no는 읽을 때 다시 매칭)
+        self.assertEqual(self.upserted, [
+            {"spotify_artist_id": "a1", "genres": "k-pop"},
+            {"spotify_artist_id": "a2", "genres": "modern rock,rock"},
+            {"spotify_artist_id": "a3", "genres": "polka"},
+        ])
+
+        # 두 번째 조회는 Spotify/DB 없이 메모리에서 (매핑 없는 아티스트도 다시 조회하지 않음)
+        self.assertEqual(artist_genre_service.resolve_genre_nos(sp, ["a3", "a1"]), {"a3": None, "a1": 1})
+        self.assertEqual(len(sp.calls), 1)
+
+    def test_db_rows_skip_spotify(self):
+        # 저장된 원본 장르를 다시 매칭 (매칭 규칙이 바뀌어도 Spotify를 다시 조회하지 않음)
+        self.stored = {"a1": "modern rock,alternative", "a2": ""}
+        sp = FakeSpotify({"a3": ["k-pop"]})
+        result = artist_genre_service.resolve_genre_nos(sp, ["a1", "a2", "a3"])
+        self.assertEqual(result, {"a1": 2, "a2": None, "a3": 1})
+        self.assertEqual(sp.calls, [["a3"]])
+
+    def test_chunks_of_50(self):
+        ids = [f"a{i}" for i in range(120)]
+        sp = FakeSpotify({a: [] for a in ids})
+        artist_genre_service.resolve_genre_nos(sp, ids)
+        self.assertEqual([len(c) for c in sp.calls], [50, 50, 20])
+
+    def test_failed_lookup_not_cached(self):
+        sp = FakeSpotify({})
+        sp.artists = mock.Mock(side_effect=RuntimeError("spotify down"))
+        with mock.patch("builtins.print"):
+            self.assertEqual(artist_genre_service.resolve_genre_nos(sp, ["a1"]), {})
+        self.assertEqual(self.upserted, [])
+        self.assertEqual(len(artist_genre_service._cache), 0)
+
+    def test_db_error_falls_back_to_spotify(self):
+        sp = FakeSpotify({"a1": ["k-pop"]})
+        with mock.patch.object(artist_genre_service.artist_genre_model, "find_by_artist_ids",
+                               side_effect=RuntimeError("db down")), \
+                mock.patch("builtins.print"):
+            self.assertEqual(artist_genre_service.resolve_genre_nos(sp, ["a1"]), {"a1": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
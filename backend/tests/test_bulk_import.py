@@ -0,0 +1,178 @@
+# services/bulk_import 테스트: 실행권(claim_token) 획득, heartbeat, 다른 워커가 가져간 작업 중단
+import unittest
+from unittest import mock
+
+from model import bulk_import_job as job_model
+from services import bulk_import
+
+
+class FakeCursor:
+    def __init__(self, rowcount):
+        self.rowcount = rowcount
+        self.executed = []
+
+    def execute(self, sql, args=None):
+        self.executed.append((" ".join(sql.split()), args))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, rowcount):
+        self.cursor_obj = FakeCursor(rowcount)
+
+    def cursor(self):
+        return self.cursor_obj
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class JobModelTest(unittest.TestCase):
+
+    def run_model(self, fn, *args, rowcount=1):
+        conn = FakeConnection(rowcount)
+        with mock.patch.object(job_model, "get_connection", return_value=conn):
+            result = fn(*args)
+        return result, conn.cursor_obj.executed[-1]
+
+    def test_claim_only_queued_or_stale_job(self):
+        claimed, (sql, args) = self.run_model(job_model.claim_job, "job", 120, "token")
+        self.assertTrue(claimed)
+        self.assertIn("status = 'queued'", sql)
+        self.assertIn("heartbeat_at < NOW() - INTERVAL %s SECOND", sql)
+        self.assertIn("claim_token = %s", sql)
+        self.assertEqual(args, ("token", "job", 120))
+
+    def test_claim_fails_when_other_worker_owns_job(self):
+        claimed, _ = self.run_model(job_model.claim_job, "job", 120, "token", rowcount=0)
+        self.assertFalse(claimed)
+
+    def test_heartbeat_and_record_page_check_token(self):
+        alive, (sql, args) = self.run_model(job_model.heartbeat, "job", "token", rowcount=0)
+        self.assertFalse(alive)
+        self.assertIn("claim_token = %s", sql)
+        self.assertEqual(args, ("job", "token"))
+
+        recorded, (sql, args) = self.run_model(job_model.record_page, "job", "token", 50, 50, 48, 10, rowcount=0)
+        self.assertFalse(recorded)
+        self.assertIn("WHERE job_id = %s AND claim_token = %s AND status = 'running'", sql)
+        self.assertEqual(args[-2:], ("job", "token"))
+
+    def test_finish_clears_token(self):
+        finished, (sql, args) = self.run_model(job_model.finish_job, "job", "token", "done")
+        self.assertTrue(finished)
+        self.assertIn("claim_token = NULL", sql)
+
+
+class StopAfter:
+    """stop.wait()가 n번은 계속 진행, 그다음부터 종료"""
+
+    def __init__(self, n):
+        self.n = n
+
+    def wait(self, timeout):
+        self.n -= 1
+        return self.n < 0
+
+
+class KeepAliveTest(unittest.TestCase):
+
+    def test_heartbeat_until_stopped(self):
+        with mock.patch.object(job_model, "heartbeat", return_value=True) as heartbeat:
+            bulk_import._keep_alive("job", "token", StopAfter(3))
+        self.assertEqual(heartbeat.call_count, 3)
+        heartbeat.assert_called_with("job", "token")
+
+    def test_stops_when_job_lost(self):
+        with mock.patch.object(job_model, "heartbeat", return_value=False) as heartbeat:
+            bulk_import._keep_alive("job", "token", StopAfter(3))
+        self.assertEqual(heartbeat.call_count, 1)
+
+    def test_heartbeat_error_does_not_stop(self):
+        with mock.patch.object(job_model, "heartbeat", side_effect=[RuntimeError("db"), True]) as heartbeat, \
+                mock.patch("builtins.print"):
+            bulk_import._keep_alive("job", "token", StopAfter(2))
+        self.assertEqual(heartbeat.call_count, 2)
+
+
+class RunJobTest(unittest.TestCase):
+
+    def setUp(self):
+        self.job = {"job_id": "job", "query": "iu", "target_count": 100, "next_offset": 0, "saved_count": 0}
+        self.model = mock.patch.multiple(
+            job_model,
+            claim_job=mock.DEFAULT, heartbeat=mock.DEFAULT, record_page=mock.DEFAULT,
+            finish_job=mock.DEFAULT, find_by_job_id=mock.DEFAULT
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+        self.model["claim_job"].return_value = True
+        self.model["record_page"].return_value = True
+        self.model["find_by_job_id"].return_value = self.job
+        mock.patch.object(bulk_import.music_service, "get_spotify_client").start()
+        mock.patch.object(bulk_import, "_keep_alive").start()
+        mock.patch("builtins.print").start()
+
+        def import_page(sp, query, offset, limit):
+            return [{"is_new": True}] * limit, limit
+
+        self.import_page = mock.patch.object(
+            bulk_import.music_service, "import_search_page", side_effect=import_page
+        ).start()
+
+    def claim_token(self):
+        return self.model["claim_job"].call_args[0][2]
+
+    def test_runs_pages_with_claim_token(self):
+        bulk_import._run_job("job")
+        token = self.claim_token()
+        self.assertEqual(len(token), 32)
+        self.assertEqual(self.import_page.call_count, 2)
+        self.model["record_page"].assert_called_with("job", token, 100, 50, 50, 50)
+        self.model["finish_job"].assert_called_once_with("job", token, "done")
+
+    def test_resumes_from_recorded_offset(self):
+        self.job.update(next_offset=60, saved_count=60, target_count=80)
+        bulk_import._run_job("job")
+        self.assertEqual([c.args[2:] for c in self.import_page.call_args_list], [(60, 20)])
+
+    def test_stops_at_spotify_offset_limit(self):
+        self.job.update(next_offset=980, saved_count=0, target_count=1000)
+        bulk_import._run_job("job")
+        self.assertEqual([c.args[2:] for c in self.import_page.call_args_list], [(980, 20)])
+        self.model["finish_job"].assert_called_once_with("job", self.claim_token(), "done")
+
+    def test_not_claimed_does_nothing(self):
+        self.model["claim_job"].return_value = False
+        bulk_import._run_job("job")
+        self.import_page.assert_not_called()
+        self.model["finish_job"].assert_not_called()
+
+    def test_stops_when_other_worker_took_job(self):
+        self.model["record_page"].return_value = False
+        bulk_import._run_job("job")
+        self.assertEqual(self.import_page.call_count, 1)
+        self.model["finish_job"].assert_not_called()
+
+    def test_error_marks_job_failed(self):
+        self.import_page.side_effect = RuntimeError("spotify down")
+        bulk_import._run_job("job")
+        self.model["finish_job"].assert_called_once_with("job", self.claim_token(), "failed", "spotify down")
+        self.assertNotIn("job", bulk_import._active)
+
+    def test_each_run_uses_new_token(self):
+        bulk_import._run_job("job")
+        first = self.claim_token()
+        bulk_import._run_job("job")
+        self.assertNotEqual(first, self.claim_token())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+# cache.StaleWhileRevalidateCache + /music/search 결과 캐시(복사본 반환, PREFETCH 우선순위 갱신) 테스트
+import contextlib
+import threading
+import time
+import unittest
+from unittest import mock
+
+import cache
+from cache import StaleWhileRevalidateCache
+from services import music as music_service
+from spotify_client import PREFETCH, _priority
+
+
+class StaleWhileRevalidateCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 100.0
+        patch = mock.patch.object(cache.time, "monotonic", side_effect=lambda: self.now)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def wait_refresh(self, swr):
+        deadline = time.perf_counter() + 2
+        while swr._refreshing and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+    def test_hit_and_miss(self):
+        swr = StaleWhileRevalidateCache(ttl=10, stale_ttl=60)
+        calls = []
+        loader = lambda: calls.append(1) or len(calls)
+        self.assertEqual(swr.get_or_load("k", loader), 1)
+        self.assertEqual(swr.get_or_load("k", loader), 1)
+        self.assertEqual(swr.stats()["hits"], 1)
+        self.assertEqual(swr.stats()["misses"], 1)
+
+        # stale_ttl이 지나면 다시 loader 호출
+        self.now += 61
+        self.assertEqual(swr.get_or_load("k", loader), 2)
+        self.assertEqual(swr.stats()["misses"], 2)
+
+    def test_stale_value_returned_and_refreshed_once(self):
+        swr = StaleWhileRevalidateCache(ttl=10, stale_ttl=60)
+        swr.set("k", "old")
+        self.now += 20
+
+        release = threading.Event()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            release.wait(2)
+            return "new"
+
+        self.assertEqual(swr.get_or_load("k", loader), "old")
+        self.assertEqual(swr.get_or_load("k", loader), "old")
+        release.set()
+        self.wait_refresh(swr)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(swr.peek("k"), "new")
+        self.assertEqual(swr.stats()["stale_hits"], 2)
+        self.assertEqual(swr.stats()["refreshes"], 1)
+
+    def test_refresh_runs_inside_refresh_context(self):
+        seen = []
+
+        @contextlib.contextmanager
+        def refresh_context():
+            seen.append("enter")
+            yield
+            seen.append("exit")
+
+        swr = StaleWhileRevalidateCache(ttl=10, stale_ttl=60, refresh_context=refresh_context)
+        swr.set("k", "old")
+        self.now += 20
+        swr.get_or_load("k", lambda: seen.append("load") or "new")
+        self.wait_refresh(swr)
+        self.assertEqual(seen, ["enter", "load", "exit"])
+
+    def test_refresh_error_keeps_stale_value(self):
+        swr = StaleWhileRevalidateCache(ttl=10, stale_ttl=60)
+        swr.set("k", "old")
+        self.now += 20
+
+        def loader():
+            raise RuntimeError("spotify down")
+
+        with mock.patch("builtins.print"):
+            self.assertEqual(swr.get_or_load("k", loader), "old")
+            self.wait_refresh(swr)
+            # 갱신에 실패해도 stale 값은 그대로 남고, 다음 조회 때 다시 갱신을 시도
+            self.assertEqual(swr.get_or_load("k", loader), "old")
+            self.wait_refresh(swr)
+        self.assertEqual(swr.stats()["refresh_errors"], 2)
+
+    def test_miss_error_not_cached(self):
+        swr = StaleWhileRevalidateCache(ttl=10)
+        with self.assertRaises(RuntimeError):
+            swr.get_or_load("k", mock.Mock(side_effect=RuntimeError("spotify down")))
+        self.assertEqual(swr.get_or_load("k", lambda: "ok"), "ok")
+
+    def test_lru_eviction(self):
+        swr = StaleWhileRevalidateCache(maxsize=2, ttl=10)
+        swr.set("a", 1)
+        swr.set("b", 2)
+        swr.get_or_load("a", lambda: 0)
+        swr.set("c", 3)
+        self.assertIsNone(swr.peek("b"))
+        self.assertEqual(swr.peek("a"), 1)
+
+
+class SearchCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        music_service.search_cache.clear()
+        self.addCleanup(music_service.search_cache.clear)
+
+    def test_same_search_served_from_cache(self):
+        result = ([{"music_no": 1, "is_new": True}], 1, "remote")
+        with mock.patch.object(music_service, "_search", return_value=result) as search:
+            music_service.search_and_save_music("IU", None, 1, 12)
+            musics, total, source, error = music_service.search_and_save_music("  iu ", None, "1", "12")
+            music_service.search_and_save_music("iu", None, 2, 12)
+        self.assertIsNone(error)
+        self.assertEqual((total, source), (1, "remote"))
+        self.assertEqual(search.call_count, 2)
+
+    def test_refresh_uses_prefetch_priority(self):
+        with music_service.search_cache.refresh_context():
+            self.assertEqual(_priority.get(), PREFETCH)
+
+    def test_cached_results_are_copies(self):
+        result = ([{"music_no": 1, "is_new": True}], 1, "remote")
+        with mock.patch.object(music_service, "_search", return_value=result):
+            first, _, _, error = music_service.search_and_save_music("iu", None, 1, 12)
+            self.assertIsNone(error)
+            self.assertTrue(first[0]["is_new"])
+
+            first[0]["track_name"] = "changed"
+            second, _, _, _ = music_service.search_and_save_music("iu", None, 1, 12)
+
+        # 캐시에서 꺼낸 결과: 이전 호출의 수정이 보이지 않고 is_new는 False
+        self.assertNotIn("track_name", second[0])
+        self.assertFalse(second[0]["is_new"])
+        self.assertTrue(result[0][0]["is_new"])
+
+
+if __name__ == "__main__":
+    unittest.main()
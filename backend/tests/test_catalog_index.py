@@ -0,0 +1,122 @@
+# services/catalog_index 테스트: 자모/초성 키, 접두어 검색, 재구성 중 추가된 곡 반영
+import unittest
+from unittest import mock
+
+from services import catalog_index
+
+
+def row(music_no, track_name, artist_name, popularity):
+    return {"music_no": music_no, "track_name": track_name, "artist_name": artist_name,
+            "album_name": None, "album_image_url": None, "popularity": popularity}
+
+
+ROWS = [
+    row(1, "밤편지", "아이유", 80),
+    row(2, "좋은 날", "아이유", 90),
+    row(3, "Love Dive", "IVE", 70),
+    row(4, "LOVE wins all", "IU", 95),
+]
+
+
+class JamoTest(unittest.TestCase):
+
+    def test_to_jamo(self):
+        self.assertEqual(catalog_index.to_jamo("밤편지"), "ㅂㅏㅁㅍㅕㄴㅈㅣ")
+        # 겹모음/겹받침은 입력 순서대로 나눔 (직접 입력한 겹자모도 같은 규칙)
+        self.assertEqual(catalog_index.to_jamo("광"), "ㄱㅗㅏㅇ")
+        self.assertEqual(catalog_index.to_jamo("닭"), "ㄷㅏㄹㄱ")
+        self.assertEqual(catalog_index.to_jamo("ㄷㅏㄺ"), "ㄷㅏㄹㄱ")
+        self.assertEqual(catalog_index.to_jamo("iu"), "iu")
+
+    def test_to_choseong(self):
+        self.assertEqual(catalog_index.to_choseong("좋은 날"), "ㅈㅇㄴ")
+        self.assertEqual(catalog_index.to_choseong("아이유 IU"), "ㅇㅇㅇIU")
+
+    def test_is_choseong_query(self):
+        self.assertTrue(catalog_index.is_choseong_query("ㅂㅍ ㅈ"))
+        self.assertFalse(catalog_index.is_choseong_query("ㅂㅍ지"))
+        self.assertFalse(catalog_index.is_choseong_query("ㅏ"))
+        self.assertFalse(catalog_index.is_choseong_query(" "))
+
+    def test_normalize(self):
+        self.assertEqual(catalog_index.normalize("IU - Love wins!"), "iu love wins")
+        self.assertEqual(catalog_index.normalize("ＬＯＶＥ_dive"), "love dive")
+
+    def test_index_keys(self):
+        keys = catalog_index._name_keys(row(9, "좋은 날", "IU", 0))
+        self.assertIn(catalog_index.to_jamo("좋은 날"), keys)
+        self.assertIn(catalog_index.to_jamo("날"), keys)
+        self.assertIn("iu", keys)
+        # 한글이 없는 이름은 초성 키를 만들지 않음
+        self.assertEqual(catalog_index._choseong_keys(row(9, "좋은 날", "IU", 0)), {"ㅈㅇㄴ", "ㄴ"})
+
+
+class CatalogIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        state = {name: getattr(catalog_index, name) for name in ("_docs", "_names", "_choseong", "_loaded")}
+        self.addCleanup(lambda: [setattr(catalog_index, k, v) for k, v in state.items()])
+
+    def load(self, rows, during_load=None):
+        def find_index_rows():
+            if during_load:
+                during_load()
+            return [dict(r) for r in rows]
+
+        with mock.patch.object(catalog_index.music_model, "find_index_rows", side_effect=find_index_rows), \
+                mock.patch("builtins.print"):
+            catalog_index.load()
+
+
+class FindTest(CatalogIndexTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.load(ROWS)
+
+    def test_prefix_while_composing(self):
+        # "바" 입력 중(ㅂㅏ)에도 "밤편지"가 걸림
+        self.assertEqual(catalog_index.find("ㅂㅏ"), [1])
+        self.assertEqual(catalog_index.find("밤"), [1])
+        self.assertEqual(catalog_index.find("밤펴"), [1])
+
+    def test_word_prefix_and_popularity_order(self):
+        self.assertEqual(catalog_index.find("love"), [4, 3])
+        self.assertEqual(catalog_index.find("LOVE", 1), [4])
+        self.assertEqual(catalog_index.find("날"), [2])
+
+    def test_choseong(self):
+        self.assertEqual(catalog_index.find("ㅇㅇㅇ"), [2, 1])
+        self.assertEqual(catalog_index.find("ㅂㅍㅈ"), [1])
+
+    def test_suggest_returns_copies(self):
+        first = catalog_index.suggest("love", 1)
+        first[0]["track_name"] = "changed"
+        self.assertEqual(catalog_index.suggest("love", 1)[0]["track_name"], "LOVE wins all")
+
+    def test_add_many(self):
+        catalog_index.add_many([row(5, "Love Lee", "AKMU", 99), {"music_no": None}])
+        self.assertEqual(catalog_index.find("love", 2), [5, 4])
+        self.assertEqual(catalog_index.find("love"), [5, 4, 3])
+
+
+class ReloadTest(CatalogIndexTestCase):
+
+    def test_rows_added_during_load_are_kept(self):
+        self.load(ROWS)
+        added = row(5, "봄날", "BTS", 60)
+        self.load(ROWS, during_load=lambda: catalog_index.add_many([added]))
+        self.assertEqual(catalog_index.find("봄날"), [5])
+        self.assertIsNone(catalog_index._pending)
+
+    def test_failed_load_keeps_previous_index(self):
+        self.load(ROWS)
+        with mock.patch.object(catalog_index.music_model, "find_index_rows", side_effect=RuntimeError("db down")):
+            with self.assertRaises(RuntimeError):
+                catalog_index.load()
+        self.assertEqual(catalog_index.find("밤"), [1])
+        self.assertIsNone(catalog_index._pending)
+
+
+if __name__ == "__main__":
+    unittest.main()
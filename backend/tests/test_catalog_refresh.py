@@ -0,0 +1,126 @@
+# services/catalog_refresh 테스트: 트랙 id 추출, 50곡 단위 메타데이터 갱신, 진행 위치 저장/재시작
+import unittest
+from unittest import mock
+
+from spotipy.exceptions import SpotifyException
+
+from model import music as music_model
+from services import catalog_refresh
+
+
+def music(music_no, track_id=None, url=None):
+    return {"music_no": music_no, "spotify_track_id": track_id, "spotify_url": url}
+
+
+def spotify_track(track_id, popularity, release_date="2020-05-06", precision="day"):
+    return {"id": track_id, "popularity": popularity,
+            "album": {"release_date": release_date, "release_date_precision": precision}}
+
+
+class FakeSpotify:
+    def __init__(self, tracks, invalid=()):
+        self.tracks_by_id = {t.get("linked_from", t)["id"]: t for t in tracks}
+        self.invalid = set(invalid)     # 섞이면 묶음 전체가 400
+        self.calls = []
+
+    def tracks(self, ids, market=None):
+        self.calls.append(list(ids))
+        if self.invalid & set(ids):
+            raise SpotifyException(400, -1, "invalid base62 id")
+        return {"tracks": [self.tracks_by_id.get(i) for i in ids]}
+
+
+class FetchMetadataTest(unittest.TestCase):
+
+    def test_track_id_from_url(self):
+        self.assertEqual(catalog_refresh._track_id(music(1, "abc")), "abc")
+        self.assertEqual(catalog_refresh._track_id(music(1, url="https://open.spotify.com/track/xyz?si=1")), "xyz")
+        self.assertIsNone(catalog_refresh._track_id(music(1)))
+
+    def test_updates_for_found_tracks(self):
+        sp = FakeSpotify([spotify_track("a", 70), spotify_track("b", 10, "1999", "year")])
+        rows = [music(1, "a"), music(2, url="https://open.spotify.com/track/b"), music(3, "gone"), music(4)]
+
+        updates = catalog_refresh._fetch_metadata(sp, mock.Mock(), rows)
+
+        self.assertEqual(sp.calls, [["a", "b", "gone"]])
+        self.assertEqual(updates, [
+            {"music_no": 1, "popularity": 70, "release_date": "2020-05-06", "release_year": 2020},
+            {"music_no": 2, "popularity": 10, "release_date": None, "release_year": 1999},
+        ])
+
+    def test_relinked_track_matched_by_requested_id(self):
+        relinked = dict(spotify_track("new", 55), linked_from={"id": "old"})
+        updates = catalog_refresh._fetch_metadata(FakeSpotify([relinked]), mock.Mock(), [music(1, "old")])
+        self.assertEqual([u["music_no"] for u in updates], [1])
+        self.assertEqual(updates[0]["popularity"], 55)
+
+    def test_invalid_id_split_out_and_skipped(self):
+        sp = FakeSpotify([spotify_track(i, 50) for i in "abcd"], invalid=["c"])
+        budget = mock.Mock()
+        rows = [music(n, i) for n, i in enumerate("abcd", 1)]
+
+        with mock.patch("builtins.print"):
+            updates = catalog_refresh._fetch_metadata(sp, budget, rows)
+
+        self.assertEqual([u["music_no"] for u in updates], [1, 2, 4])
+        self.assertEqual(sp.calls, [["a", "b", "c", "d"], ["a", "b"], ["c", "d"], ["c"], ["d"]])
+        # 나눠서 보낸 요청도 토큰을 하나씩 사용
+        self.assertEqual(budget.acquire.call_count, 5)
+
+    def test_other_errors_raised(self):
+        sp = mock.Mock()
+        sp.tracks.side_effect = SpotifyException(500, -1, "server error")
+        with self.assertRaises(SpotifyException):
+            catalog_refresh._fetch_metadata(sp, mock.Mock(), [music(1, "a")])
+
+
+class RefreshMetadataTest(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = [music(n, f"t{n}") for n in range(1, 121)]
+        self.sp = FakeSpotify([spotify_track(f"t{n}", n) for n in range(1, 121)])
+        self.checkpoint = {"last": 0}
+        self.saved = []
+
+        def find_after(music_no, limit):
+            return [r for r in self.catalog if r["music_no"] > music_no][:limit]
+
+        def update(updates, job_name, last_music_no):
+            self.saved.append((len(updates), last_music_no))
+            self.checkpoint["last"] = last_music_no
+
+        mock.patch.object(music_model, "find_after", side_effect=find_after).start()
+        mock.patch.object(music_model, "update_metadata_many", side_effect=update).start()
+        mock.patch.multiple(
+            catalog_refresh.job_checkpoint_model,
+            find_last_key=mock.Mock(side_effect=lambda job: self.checkpoint["last"]),
+            reset=mock.Mock(side_effect=lambda job: self.checkpoint.update(last=0))
+        ).start()
+        mock.patch.object(catalog_refresh.music_service, "get_spotify_client", return_value=self.sp).start()
+        mock.patch.object(catalog_refresh, "SharedTokenBucket").start()
+        mock.patch("builtins.print").start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_full_pass_in_chunks_then_reset(self):
+        self.assertEqual(catalog_refresh.refresh_metadata(), (120, 120))
+        self.assertEqual([len(c) for c in self.sp.calls], [50, 50, 20])
+        self.assertEqual(self.saved, [(50, 50), (50, 100), (20, 120)])
+        self.assertEqual(self.checkpoint["last"], 0)
+
+    def test_limit_then_resume_from_checkpoint(self):
+        self.assertEqual(catalog_refresh.refresh_metadata(limit=60), (60, 60))
+        self.assertEqual(self.checkpoint["last"], 60)
+
+        catalog_refresh.refresh_metadata(limit=30)
+        self.assertEqual(self.sp.calls[-1], [f"t{n}" for n in range(61, 91)])
+        self.assertEqual(self.checkpoint["last"], 90)
+
+    def test_reset_starts_over(self):
+        self.checkpoint["last"] = 100
+        catalog_refresh.refresh_metadata(limit=10, reset=True)
+        self.assertEqual(self.sp.calls[0][0], "t1")
+
+
+if __name__ == "__main__":
+    unittest.main()
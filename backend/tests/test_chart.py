@@ -0,0 +1,173 @@
+# services/chart 테스트: 플레이리스트 페이지 조회, snapshot_id가 같으면 건너뛰기, 스냅샷 순위 저장/조회, 백그라운드 갱신
+import unittest
+from unittest import mock
+
+from services import chart as chart_service
+
+
+class FakeSpotify:
+    def __init__(self, snapshot_id, track_ids, page_size=2):
+        self.snapshot_id = snapshot_id
+        self.track_ids = track_ids
+        self.page_size = page_size
+        self.item_calls = []
+
+    def playlist(self, playlist_id, fields=None, market=None):
+        return {"snapshot_id": self.snapshot_id}
+
+    def playlist_items(self, playlist_id, limit, offset, market=None, additional_types=None):
+        self.item_calls.append(offset)
+        ids = self.track_ids[offset:offset + self.page_size]
+        # 삭제된 곡은 track이 None으로 옴
+        items = [{"track": {"id": i} if i else None} for i in ids]
+        has_next = offset + self.page_size < len(self.track_ids)
+        return {"items": items, "next": "next" if has_next else None}
+
+
+class ChartTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.model = mock.patch.multiple(
+            chart_service.chart_model,
+            upsert_chart=mock.DEFAULT, find_by_chart_key=mock.DEFAULT,
+            replace_entries=mock.DEFAULT, find_entries=mock.DEFAULT, claim_check=mock.DEFAULT
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+        mock.patch("builtins.print").start()
+        self.saved = mock.patch.object(
+            chart_service.music_service, "save_tracks",
+            side_effect=lambda sp, tracks: [({"music_no": int(t["id"][1:])}, True) for t in tracks]
+        ).start()
+
+    def use_spotify(self, sp):
+        mock.patch.object(chart_service.music_service, "get_spotify_client", return_value=sp).start()
+
+
+class RefreshChartTest(ChartTestCase):
+
+    def test_fetches_all_pages_in_order(self):
+        sp = FakeSpotify("s1", ["t3", None, "t1", "t2", "t5"])
+        self.use_spotify(sp)
+        self.model["find_by_chart_key"].return_value = None
+
+        self.assertTrue(chart_service.refresh_chart(chart_service.DEFAULT_CHART_KEY))
+        self.assertEqual(sp.item_calls, [0, 2, 4])
+        self.model["replace_entries"].assert_called_once_with(
+            chart_service.DEFAULT_CHART_KEY, "s1", [3, 1, 2, 5]
+        )
+
+    def test_same_snapshot_skipped(self):
+        sp = FakeSpotify("s1", ["t1"])
+        self.use_spotify(sp)
+        self.model["find_by_chart_key"].return_value = {"snapshot_id": "s1", "refreshed_at": "2026-01-01"}
+
+        self.assertFalse(chart_service.refresh_chart(chart_service.DEFAULT_CHART_KEY))
+        self.assertEqual(sp.item_calls, [])
+        self.model["replace_entries"].assert_not_called()
+
+    def test_force_refreshes_same_snapshot(self):
+        self.use_spotify(FakeSpotify("s1", ["t1"]))
+        self.model["find_by_chart_key"].return_value = {"snapshot_id": "s1", "refreshed_at": "2026-01-01"}
+
+        self.assertTrue(chart_service.refresh_chart(chart_service.DEFAULT_CHART_KEY, force=True))
+        self.model["replace_entries"].assert_called_once()
+
+
+class GetChartTest(ChartTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.background = mock.patch.object(chart_service, "_refresh_in_background").start()
+
+    def entry(self, music_no, checked_age):
+        return {"position": music_no, "snapshot_id": "s1", "refreshed_at": None,
+                "checked_age": checked_age, "music_no": music_no}
+
+    def test_unknown_chart(self):
+        chart, error = chart_service.get_chart("nope")
+        self.assertIsNone(chart)
+        self.assertTrue(error)
+
+    def test_fresh_snapshot_served_without_refresh(self):
+        self.model["find_entries"].return_value = [self.entry(1, 10), self.entry(2, 10)]
+        chart, error = chart_service.get_chart()
+        self.assertIsNone(error)
+        self.assertEqual(chart["snapshot_id"], "s1")
+        self.assertEqual([m["music_no"] for m in chart["musics"]], [1, 2])
+        self.assertNotIn("checked_age", chart["musics"][0])
+        self.background.assert_not_called()
+
+    def test_old_snapshot_served_and_checked_in_background(self):
+        self.model["find_entries"].return_value = [self.entry(1, chart_service.CHART_CHECK_INTERVAL)]
+        chart, _ = chart_service.get_chart()
+        self.assertEqual(len(chart["musics"]), 1)
+        self.background.assert_called_once_with(chart_service.DEFAULT_CHART_KEY)
+
+    def test_missing_snapshot_refreshed_in_background(self):
+        # 콜드 스타트: 요청 스레드에서 Spotify를 호출하지 않고 빈 목록 + refreshing
+        self.model["find_entries"].return_value = []
+        chart, error = chart_service.get_chart()
+        self.assertIsNone(error)
+        self.assertEqual((chart["musics"], chart["refreshing"]), ([], True))
+        self.background.assert_called_once_with(chart_service.DEFAULT_CHART_KEY, cold=True)
+
+
+class ImmediateThread:
+    """start() 하면 바로 target을 실행"""
+
+    def __init__(self, target, name=None, daemon=None):
+        self.target = target
+
+    def start(self):
+        self.target()
+
+
+class RefreshInBackgroundTest(ChartTestCase):
+
+    def setUp(self):
+        super().setUp()
+        mock.patch.object(chart_service.threading, "Thread", ImmediateThread).start()
+        self.refresh = mock.patch.object(chart_service, "refresh_chart").start()
+
+    def test_only_worker_that_claims_check_refreshes(self):
+        self.model["claim_check"].return_value = False
+        chart_service._refresh_in_background(chart_service.DEFAULT_CHART_KEY)
+        self.refresh.assert_not_called()
+
+        self.model["claim_check"].return_value = True
+        chart_service._refresh_in_background(chart_service.DEFAULT_CHART_KEY)
+        self.refresh.assert_called_once_with(chart_service.DEFAULT_CHART_KEY, force=False)
+        self.model["claim_check"].assert_called_with(chart_service.DEFAULT_CHART_KEY, chart_service.CHART_CHECK_INTERVAL)
+
+    def test_cold_refresh_retries_sooner_and_forces(self):
+        self.model["claim_check"].return_value = True
+        chart_service._refresh_in_background(chart_service.DEFAULT_CHART_KEY, cold=True)
+        self.model["claim_check"].assert_called_with(
+            chart_service.DEFAULT_CHART_KEY, chart_service.CHART_COLD_RETRY_INTERVAL
+        )
+        self.refresh.assert_called_once_with(chart_service.DEFAULT_CHART_KEY, force=True)
+
+    def test_error_clears_in_flight_flag(self):
+        self.model["claim_check"].side_effect = RuntimeError("db down")
+        chart_service._refresh_in_background(chart_service.DEFAULT_CHART_KEY)
+        self.assertNotIn(chart_service.DEFAULT_CHART_KEY, chart_service._refreshing)
+
+
+class LoadChartsTest(unittest.TestCase):
+
+    def load(self, raw):
+        with mock.patch.dict(chart_service.os.environ, {"SPOTIFY_CHARTS": raw}), mock.patch("builtins.print"):
+            return chart_service._load_charts()
+
+    def test_extra_charts_added(self):
+        charts = self.load('{"kr-top-50": {"playlist_id": "p1", "market": "KR"}}')
+        self.assertEqual(charts["kr-top-50"], {"playlist_id": "p1", "market": "KR"})
+        self.assertIn(chart_service.DEFAULT_CHART_KEY, charts)
+
+    def test_bad_values_ignored(self):
+        for raw in ("{not json", '["kr"]', '{"kr": {"market": "KR"}}', '{"kr": "p1"}'):
+            self.assertEqual(list(self.load(raw)), [chart_service.DEFAULT_CHART_KEY], raw)
+
+
+if __name__ == "__main__":
+    unittest.main()
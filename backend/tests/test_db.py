@@ -0,0 +1,482 @@
+# db.py 테스트: 연결 풀 대기/시간 초과, 통계, 요청 단위 연결(commit/rollback/SAVEPOINT), transaction(), @read_only 라우팅, RowStream
+# DB 없이 가짜 연결로 실행: python -m unittest discover tests (backend 폴더에서)
+import contextvars
+import threading
+import time
+import unittest
+from unittest import mock
+
+from flask import Flask, g
+
+import db
+
+
+class FakeCursor:
+    def __init__(self, conn, rows=None):
+        self.conn = conn
+        self.rows = list(rows or [])
+        self.rowcount = 0
+        self.closed = False
+
+    def execute(self, sql, args=None):
+        self.conn.log.append(sql)
+        if self.conn.fail_on and self.conn.fail_on in sql:
+            raise self.conn.error or RuntimeError("query failed")
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeConnection:
+    def __init__(self, name="primary", rows=None, fail_on=None, error=None):
+        self.name = name
+        self.rows = rows
+        self.fail_on = fail_on
+        self.error = error
+        self.log = []
+        self.closed = False
+        self.last_cursor = None
+
+    def cursor(self, *args):
+        self.last_cursor = FakeCursor(self, self.rows)
+        return self.last_cursor
+
+    def commit(self):
+        self.log.append("COMMIT")
+
+    def rollback(self):
+        self.log.append("ROLLBACK")
+
+    def close(self):
+        self.closed = True
+
+
+class FakePooledDB:
+    def __init__(self, **kwargs):
+        self.fail = False
+
+    def connection(self):
+        if self.fail:
+            raise RuntimeError("connect failed")
+        return FakeConnection()
+
+
+class ManagedPoolTest(unittest.TestCase):
+
+    def make_pool(self, max_connections=1, timeout=0.05, min_cached=0, max_cached=1):
+        with mock.patch.object(db, "PooledDB", FakePooledDB):
+            return db.ManagedPool("test", max_connections=max_connections, min_cached=min_cached,
+                                  max_cached=max_cached, timeout=timeout, retry_after=3)
+
+    def test_timeout_when_all_connections_in_use(self):
+        pool = self.make_pool()
+        conn = pool.connection()
+        with self.assertRaises(db.PoolTimeout) as ctx:
+            pool.connection()
+        self.assertEqual(ctx.exception.retry_after, 3)
+
+        stats = pool.stats()
+        self.assertEqual(stats["in_use"], 1)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["waiting"], 0)
+
+        conn.close()
+        pool.connection().close()
+        self.assertEqual(pool.stats()["in_use"], 0)
+        self.assertEqual(pool.stats()["checkouts"], 2)
+
+    def test_close_twice_releases_once(self):
+        pool = self.make_pool()
+        conn = pool.connection()
+        conn.close()
+        conn.close()
+        self.assertEqual(pool.stats()["in_use"], 0)
+
+    def test_waiter_gets_released_connection(self):
+        pool = self.make_pool(timeout=2)
+        conn = pool.connection()
+        threading.Timer(0.05, conn.close).start()
+        started = time.monotonic()
+        pool.connection().close()
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(pool.stats()["timeouts"], 0)
+
+    def test_connect_error_returns_slot(self):
+        pool = self.make_pool()
+        pool._pool.fail = True
+        with self.assertRaises(RuntimeError):
+            pool.connection()
+        pool._pool.fail = False
+        pool.connection().close()
+        self.assertEqual(pool.stats()["in_use"], 0)
+
+    def test_primary_timeout_recorded_on_request(self):
+        pool = self.make_pool()
+        pool.connection()
+        with Flask(__name__).test_request_context(), \
+                mock.patch.object(db.DatabaseManager, "get_pool", return_value=pool):
+            with self.assertRaises(db.PoolTimeout) as ctx:
+                db.DatabaseManager.get_connection()
+            self.assertIs(g.pool_timeout, ctx.exception)
+
+    def test_idle_count_follows_cache_limits(self):
+        pool = self.make_pool(max_connections=3, min_cached=1, max_cached=2)
+        self.assertEqual(pool.stats()["idle"], 1)
+        conns = [pool.connection() for _ in range(3)]
+        self.assertEqual(pool.stats()["idle"], 0)
+        for conn in conns:
+            conn.close()
+        # max_cached를 넘는 연결은 PooledDB가 닫음
+        self.assertEqual(pool.stats()["idle"], 2)
+
+    def test_wait_histogram(self):
+        pool = self.make_pool(max_connections=2)
+        pool.connection()
+        pool.connection()
+        histogram = pool.stats()["wait_histogram"]
+        self.assertEqual(histogram["<=1ms"], 2)
+        self.assertEqual(sum(histogram.values()), 2)
+
+    def test_cursor_is_instrumented(self):
+        pool = self.make_pool()
+        with pool.connection() as conn:
+            self.assertIsInstance(conn.cursor(), db.query_log.InstrumentedCursor)
+
+
+class ReplicaHealthTest(unittest.TestCase):
+
+    def setUp(self):
+        names = ("_replica_checked_at", "_replica_healthy", "_replica_lag", "_replica_error",
+                 "_replica_status_sql")
+        state = {name: getattr(db.DatabaseManager, name) for name in names}
+        self.addCleanup(lambda: [setattr(db.DatabaseManager, k, v) for k, v in state.items()])
+        db.DatabaseManager._replica_checked_at = float("-inf")
+
+        self.print = mock.patch("builtins.print").start()
+        self.addCleanup(mock.patch.stopall)
+
+    def check(self, status, conn=None):
+        conn = conn or FakeConnection("replica", rows=[status] if status else [])
+        pool = mock.Mock()
+        pool.connection.return_value = conn
+        db.DatabaseManager._replica_checked_at = float("-inf")
+        with mock.patch.object(db.DatabaseManager, "get_replica_pool", return_value=pool), \
+                mock.patch.object(db.DatabaseManager, "REPLICA_MAX_LAG", 10):
+            return db.DatabaseManager._check_replica()
+
+    def test_lag_within_limit(self):
+        self.assertTrue(self.check({"Seconds_Behind_Master": 3}))
+        self.assertEqual(db.DatabaseManager._replica_lag, 3)
+
+    def test_source_column_preferred(self):
+        self.assertTrue(self.check({"Seconds_Behind_Source": 2, "Seconds_Behind_Master": 99}))
+        self.assertEqual(db.DatabaseManager._replica_lag, 2)
+        self.assertFalse(self.check({"Seconds_Behind_Source": None}))
+
+    def test_old_server_falls_back_to_slave_status(self):
+        conn = FakeConnection("replica", rows=[{"Seconds_Behind_Master": 1}], fail_on="SHOW REPLICA STATUS",
+                              error=db.pymysql.err.ProgrammingError(1064, "syntax"))
+        self.assertTrue(self.check(None, conn))
+        self.assertEqual(conn.log, ["SHOW REPLICA STATUS", "SHOW SLAVE STATUS"])
+        # 다음 확인부터는 바로 SHOW SLAVE STATUS
+        self.assertTrue(self.check({"Seconds_Behind_Master": 1}))
+        self.assertEqual(db.DatabaseManager._replica_status_sql, "SHOW SLAVE STATUS")
+
+    def test_missing_grant_hint(self):
+        conn = FakeConnection("replica", fail_on="SHOW", error=db.pymysql.err.OperationalError(1227, "denied"))
+        self.assertFalse(self.check(None, conn))
+        self.assertIn("REPLICATION CLIENT", db.DatabaseManager._replica_error)
+
+    def test_logged_only_on_change(self):
+        self.check({"Seconds_Behind_Master": 1})
+        self.check({"Seconds_Behind_Master": 2})
+        self.assertEqual(self.print.call_count, 1)
+        self.check({"Seconds_Behind_Master": 30})
+        self.assertEqual(self.print.call_count, 2)
+
+    def test_lagging_or_stopped_replica_not_used(self):
+        self.assertFalse(self.check({"Seconds_Behind_Master": 30}))
+        self.assertFalse(self.check({"Seconds_Behind_Master": None}))
+
+    def test_server_without_replication_is_healthy(self):
+        self.assertTrue(self.check(None))
+
+    def test_result_reused_until_next_interval(self):
+        self.assertTrue(self.check({"Seconds_Behind_Master": 0}))
+        pool = mock.Mock()
+        pool.connection.return_value = FakeConnection("replica", rows=[{"Seconds_Behind_Master": 300}])
+        with mock.patch.object(db.DatabaseManager, "get_replica_pool", return_value=pool):
+            self.assertTrue(db.DatabaseManager._check_replica())
+        pool.connection.assert_not_called()
+
+
+class UnitOfWorkTestCase(unittest.TestCase):
+    """요청 컨텍스트 + 가짜 primary/replica 연결"""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.primary = FakeConnection("primary")
+        self.replica = FakeConnection("replica")
+        patches = [
+            mock.patch.object(db.DatabaseManager, "get_connection", side_effect=lambda: self.primary),
+            mock.patch.object(db.DatabaseManager, "get_replica_connection", side_effect=lambda: self.replica),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        ctx = self.app.test_request_context()
+        ctx.push()
+        self.addCleanup(ctx.pop)
+        self.unit = g._db_unit = db._UnitOfWork()
+
+    def write(self):
+        conn = db.get_connection()
+        with conn.cursor() as c:
+            c.execute("INSERT INTO t VALUES (1)")
+        conn.commit()
+        conn.close()
+
+
+class UnitOfWorkTest(UnitOfWorkTestCase):
+
+    def test_commit_is_deferred_to_end_of_request(self):
+        self.write()
+        self.write()
+        self.assertNotIn("COMMIT", self.primary.log)
+        self.assertTrue(self.unit.dirty)
+        self.assertFalse(self.primary.closed)
+
+        self.unit.commit()
+        self.assertEqual(self.primary.log.count("COMMIT"), 1)
+        self.assertFalse(self.unit.dirty)
+
+    def test_rollback_without_pending_writes_rolls_back_all(self):
+        conn = db.get_connection()
+        conn.rollback()
+        self.assertEqual(self.primary.log, ["ROLLBACK"])
+
+    def test_rollback_keeps_earlier_writes(self):
+        self.write()
+        conn = db.get_connection()
+        conn.rollback()
+        self.assertIn("SAVEPOINT uow_1", self.primary.log)
+        self.assertEqual(self.primary.log[-1], "ROLLBACK TO SAVEPOINT uow_1")
+        self.assertTrue(self.unit.dirty)
+
+        self.unit.commit()
+        self.assertEqual(self.primary.log[-1], "COMMIT")
+
+    def test_release_returns_connection(self):
+        db.get_connection()
+        self.unit.release()
+        self.assertTrue(self.primary.closed)
+        self.assertIsNone(self.unit.conn)
+
+    def test_release_idle_connection_keeps_pending_writes(self):
+        self.write()
+        db.release_idle_connection()
+        self.assertFalse(self.primary.closed)
+        self.unit.commit()
+        db.release_idle_connection()
+        self.assertTrue(self.primary.closed)
+
+    def test_unit_is_not_shared_with_other_threads(self):
+        # executor 작업처럼 context를 복사해 간 스레드는 요청 연결을 쓰지 않음
+        result = []
+        ctx = contextvars.copy_context()
+        thread = threading.Thread(target=lambda: result.append(ctx.run(db._current_unit)))
+        thread.start()
+        thread.join()
+        self.assertIs(db._current_unit(), self.unit)
+        self.assertEqual(result, [None])
+
+
+class TransactionTest(UnitOfWorkTestCase):
+
+    def test_joins_request_with_savepoint(self):
+        self.write()
+        with db.transaction() as conn:
+            self.assertIs(conn._conn, self.primary)
+            self.assertEqual(self.primary.log[-1], "SAVEPOINT uow_1")
+            self.write()
+        self.assertNotIn("COMMIT", self.primary.log)
+        self.assertTrue(self.unit.dirty)
+        self.unit.commit()
+        self.assertEqual(self.primary.log.count("COMMIT"), 1)
+
+    def test_error_rolls_back_to_savepoint_only(self):
+        self.write()
+        with self.assertRaises(RuntimeError):
+            with db.transaction():
+                self.write()
+                raise RuntimeError("boom")
+        self.assertEqual(self.primary.log[-1], "ROLLBACK TO SAVEPOINT uow_1")
+        self.assertNotIn("ROLLBACK", self.primary.log)
+        self.assertTrue(self.unit.dirty)
+
+    def test_nested_block_uses_savepoint(self):
+        conn = FakeConnection("script")
+        with self.app.app_context(), mock.patch.object(db.DatabaseManager, "get_connection", return_value=conn):
+            g.pop("_db_unit", None)
+            with db.transaction():
+                self.write()
+                with self.assertRaises(RuntimeError):
+                    with db.transaction():
+                        self.write()
+                        raise RuntimeError("boom")
+                self.write()
+        self.assertIn("ROLLBACK TO SAVEPOINT uow_2", conn.log)
+        self.assertNotIn("ROLLBACK", conn.log)
+        self.assertEqual(conn.log[-1], "COMMIT")
+        self.assertTrue(conn.closed)
+
+    def test_outside_request_commits_and_releases(self):
+        conn = FakeConnection("script")
+        with self.app.app_context(), mock.patch.object(db.DatabaseManager, "get_connection", return_value=conn):
+            g.pop("_db_unit", None)
+            with db.transaction() as tx:
+                with tx.cursor() as c:
+                    c.execute("DELETE FROM t")
+                self.write()
+        # 블록 안의 model 호출은 같은 연결을 쓰고, 자기 SAVEPOINT까지만 rollback할 수 있음
+        self.assertEqual(conn.log, ["DELETE FROM t", "SAVEPOINT uow_1", "INSERT INTO t VALUES (1)", "COMMIT"])
+        self.assertTrue(conn.closed)
+
+    def test_outside_request_error_rolls_back(self):
+        conn = FakeConnection("script")
+        with self.app.app_context(), mock.patch.object(db.DatabaseManager, "get_connection", return_value=conn):
+            g.pop("_db_unit", None)
+            with self.assertRaises(RuntimeError):
+                with db.transaction():
+                    raise RuntimeError("boom")
+        self.assertEqual(conn.log, ["ROLLBACK"])
+        self.assertTrue(conn.closed)
+
+
+class ReadOnlyRoutingTest(UnitOfWorkTestCase):
+
+    @staticmethod
+    @db.read_only
+    def read():
+        return db.get_connection()._conn
+
+    def test_read_only_uses_replica(self):
+        self.assertIs(self.read(), self.replica)
+        self.assertIs(db.get_connection()._conn, self.primary)
+
+    def test_reads_after_write_use_primary(self):
+        self.write()
+        self.assertIs(self.read(), self.primary)
+
+    def test_reads_inside_transaction_use_primary(self):
+        with db.transaction():
+            self.assertIs(self.read(), self.primary)
+
+    def test_sticky_request_uses_primary(self):
+        self.unit.sticky = True
+        self.assertIs(self.read(), self.primary)
+
+    def test_no_replica_falls_back_to_primary(self):
+        self.replica = None
+        self.assertIs(self.read(), self.primary)
+
+    def test_replica_commit_does_not_mark_write(self):
+        db.read_only(db.get_connection)().commit()
+        self.assertFalse(self.unit.wrote)
+
+    def test_release_returns_both_connections(self):
+        self.read()
+        db.get_connection()
+        self.unit.release()
+        self.assertTrue(self.primary.closed)
+        self.assertTrue(self.replica.closed)
+
+    def test_dedicated_connection_follows_writes(self):
+        self.assertIs(db.get_dedicated_connection(read_only=True), self.replica)
+        self.write()
+        self.assertIs(db.get_dedicated_connection(read_only=True), self.primary)
+
+
+class RequestLifecycleTest(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = FakeConnection()
+        patch = mock.patch.object(db.DatabaseManager, "get_connection", side_effect=lambda: self.conn)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        self.app = Flask(__name__)
+        db.init_app(self.app)
+
+        @self.app.route("/read")
+        def read():
+            db.get_connection()
+            return "ok"
+
+        @self.app.route("/write")
+        def write():
+            conn = db.get_connection()
+            conn.commit()
+            return "ok"
+
+        @self.app.route("/fail")
+        def fail():
+            conn = db.get_connection()
+            conn.commit()
+            return "error", 500
+
+    def test_read_only_request_does_not_commit(self):
+        self.app.test_client().get("/read")
+        self.assertEqual(self.conn.log, [])
+        self.assertTrue(self.conn.closed)
+
+    def test_write_is_committed_once(self):
+        self.app.test_client().get("/write")
+        self.assertEqual(self.conn.log, ["COMMIT"])
+        self.assertTrue(self.conn.closed)
+
+    def test_server_error_rolls_back(self):
+        self.app.test_client().get("/fail")
+        self.assertEqual(self.conn.log, ["ROLLBACK"])
+        self.assertTrue(self.conn.closed)
+
+
+class RowStreamTest(unittest.TestCase):
+
+    def test_chunks_and_releases_connection(self):
+        conn = FakeConnection(rows=[{"n": i} for i in range(7)])
+        stream = db.RowStream(conn, conn.cursor(), chunk_size=3).map(lambda r: r["n"])
+        self.assertEqual(list(stream), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertTrue(conn.last_cursor.closed)
+        self.assertTrue(conn.closed)
+
+    def test_stopping_early_releases_connection(self):
+        conn = FakeConnection(rows=[{"n": i} for i in range(7)])
+        chunks = iter(db.RowStream(conn, conn.cursor(), chunk_size=3))
+        next(chunks)
+        chunks.close()
+        self.assertTrue(conn.closed)
+
+    def test_stream_query_error_releases_connection(self):
+        conn = FakeConnection(fail_on="SELECT")
+        with mock.patch.object(db, "get_dedicated_connection", return_value=conn):
+            with self.assertRaises(RuntimeError):
+                db.stream_query("SELECT 1")
+        self.assertTrue(conn.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
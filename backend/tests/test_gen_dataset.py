@@ -0,0 +1,187 @@
+# gen_dataset 테스트: 같은 seed → 같은 데이터, 생성 행의 참조/범위, TSV 이스케이프, batch INSERT
+import argparse
+import random
+import unittest
+from unittest import mock
+from datetime import datetime
+
+import bcrypt
+
+import gen_dataset
+
+GENRES = [(1, "K-Pop"), (2, "Rock"), (3, "Jazz")]
+IDS = (1000, 2000, 3000)
+
+
+def make_args(**overrides):
+    args = dict(seed=7, users=30, playlists=3, songs=10, tracks=200, zipf=1.1,
+                now="2025-12-31T23:00:00", batch=50)
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def generate(args):
+    gen = gen_dataset.Generator(args, GENRES, IDS)
+    music = list(gen.music_rows())
+    users = list(gen.user_rows("hash"))
+    playlists, songs = [], []
+    for _ in gen.fill_playlists():
+        playlists += gen.playlists
+        songs += gen.songs
+        gen.playlists.clear()
+        gen.songs.clear()
+    return music, users, playlists, songs
+
+
+class GeneratorTest(unittest.TestCase):
+
+    def test_same_seed_same_rows(self):
+        self.assertEqual(generate(make_args()), generate(make_args()))
+        self.assertNotEqual(generate(make_args())[0], generate(make_args(seed=8))[0])
+
+    def test_rows_reference_generated_ids(self):
+        args = make_args()
+        music, users, playlists, songs = generate(args)
+
+        music_nos = {row[0] for row in music}
+        self.assertEqual(music_nos, set(range(1000, 1000 + args.tracks)))
+        self.assertTrue({row[9] for row in music} <= {g for g, _ in GENRES})
+        self.assertTrue(all(0 <= v <= 100 for row in music for v in row[12:]))
+
+        user_nos = {row[0] for row in users}
+        self.assertEqual(len(user_nos), args.users)
+        self.assertTrue(all(row[2].endswith("@" + gen_dataset.EMAIL_DOMAIN) for row in users))
+
+        playlist_nos = [row[0] for row in playlists]
+        self.assertEqual(playlist_nos, list(range(3000, 3000 + len(playlists))))
+        self.assertTrue({row[1] for row in playlists} <= user_nos)
+        self.assertTrue({row[0] for row in songs} <= set(playlist_nos))
+        self.assertTrue({row[1] for row in songs} <= music_nos)
+        # 한 플레이리스트에 같은 곡은 한 번만
+        self.assertEqual(len(songs), len({(p, m) for p, m, _ in songs}))
+
+    def test_popular_tracks_picked_more(self):
+        args = make_args(users=200, zipf=1.3)
+        gen = gen_dataset.Generator(args, GENRES, IDS)
+        top = gen.all_tracks[:10]
+        picks = [gen._pick(gen.all_tracks, gen.all_cum) for _ in range(5000)]
+        self.assertGreater(sum(1 for p in picks if p in top) / len(picks), 0.3)
+
+
+class HelpersTest(unittest.TestCase):
+
+    def test_random_time_within_range(self):
+        rng = random.Random(1)
+        start, end = datetime(2025, 1, 1), datetime(2025, 1, 31, 12)
+        for _ in range(200):
+            self.assertTrue(start <= gen_dataset._random_time(rng, start, end) <= end)
+
+    def test_tsv_value(self):
+        self.assertEqual(gen_dataset._tsv_value(None), "\\N")
+        self.assertEqual(gen_dataset._tsv_value("a\tb\nc\\"), "a\\tb\\nc\\\\")
+        self.assertEqual(gen_dataset._tsv_value(datetime(2025, 1, 2, 3, 4, 5)), "2025-01-02 03:04:05")
+
+    def test_id_ranges_do_not_overlap_and_fit_int(self):
+        self.assertEqual(gen_dataset._id_start(0), gen_dataset.SYNTH_ID_BASE)
+        self.assertEqual(gen_dataset._id_start(3) - gen_dataset._id_start(2), gen_dataset.SEED_ID_SPAN)
+        last = gen_dataset._id_start(gen_dataset.SEED_SLOTS - 1) + gen_dataset.SEED_ID_SPAN - 1
+        self.assertLess(last, 2 ** 31 // 10)
+
+    def test_password_hash_fixed_per_seed(self):
+        first = gen_dataset._password_hash(42)
+        self.assertEqual(first, gen_dataset._password_hash(42))
+        self.assertNotEqual(first, gen_dataset._password_hash(43))
+        self.assertTrue(bcrypt.checkpw(gen_dataset.PASSWORD.encode("utf-8"), first.encode("utf-8")))
+
+
+class LookupCursor:
+    """실행한 쿼리를 기록하고, 순서대로 준비된 fetchone 결과를 돌려줌"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.executed = []
+
+    def execute(self, sql, args=None):
+        self.executed.append((sql, args))
+
+    def fetchone(self):
+        return self.results.pop(0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class OccupiedTablesTest(unittest.TestCase):
+
+    def check(self, *results):
+        cursor = LookupCursor(results)
+        conn = mock.Mock()
+        conn.cursor.return_value = cursor
+        return gen_dataset._occupied_tables(conn, gen_dataset._id_start(42)), cursor.executed
+
+    def test_checks_seed_range_in_each_table(self):
+        occupied, executed = self.check(None, {"1": 1}, None)
+        self.assertEqual(occupied, ["user"])
+        start = gen_dataset._id_start(42)
+        self.assertEqual([args for _, args in executed], [(start, start + gen_dataset.SEED_ID_SPAN - 1)] * 3)
+        self.assertIn("FROM `playlist` WHERE playlist_no BETWEEN", executed[2][0])
+
+    def test_empty_range(self):
+        self.assertEqual(self.check(None, None, None)[0], [])
+
+
+class PurgeTest(unittest.TestCase):
+
+    def test_auto_increment_reset_after_delete(self):
+        cursor = LookupCursor([])
+        conn = mock.Mock()
+        conn.cursor.return_value = cursor
+        with mock.patch("builtins.print"):
+            gen_dataset.purge(conn, 42)
+        alters = [sql for sql, _ in cursor.executed if sql.startswith("ALTER")]
+        self.assertEqual(alters, [f"ALTER TABLE `{t}` AUTO_INCREMENT = 1" for t, _ in gen_dataset.SYNTH_TABLES])
+        self.assertTrue(cursor.executed[-4][0].startswith("DELETE FROM music"))
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def executemany(self, sql, rows):
+        self.conn.batches.append((sql, len(rows)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.batches = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+
+class InsertWriterTest(unittest.TestCase):
+
+    def test_batches_committed(self):
+        conn = FakeConnection()
+        count = gen_dataset.InsertWriter(conn, 4).write("music", ("a", "b"), iter([(i, i) for i in range(10)]))
+        self.assertEqual(count, 10)
+        self.assertEqual([n for _, n in conn.batches], [4, 4, 2])
+        self.assertEqual(conn.commits, 3)
+        self.assertEqual(conn.batches[0][0], "INSERT INTO `music` (a, b) VALUES (%s, %s)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# services/genre 테스트: 장르 레지스트리 (메모리 조회, 없는 이름은 MISS_RELOAD_INTERVAL마다 다시 읽음), 장르 생성
+import unittest
+from unittest import mock
+
+from model import genre as genre_model
+from services import genre as genre_service
+
+
+class GenreRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        state = {name: getattr(genre_service, name) for name in ("_by_name", "_by_no", "_loaded", "_last_load")}
+        self.addCleanup(lambda: [setattr(genre_service, k, v) for k, v in state.items()])
+        genre_service._loaded = False
+
+        self.now = 1000.0
+        self.rows = [{"genre_no": 1, "name": "K-Pop"}, {"genre_no": 2, "name": "Rock"}]
+        self.find_all = mock.patch.object(genre_service.genre_model, "find_all",
+                                          side_effect=lambda: list(self.rows)).start()
+        mock.patch.object(genre_service.time, "monotonic", side_effect=lambda: self.now).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_lookups_served_from_memory(self):
+        self.assertEqual(genre_service.get_genre_no("k-pop"), 1)
+        self.assertEqual(genre_service.get_genre_no("ROCK"), 2)
+        self.assertEqual(genre_service.get_genre_name(2), "Rock")
+        self.assertIsNone(genre_service.get_genre_no(""))
+        self.assertEqual(self.find_all.call_count, 1)
+
+    def test_unknown_name_reloads_at_most_once_per_interval(self):
+        genre_service.get_genre_no("K-Pop")
+        self.rows.append({"genre_no": 3, "name": "Jazz"})
+
+        self.assertIsNone(genre_service.get_genre_no("Jazz"))
+        self.assertEqual(self.find_all.call_count, 1)
+
+        self.now += genre_service.MISS_RELOAD_INTERVAL
+        self.assertEqual(genre_service.get_genre_no("Jazz"), 3)
+        self.assertEqual(self.find_all.call_count, 2)
+
+    def test_get_or_create_inserts_and_reloads(self):
+        def insert_genre(name):
+            self.rows.append({"genre_no": 9, "name": name})
+            return 9
+
+        with mock.patch.object(genre_service.genre_model, "insert_genre", side_effect=insert_genre) as insert:
+            self.assertEqual(genre_service.get_or_create_genre("Metal"), 9)
+            self.assertEqual(genre_service.get_or_create_genre("metal"), 9)
+        self.assertEqual(insert.call_count, 1)
+        self.assertEqual(genre_service.get_genre_name(9), "Metal")
+
+
+class FakeCursor:
+    def __init__(self):
+        self.executed = []
+        self.lastrowid = 4
+
+    def execute(self, sql, args=None):
+        self.executed.append((sql, args))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class InsertGenreTest(unittest.TestCase):
+
+    def test_duplicate_name_returns_existing_genre_no(self):
+        cursor = FakeCursor()
+        conn = mock.Mock()
+        conn.cursor.return_value = cursor
+        with mock.patch.object(genre_model, "get_connection", return_value=conn):
+            self.assertEqual(genre_model.insert_genre("Jazz"), 4)
+        sql, args = cursor.executed[0]
+        self.assertIn("ON DUPLICATE KEY UPDATE genre_no = LAST_INSERT_ID(genre_no)", sql)
+        self.assertEqual(args, ("Jazz",))
+        conn.commit.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+# services/genre_matcher 테스트: 단어 경계 기준 문구 매칭 + GENRE_MAP 순서대로 우선순위
+import unittest
+
+from services.genre_matcher import GENRE_MAP, GenreMatcher, match_genre
+
+
+class GenreMatcherTest(unittest.TestCase):
+
+    def test_exact_phrases(self):
+        self.assertEqual(match_genre(["k-pop"]), "K-Pop")
+        self.assertEqual(match_genre(["hip hop"]), "Hip-Hop")
+        self.assertEqual(match_genre(["r&b"]), "R&B")
+
+    def test_phrase_inside_longer_genre(self):
+        self.assertEqual(match_genre(["k-pop girl group"]), "K-Pop")
+        self.assertEqual(match_genre(["korean r&b"]), "R&B")
+        self.assertEqual(match_genre(["modern indie rock"]), "Indie")
+
+    def test_word_boundaries(self):
+        # "poppunk"/"trapeze" 같은 단어 안의 일부는 매칭하지 않음
+        self.assertIsNone(match_genre(["poppunk", "trapeze"]))
+        self.assertIsNone(match_genre(["polka"]))
+
+    def test_priority_across_artist_genres(self):
+        self.assertEqual(match_genre(["pop", "k-pop"]), "K-Pop")
+        self.assertEqual(match_genre(["rock", "metal"]), "Metal")
+        self.assertEqual(match_genre(["dance pop", "edm"]), "Electronic")
+
+    def test_empty_input(self):
+        self.assertIsNone(match_genre([]))
+        self.assertIsNone(match_genre(None))
+        self.assertIsNone(match_genre([None, ""]))
+
+    def test_custom_map_order_is_priority(self):
+        matcher = GenreMatcher({"rock": "Rock", "indie": "Indie"})
+        self.assertEqual(matcher.match(["indie rock"]), "Rock")
+        self.assertEqual(matcher.match_many([["indie"], ["jazz"]]), ["Indie", None])
+
+    def test_every_map_phrase_matches_itself(self):
+        for phrase, genre_name in GENRE_MAP.items():
+            self.assertEqual(match_genre([phrase]), genre_name, phrase)
+
+
+if __name__ == "__main__":
+    unittest.main()
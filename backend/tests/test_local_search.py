@@ -0,0 +1,203 @@
+# 로컬 FULLTEXT 검색 테스트: BOOLEAN MODE 쿼리 변환, search_fulltext SQL, 로컬 우선 → Spotify 대체, 초성 검색
+import unittest
+from unittest import mock
+
+from model import music as music_model
+from services import music as music_service
+
+
+class FakeCursor:
+    def __init__(self, total, rows):
+        self.total = total
+        self.rows = rows
+        self.executed = []
+
+    def execute(self, sql, args=None):
+        self.executed.append((" ".join(sql.split()), list(args or [])))
+
+    def fetchone(self):
+        return {"total": self.total}
+
+    def fetchall(self):
+        return [dict(r) for r in self.rows]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, total=0, rows=()):
+        self.cursor_obj = FakeCursor(total, rows)
+
+    def cursor(self):
+        return self.cursor_obj
+
+    def close(self):
+        pass
+
+
+class FulltextQueryTest(unittest.TestCase):
+
+    def test_every_word_required(self):
+        self.assertEqual(music_model._fulltext_query("love dive"), "+love +dive")
+
+    def test_short_word_prefix(self):
+        self.assertEqual(music_model._fulltext_query("아 이유"), "+아* +이유")
+
+    def test_operators_stripped(self):
+        self.assertEqual(music_model._fulltext_query('-"iu" (love)*'), "+iu +love")
+        self.assertEqual(music_model._fulltext_query(" +- "), "")
+
+
+class SearchFulltextTest(unittest.TestCase):
+
+    def search(self, conn, *args):
+        with mock.patch.object(music_model, "get_connection", return_value=conn):
+            return music_model.search_fulltext(*args)
+
+    def test_empty_query_skips_db(self):
+        with mock.patch.object(music_model, "get_connection") as get_connection:
+            self.assertEqual(music_model.search_fulltext("***"), ([], 0))
+        get_connection.assert_not_called()
+
+    def test_count_then_page(self):
+        conn = FakeConnection(total=30, rows=[{"music_no": 1, "score": 2.5}])
+        rows, total = self.search(conn, "iu", None, 12, 12)
+        self.assertEqual((rows, total), ([{"music_no": 1}], 30))
+
+        (count_sql, count_args), (select_sql, select_args) = conn.cursor_obj.executed
+        self.assertTrue(count_sql.startswith("SELECT COUNT(*)"))
+        self.assertEqual(count_args, ["+iu"])
+        self.assertIn("NATURAL LANGUAGE MODE) AS score", select_sql)
+        self.assertIn("ORDER BY score DESC, popularity DESC LIMIT %s OFFSET %s", select_sql)
+        self.assertEqual(select_args, ["iu", "+iu", 12, 12])
+
+    def test_min_score_filter(self):
+        conn = FakeConnection(total=0)
+        self.search(conn, "love dive", None, 0, 12, 1.5)
+        count_sql, count_args = conn.cursor_obj.executed[0]
+        self.assertIn("AGAINST (%s IN NATURAL LANGUAGE MODE) >= %s", count_sql)
+        self.assertEqual(count_args, ["+love +dive", "love dive", 1.5])
+
+    def test_artist_category_filters_artist_name(self):
+        conn = FakeConnection(total=1, rows=[])
+        self.search(conn, " iu ", "artist")
+        count_sql, count_args = conn.cursor_obj.executed[0]
+        self.assertIn("AND artist_name LIKE %s", count_sql)
+        self.assertEqual(count_args, ["+iu", "%iu%"])
+
+        self.search(conn, "100%_", "artist")
+        self.assertEqual(conn.cursor_obj.executed[-1][1][-1], "%100\\%\\_%")
+
+    def test_genre_filter_in_where(self):
+        conn = FakeConnection(total=0)
+        self.search(conn, "love", "genre", 0, 200, None, 3)
+        count_sql, count_args = conn.cursor_obj.executed[0]
+        self.assertIn("AND genre_no = %s", count_sql)
+        self.assertEqual(count_args, ["+love", 3])
+
+    def test_offset_past_total_skips_select(self):
+        conn = FakeConnection(total=5)
+        self.assertEqual(self.search(conn, "iu", None, 12, 12), ([], 5))
+        self.assertEqual(len(conn.cursor_obj.executed), 1)
+
+
+class LocalFirstSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.remote = mock.patch.object(
+            music_service, "_search_spotify_and_save", return_value=([{"music_no": 9}], 100)
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+        mock.patch("builtins.print").start()
+
+    def local(self, **kwargs):
+        return mock.patch.object(music_model, "search_fulltext", **kwargs).start()
+
+    def test_local_rows_fill_page(self):
+        self.local(return_value=([{"music_no": 1}] * 12, 40))
+        musics, total, source = music_service._search("iu", None, 2, 12)
+        self.assertEqual((len(musics), total, source), (12, 40, "local"))
+        self.remote.assert_not_called()
+
+    def test_short_local_result_goes_to_spotify(self):
+        search = self.local(return_value=([{"music_no": 1}] * 3, 15))
+        self.assertEqual(music_service._search("iu", None, 2, 12)[2], "remote")
+        search.assert_called_once_with("iu", None, 12, 12, min_score=music_service.SEARCH_LOCAL_MIN_SCORE)
+        self.remote.assert_called_once_with("iu", None, 2, 12)
+
+    def test_local_rows_sorted_like_remote(self):
+        rows = [{"music_no": 1, "artist_name": "Other"}, {"music_no": 2, "artist_name": "IU"}] * 6
+        self.local(return_value=(rows, 12))
+        musics, _, _ = music_service._search("iu", None, 1, 12)
+        self.assertEqual(musics[0]["music_no"], 2)
+        self.assertFalse(any(m["is_new"] for m in musics))
+
+    def test_short_term_goes_to_spotify(self):
+        # ngram보다 짧은 단어는 접두 검색이라 부분 문자열 매칭이 많음
+        search = self.local(return_value=([{"music_no": 1}] * 12, 40))
+        self.assertEqual(music_service._search("iu a", None, 1, 12)[2], "remote")
+        search.assert_not_called()
+
+    def test_local_error_goes_to_spotify(self):
+        self.local(side_effect=RuntimeError("no fulltext index"))
+        self.assertEqual(music_service._search("iu", None, 1, 12)[2], "remote")
+
+    def test_local_first_disabled(self):
+        search = self.local(return_value=([{"music_no": 1}] * 12, 40))
+        with mock.patch.object(music_service, "SEARCH_LOCAL_FIRST", False):
+            self.assertEqual(music_service._search("iu", None, 1, 12)[2], "remote")
+        search.assert_not_called()
+
+    def test_choseong_query_answered_from_index(self):
+        search = self.local()
+        with mock.patch.object(music_service.catalog_index, "find", return_value=[5, 3, 8]), \
+                mock.patch.object(music_model, "find_by_music_nos", return_value=[{"music_no": 8}]) as rows:
+            musics, total, source = music_service._search("ㅂㅍㅈ", None, 2, 2)
+        self.assertEqual((musics, total, source), ([{"music_no": 8}], 3, "local"))
+        rows.assert_called_once_with([8])
+        search.assert_not_called()
+        self.remote.assert_not_called()
+
+
+class MusicListKeywordTest(unittest.TestCase):
+
+    def test_fulltext_capped(self):
+        with mock.patch.object(music_model, "search_fulltext", return_value=([], 0)) as search:
+            music_service.get_music_list(keyword="a")
+        search.assert_called_once_with("a", None, 0, music_service.MUSIC_LIST_SEARCH_LIMIT, genre_no=None)
+
+    def test_genre_filtered_before_limit(self):
+        with mock.patch.object(music_service.genre_service, "get_genre_no", return_value=3), \
+                mock.patch.object(music_model, "search_fulltext", return_value=([], 0)) as search:
+            music_service.get_music_list("genre", "Jazz", keyword="love")
+        search.assert_called_once_with("love", "genre", 0, music_service.MUSIC_LIST_SEARCH_LIMIT, genre_no=3)
+
+    def test_unknown_genre_returns_empty(self):
+        with mock.patch.object(music_service.genre_service, "get_genre_no", return_value=None), \
+                mock.patch.object(music_model, "search_fulltext") as search:
+            self.assertEqual(music_service.get_music_list("genre", "Nope", keyword="love"), ([], None))
+        search.assert_not_called()
+
+    def test_choseong_capped(self):
+        with mock.patch.object(music_service.catalog_index, "find", return_value=[1]) as find, \
+                mock.patch.object(music_model, "find_by_music_nos", return_value=[]):
+            music_service.get_music_list(keyword="ㄱ")
+        find.assert_called_once_with("ㄱ", music_service.MUSIC_LIST_SEARCH_LIMIT)
+
+    def test_choseong_genre_filtered_before_limit(self):
+        rows = [{"music_no": n} for n in range(music_service.MUSIC_LIST_SEARCH_LIMIT + 5)]
+        with mock.patch.object(music_service.genre_service, "get_genre_no", return_value=3), \
+                mock.patch.object(music_service.catalog_index, "find", return_value=[1, 2]) as find, \
+                mock.patch.object(music_model, "find_by_music_nos", return_value=rows) as find_rows:
+            musics, _ = music_service.get_music_list("genre", "Jazz", keyword="ㄱ")
+        find.assert_called_once_with("ㄱ", None)
+        find_rows.assert_called_once_with([1, 2], 3)
+        self.assertEqual(len(musics), music_service.MUSIC_LIST_SEARCH_LIMIT)
+
+
+if __name__ == "__main__":
+    unittest.main()
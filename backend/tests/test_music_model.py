@@ -0,0 +1,163 @@
+# model/music 테스트: upsert_many (multi-row upsert 후 입력 순서대로 music_no 반환), spotify_url IN 조회
+import unittest
+from unittest import mock
+
+import db
+from model import music as music_model
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.lastrowid = None
+        self._rows = []
+
+    def execute(self, sql, args=None):
+        sql = " ".join(sql.split())
+        self.conn.log.append((sql, args))
+        if sql.startswith("SELECT music_no, spotify_track_id"):
+            self._rows = [{"music_no": self.conn.music_nos[t], "spotify_track_id": t}
+                          for t in args if t in self.conn.music_nos]
+        elif sql.startswith("SELECT * FROM music WHERE spotify_url IN"):
+            self._rows = [{"spotify_url": u, "music_no": self.conn.music_nos[u]}
+                          for u in args if u in self.conn.music_nos]
+        elif sql.startswith("INSERT"):
+            self.conn.next_id += 1
+            self.lastrowid = self.conn.next_id
+
+    def executemany(self, sql, rows):
+        if self.conn.fail:
+            raise RuntimeError("deadlock")
+        self.conn.log.append((" ".join(sql.split()), rows))
+        for row in rows:
+            track_id = row[music_model.MUSIC_COLUMNS.index("spotify_track_id")]
+            if track_id not in self.conn.music_nos:
+                self.conn.next_id += 1
+                self.conn.music_nos[track_id] = self.conn.next_id
+
+    def fetchall(self):
+        return self._rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, music_nos=None, fail=False):
+        self.music_nos = dict(music_nos or {})     # spotify_track_id -> music_no (이미 있는 곡)
+        self.fail = fail
+        self.next_id = 100
+        self.log = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.log.append("COMMIT")
+
+    def rollback(self):
+        self.log.append("ROLLBACK")
+
+    def close(self):
+        pass
+
+
+def row(track_id, name="Song"):
+    return {"track_name": name, "artist_name": "IU", "spotify_url": f"https://open.spotify.com/track/{track_id}",
+            "spotify_track_id": track_id, "popularity": 50}
+
+
+class UpsertManyTest(unittest.TestCase):
+
+    def upsert(self, conn, rows):
+        # 요청 밖이므로 transaction()이 풀에서 연결을 직접 빌림
+        with mock.patch.object(db.DatabaseManager, "get_connection", return_value=conn), \
+                mock.patch("builtins.print"):
+            return music_model.upsert_many(rows)
+
+    def test_returns_music_no_in_input_order(self):
+        conn = FakeConnection({"t2": 7})
+        music_nos = self.upsert(conn, [row("t1"), row("t2"), row("t3")])
+        self.assertEqual(music_nos, [101, 7, 102])
+        self.assertEqual(conn.log[-1], "COMMIT")
+
+        insert_sql, values = conn.log[0]
+        self.assertIn("ON DUPLICATE KEY UPDATE popularity = VALUES(popularity)", insert_sql)
+        self.assertEqual(len(values), 3)
+        # 요청 트랜잭션의 스냅샷이 아니라 최신 커밋 행을 읽어야 다른 요청이 먼저 넣은 곡도 찾음
+        select_sql, _ = conn.log[1]
+        self.assertTrue(select_sql.endswith("LOCK IN SHARE MODE"))
+
+    def test_row_without_track_id_inserted_alone(self):
+        conn = FakeConnection()
+        no_id = dict(row(None), spotify_track_id=None)
+        self.assertEqual(self.upsert(conn, [row("t1"), no_id]), [101, 102])
+
+    def test_failure_rolls_back_whole_page(self):
+        conn = FakeConnection(fail=True)
+        self.assertEqual(self.upsert(conn, [row("t1"), row("t2")]), [None, None])
+        self.assertIn("ROLLBACK", conn.log)
+        self.assertNotIn("COMMIT", conn.log)
+
+    def test_empty(self):
+        self.assertEqual(music_model.upsert_many([]), [])
+
+    def test_insert_music_wrapper(self):
+        conn = FakeConnection({"t1": 5})
+        with mock.patch.object(db.DatabaseManager, "get_connection", return_value=conn), \
+                mock.patch("builtins.print"):
+            self.assertEqual(music_model.insert_music(row("t1")), 5)
+
+
+class UpdateMetadataManyTest(unittest.TestCase):
+
+    def test_update_and_checkpoint_in_one_transaction(self):
+        conn = FakeConnection()
+        with mock.patch.object(db.DatabaseManager, "get_connection", return_value=conn), \
+                mock.patch.object(music_model.job_checkpoint_model, "save") as save:
+            music_model.update_metadata_many([{"music_no": 1, "popularity": 70}], "refresh", 1)
+        sql, args = conn.log[0]
+        self.assertTrue(sql.startswith("UPDATE music SET popularity = COALESCE(CASE music_no WHEN %s THEN %s END"))
+        self.assertEqual(args[:2], [1, 70])
+        self.assertEqual(save.call_args[0][1:], ("refresh", 1))
+        self.assertEqual(conn.log[-1], "COMMIT")
+
+    def test_checkpoint_error_rolls_back_update(self):
+        conn = FakeConnection()
+        with mock.patch.object(db.DatabaseManager, "get_connection", return_value=conn), \
+                mock.patch.object(music_model.job_checkpoint_model, "save", side_effect=RuntimeError("db")):
+            with self.assertRaises(RuntimeError):
+                music_model.update_metadata_many([{"music_no": 1}], "refresh", 1)
+        self.assertEqual(conn.log[-1], "ROLLBACK")
+        self.assertNotIn("COMMIT", conn.log)
+
+
+class FindBySpotifyUrlsTest(unittest.TestCase):
+
+    def test_chunked_in_query(self):
+        urls = [f"u{i}" for i in range(1200)]
+        conn = FakeConnection({"u3": 3, "u1100": 1100})
+        with mock.patch.object(music_model, "get_connection", return_value=conn):
+            found = music_model.find_by_spotify_urls(urls + ["u3", None])
+        self.assertEqual([len(args) for _, args in conn.log], [500, 500, 200])
+        self.assertEqual({url: r["music_no"] for url, r in found.items()}, {"u3": 3, "u1100": 1100})
+
+    def test_empty(self):
+        self.assertEqual(music_model.find_by_spotify_urls([None, ""]), {})
+
+
+class FindByMusicNosTest(unittest.TestCase):
+
+    def test_genre_filter_per_chunk(self):
+        conn = FakeConnection()
+        with mock.patch.object(music_model, "get_connection", return_value=conn):
+            music_model.find_by_music_nos(list(range(600)), genre_no=3)
+        self.assertEqual([len(args) for _, args in conn.log], [501, 101])
+        self.assertTrue(all(sql.endswith("AND genre_no = %s") and args[-1] == 3 for sql, args in conn.log))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+# services/music 트랙 저장 테스트: 오디오 특성 일괄 조회(100개 단위), save_tracks 순서/중복/누락 처리
+# DB/Spotify 없이 실행: python -m unittest discover tests (backend 폴더에서)
+import unittest
+from unittest import mock
+
+from services import music as music_service
+
+
+def track(n, url=True):
+    return {
+        "id": f"t{n}",
+        "name": f"Song {n}",
+        "artists": [{"id": f"a{n}", "name": f"Artist {n}"}],
+        "album": {"name": f"Album {n}", "images": [{"url": f"https://img/{n}"}]},
+        "duration_ms": 200000,
+        "popularity": n,
+        "external_urls": {"spotify": f"https://open.spotify.com/track/t{n}"} if url else {},
+    }
+
+
+def features(value):
+    return {"energy": value, "danceability": value, "valence": value,
+            "acousticness": value, "instrumentalness": value}
+
+
+class FakeSpotify:
+    def __init__(self, known=None, fail_chunks=()):
+        self.known = known or {}            # track_id -> 오디오 특성 (없으면 None 응답)
+        self.fail_chunks = set(fail_chunks)
+        self.calls = []
+
+    def audio_features(self, ids):
+        self.calls.append(list(ids))
+        if len(self.calls) - 1 in self.fail_chunks:
+            raise RuntimeError("spotify error")
+        return [self.known.get(i) for i in ids]
+
+
+class FetchAudioFeaturesBatchTest(unittest.TestCase):
+
+    def test_chunks_of_100(self):
+        ids = [f"t{i}" for i in range(250)]
+        sp = FakeSpotify({i: features(0.5) for i in ids})
+        result = music_service.fetch_audio_features_batch(sp, ids)
+        self.assertEqual([len(c) for c in sp.calls], [100, 100, 50])
+        self.assertEqual(len(result), 250)
+        self.assertEqual(result["t0"]["energy"], 50)
+
+    def test_duplicates_and_empty_ids_skipped(self):
+        sp = FakeSpotify({"t1": features(0.1)})
+        music_service.fetch_audio_features_batch(sp, ["t1", None, "", "t1", "t2"])
+        self.assertEqual(sp.calls, [["t1", "t2"]])
+
+    def test_missing_features_left_out(self):
+        sp = FakeSpotify({"t1": features(0.123), "t3": {"energy": None, "danceability": 0.999}})
+        result = music_service.fetch_audio_features_batch(sp, ["t1", "t2", "t3"])
+        self.assertEqual(set(result), {"t1", "t3"})
+        self.assertEqual(result["t1"]["energy"], 12)
+        self.assertEqual(result["t3"], {"energy": 0, "danceability": 100, "valence": 0,
+                                        "acousticness": 0, "instrumentalness": 0})
+
+    def test_failed_chunk_does_not_drop_others(self):
+        ids = [f"t{i}" for i in range(150)]
+        sp = FakeSpotify({i: features(0.5) for i in ids}, fail_chunks=[0])
+        with mock.patch("builtins.print"):
+            result = music_service.fetch_audio_features_batch(sp, ids)
+        self.assertEqual(sorted(result), sorted(ids[100:]))
+
+    def test_single_track_wrapper(self):
+        sp = FakeSpotify({"t1": features(0.2)})
+        self.assertEqual(music_service.fetch_audio_features(sp, "t1")["valence"], 20)
+        self.assertIsNone(music_service.fetch_audio_features(sp, "t2"))
+
+
+class SaveTracksTest(unittest.TestCase):
+
+    def setUp(self):
+        self.existing = {}      # spotify_url -> music row
+        self.inserted = []
+        self.lookups = []
+        patches = [
+            mock.patch.object(music_service.music_model, "find_by_spotify_urls", side_effect=self.find_existing),
+            mock.patch.object(music_service.music_model, "upsert_many", side_effect=self.upsert_many),
+            mock.patch.object(music_service.artist_genre_service, "resolve_genre_nos", return_value={}),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def find_existing(self, urls):
+        self.lookups.append(list(urls))
+        return {url: self.existing[url] for url in urls if url in self.existing}
+
+    def upsert_many(self, rows):
+        start = 1001 + len(self.inserted)
+        self.inserted.extend(dict(m) for m in rows)
+        return list(range(start, start + len(rows)))
+
+    def save(self, sp, tracks):
+        return music_service.save_tracks(sp, tracks)
+
+    def test_order_preserved_and_features_merged(self):
+        self.existing[track(2)["external_urls"]["spotify"]] = {"music_no": 7, "track_name": "Song 2"}
+        sp = FakeSpotify({"t1": features(0.3), "t3": features(0.9)})
+
+        saved = self.save(sp, [track(1), track(2), track(3)])
+
+        self.assertEqual([m["track_name"] for m, _ in saved], ["Song 1", "Song 2", "Song 3"])
+        self.assertEqual([is_new for _, is_new in saved], [True, False, True])
+        self.assertEqual(saved[0][0]["energy"], 30)
+        self.assertEqual(saved[2][0]["energy"], 90)
+        # 페이지 전체를 한 번에 조회하고, 이미 있는 곡은 오디오 특성을 다시 조회하지 않음
+        self.assertEqual(len(self.lookups), 1)
+        self.assertEqual(sp.calls, [["t1", "t3"]])
+
+    def test_missing_features_still_saved(self):
+        saved = self.save(FakeSpotify(), [track(1)])
+        self.assertEqual(len(saved), 1)
+        self.assertTrue(saved[0][1])
+        self.assertNotIn("energy", self.inserted[0])
+
+    def test_duplicate_in_page_saved_once(self):
+        saved = self.save(FakeSpotify(), [track(1), track(1)])
+        self.assertEqual(len(self.inserted), 1)
+        self.assertEqual([is_new for _, is_new in saved], [True, False])
+        self.assertEqual(saved[0][0]["music_no"], saved[1][0]["music_no"])
+
+    def test_genre_resolved_per_artist(self):
+        with mock.patch.object(music_service.artist_genre_service, "resolve_genre_nos",
+                               return_value={"a1": 3}) as resolve:
+            saved = self.save(FakeSpotify(), [track(1), track(2)])
+        self.assertEqual([m["genre_no"] for m, _ in saved], [3, None])
+        self.assertEqual(resolve.call_count, 1)
+
+    def test_failed_upsert_leaves_out_new_tracks(self):
+        self.existing[track(2)["external_urls"]["spotify"]] = {"music_no": 7, "track_name": "Song 2"}
+        with mock.patch.object(music_service.music_model, "upsert_many", return_value=[None, None]):
+            saved = self.save(FakeSpotify(), [track(1), track(2), track(3)])
+        self.assertEqual([m["track_name"] for m, _ in saved], ["Song 2"])
+
+    def test_tracks_without_url_skipped(self):
+        saved = self.save(FakeSpotify(), [track(1, url=False), track(2)])
+        self.assertEqual([m["track_name"] for m, _ in saved], ["Song 2"])
+
+    def test_page_over_100_tracks_batches_features(self):
+        tracks = [track(i) for i in range(120)]
+        sp = FakeSpotify({f"t{i}": features(0.5) for i in range(120)})
+        saved = self.save(sp, tracks)
+        self.assertEqual([len(c) for c in sp.calls], [100, 20])
+        self.assertEqual([m["track_name"] for m, _ in saved], [f"Song {i}" for i in range(120)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# 다음 페이지 미리 가져오기 테스트: 클라이언트당 1개, 검색 조건 변경 시 취소, PREFETCH 우선순위
+import unittest
+from concurrent.futures import Future
+from unittest import mock
+
+from services import music as music_service
+from spotify_client import PREFETCH, _priority
+
+
+class FakeExecutor:
+    """submit된 작업을 실행하지 않고 Future만 돌려줌"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.submitted.append((args, future))
+        return future
+
+
+class SchedulePrefetchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = FakeExecutor()
+        mock.patch.object(music_service, "prefetch_executor", self.executor).start()
+        mock.patch.object(music_service, "SEARCH_PREFETCH", True).start()
+        mock.patch.object(music_service, "_prefetches", {}).start()
+        self.addCleanup(mock.patch.stopall)
+        music_service.search_cache.clear()
+        self.addCleanup(music_service.search_cache.clear)
+
+    def schedule(self, keyword, page=1, total=100, client_key="user:1"):
+        music_service._schedule_prefetch(client_key, keyword, None, page, 12, total)
+
+    def test_next_page_scheduled(self):
+        self.schedule("iu")
+        (args, _), = self.executor.submitted
+        self.assertEqual(args[1:], ("iu", None, 2, 12))
+
+    def test_last_page_not_prefetched(self):
+        self.schedule("iu", page=9, total=100)
+        self.assertEqual(self.executor.submitted, [])
+
+    def test_page_past_search_window_not_prefetched(self):
+        # 83페이지(offset 984 + 12)까지는 조회 가능, 84페이지(offset 996 + 12)는 Spotify가 거부
+        self.schedule("iu", page=82, total=5000)
+        self.assertEqual(len(self.executor.submitted), 1)
+        self.schedule("iu2", page=83, total=5000)
+        self.assertEqual(len(self.executor.submitted), 1)
+
+    def test_cached_next_page_not_prefetched(self):
+        music_service.search_cache.set(music_service._normalize_search_key("iu", None, 2, 12), ([], 0, "remote"))
+        self.schedule("iu")
+        self.assertEqual(self.executor.submitted, [])
+
+    def test_one_pending_prefetch_per_client(self):
+        self.schedule("iu")
+        self.schedule("iu")
+        self.assertEqual(len(self.executor.submitted), 1)
+        self.schedule("iu", client_key="user:2")
+        self.assertEqual(len(self.executor.submitted), 2)
+
+    def test_new_query_cancels_queued_prefetch(self):
+        self.schedule("iu")
+        self.schedule("ive")
+        first, second = (future for _, future in self.executor.submitted)
+        self.assertTrue(first.cancelled())
+        self.assertEqual(self.executor.submitted[1][0][1], "ive")
+        self.assertFalse(second.done())
+
+    def test_running_prefetch_not_replaced(self):
+        self.schedule("iu")
+        self.executor.submitted[0][1].set_running_or_notify_cancel()
+        self.schedule("ive")
+        self.assertEqual(len(self.executor.submitted), 1)
+
+    def test_finished_prefetch_forgotten(self):
+        self.schedule("iu")
+        self.executor.submitted[0][1].set_result(None)
+        self.assertEqual(music_service._prefetches, {})
+
+    def test_disabled_or_no_client(self):
+        self.schedule("iu", client_key=None)
+        with mock.patch.object(music_service, "SEARCH_PREFETCH", False):
+            self.schedule("iu")
+        self.assertEqual(self.executor.submitted, [])
+
+
+class PrefetchPageTest(unittest.TestCase):
+
+    def setUp(self):
+        music_service.search_cache.clear()
+        self.addCleanup(music_service.search_cache.clear)
+
+    def test_page_cached_with_prefetch_priority(self):
+        seen = []
+
+        def search(*args):
+            seen.append(_priority.get())
+            return [{"music_no": 1}], 30, "remote"
+
+        with mock.patch.object(music_service, "_search", side_effect=search):
+            music_service._prefetch_page("k", "iu", None, 2, 12)
+        self.assertEqual(seen, [PREFETCH])
+        self.assertEqual(music_service.search_cache.peek("k"), ([{"music_no": 1}], 30, "remote"))
+
+    def test_error_ignored(self):
+        with mock.patch.object(music_service, "_search", side_effect=RuntimeError("429")), \
+                mock.patch("builtins.print"):
+            music_service._prefetch_page("k", "iu", None, 2, 12)
+        self.assertIsNone(music_service.search_cache.peek("k"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+# query_log 테스트: SQL 정규화, 커서 계측, 문장별 누적 통계, 요청별 Server-Timing
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+import query_log
+from query_log import normalize_sql
+
+
+class NormalizeSqlTest(unittest.TestCase):
+
+    def test_literals_and_placeholders(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM music WHERE music_no = 12 AND track_name = 'it''s' AND genre_no = %s"),
+            "SELECT * FROM music WHERE music_no = ? AND track_name = ? AND genre_no = ?"
+        )
+
+    def test_named_placeholders_and_decimals(self):
+        self.assertEqual(normalize_sql("UPDATE t SET score = 1.5 WHERE id = %(id)s"),
+                         "UPDATE t SET score = ? WHERE id = ?")
+
+    def test_in_list_collapsed(self):
+        self.assertEqual(normalize_sql("SELECT 1 FROM t WHERE id IN (%s, %s,%s)"),
+                         normalize_sql("SELECT 1 FROM t WHERE id IN (%s, %s)"))
+        self.assertEqual(normalize_sql("SELECT 1 FROM t WHERE id IN (1, 2, 3)"),
+                         "SELECT ? FROM t WHERE id IN (...)")
+
+    def test_multi_row_values_collapsed(self):
+        self.assertEqual(normalize_sql("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s), (%s, %s)"),
+                         "INSERT INTO t (a, b) VALUES (...)")
+
+    def test_identifiers_with_digits_kept(self):
+        self.assertEqual(normalize_sql("SELECT col1 FROM t2"), "SELECT col1 FROM t2")
+
+    def test_savepoint_names(self):
+        self.assertEqual(normalize_sql("SAVEPOINT uow_1"), "SAVEPOINT ?")
+        self.assertEqual(normalize_sql("ROLLBACK TO SAVEPOINT uow_12"), "ROLLBACK TO SAVEPOINT ?")
+        self.assertEqual(normalize_sql("release savepoint uow_3"), "release SAVEPOINT ?")
+
+    def test_whitespace_and_bytes(self):
+        self.assertEqual(normalize_sql(b"SELECT\n   a\tFROM  t  "), "SELECT a FROM t")
+
+
+class FakeCursor:
+    def __init__(self, rowcount=1, fail=False):
+        self.rowcount = rowcount
+        self.fail = fail
+        self.closed = False
+
+    def execute(self, query, args=None):
+        if self.fail:
+            raise RuntimeError("query failed")
+
+    def executemany(self, query, args):
+        self.rowcount = len(args)
+
+    def close(self):
+        self.closed = True
+
+
+class InstrumentedCursorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorded = []
+        patch = mock.patch.object(query_log, "record", side_effect=lambda *a: self.recorded.append(a))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_execute_recorded(self):
+        with query_log.InstrumentedCursor(FakeCursor(rowcount=3)) as cursor:
+            cursor.execute("SELECT 1")
+            self.assertEqual(cursor.rowcount, 3)
+        (sql, duration_ms, rows), = self.recorded
+        self.assertEqual((sql, rows), ("SELECT 1", 3))
+        self.assertGreaterEqual(duration_ms, 0)
+
+    def test_failed_query_recorded(self):
+        with self.assertRaises(RuntimeError):
+            query_log.InstrumentedCursor(FakeCursor(fail=True)).execute("SELECT 1")
+        self.assertEqual(len(self.recorded), 1)
+
+    def test_unknown_rowcount(self):
+        query_log.InstrumentedCursor(FakeCursor(rowcount=2 ** 64 - 1)).execute("SELECT 1")
+        query_log.InstrumentedCursor(FakeCursor(rowcount=-1)).execute("SELECT 1")
+        self.assertEqual([r[2] for r in self.recorded], [None, None])
+
+    def test_exit_closes_cursor(self):
+        raw = FakeCursor()
+        with query_log.InstrumentedCursor(raw) as cursor:
+            cursor.executemany("INSERT INTO t VALUES (%s)", [(1,), (2,)])
+        self.assertTrue(raw.closed)
+        self.assertEqual(self.recorded[0][2], 2)
+
+
+class QueryStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        patch = mock.patch.object(query_log.QueryStats, "_stats", {})
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_totals_by_statement(self):
+        query_log.QueryStats.record("A", 10, 1)
+        query_log.QueryStats.record("A", 30, None)
+        query_log.QueryStats.record("B", 5, 2)
+        top = query_log.QueryStats.top()
+        self.assertEqual([t["statement"] for t in top], ["A", "B"])
+        self.assertEqual((top[0]["count"], top[0]["max_ms"], top[0]["avg_ms"], top[0]["rows"]), (2, 30, 20, 1))
+
+    def test_statement_limit(self):
+        with mock.patch.object(query_log, "MAX_STATEMENTS", 1):
+            query_log.QueryStats.record("A", 1, 0)
+            query_log.QueryStats.record("B", 1, 0)
+            query_log.QueryStats.record("A", 1, 0)
+        self.assertEqual([(t["statement"], t["count"]) for t in query_log.QueryStats.top()], [("A", 2)])
+
+
+class RequestQueriesTest(unittest.TestCase):
+
+    def setUp(self):
+        patch = mock.patch.object(query_log.QueryStats, "_stats", {})
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        self.app = Flask(__name__)
+        query_log.init_app(self.app)
+
+        @self.app.route("/list")
+        def list_rows():
+            for n in range(3):
+                query_log.record(f"SELECT * FROM t WHERE id = {n}", 2.0, 1)
+            return "ok"
+
+    def test_server_timing_header(self):
+        response = self.app.test_client().get("/list")
+        self.assertEqual(response.headers["Server-Timing"], 'db;dur=6.0;desc="3 queries"')
+        self.assertEqual(query_log.QueryStats.top()[0]["count"], 3)
+
+    def test_many_queries_warned(self):
+        with mock.patch.object(query_log, "QUERY_COUNT_WARN", 2), mock.patch("builtins.print") as printed:
+            self.app.test_client().get("/list")
+        lines = [call.args[0] for call in printed.call_args_list]
+        self.assertIn("쿼리 3개", lines[0])
+        self.assertIn("3회", lines[1])
+
+    def test_slow_query_logged(self):
+        with mock.patch.object(query_log, "SLOW_QUERY_MS", 1), mock.patch("builtins.print") as printed:
+            self.app.test_client().get("/list")
+        self.assertIn("[GET /list]", printed.call_args_list[0].args[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+# rate_limiter.SharedTokenBucket + Spotify 호출 우선순위/429 처리 테스트 (시간은 time.time을 고정해서 진행)
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from spotipy import Spotify
+from spotipy.exceptions import SpotifyException
+
+import rate_limiter
+import spotify_client
+from rate_limiter import RateLimitExceeded, SharedTokenBucket
+from spotify_client import BACKGROUND, RateLimitedSpotify, SpotifyRateLimitError, spotify_priority
+
+
+class SharedTokenBucketTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patch = mock.patch.object(rate_limiter.time, "time", side_effect=lambda: self.now)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_capacity_then_refill(self):
+        bucket = SharedTokenBucket(rate=2, capacity=3)
+        self.assertEqual([bucket.try_acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.try_acquire(), 0.5)
+
+        self.now += 0.5
+        self.assertEqual(bucket.try_acquire(), 0.0)
+
+    def test_refill_is_capped_at_capacity(self):
+        bucket = SharedTokenBucket(rate=10, capacity=2)
+        self.now += 60
+        self.assertEqual([bucket.try_acquire() for _ in range(2)], [0.0, 0.0])
+        self.assertGreater(bucket.try_acquire(), 0)
+
+    def test_reserve_keeps_tokens_for_interactive_calls(self):
+        bucket = SharedTokenBucket(rate=1, capacity=4)
+        # reserve 0.5 → 버킷의 절반(2개)은 남겨 둠
+        self.assertEqual(bucket.try_acquire(reserve=0.5), 0.0)
+        self.assertEqual(bucket.try_acquire(reserve=0.5), 0.0)
+        self.assertAlmostEqual(bucket.try_acquire(reserve=0.5), 1.0)
+        self.assertEqual(bucket.try_acquire(), 0.0)
+        self.assertEqual(bucket.try_acquire(), 0.0)
+
+    def test_block_for(self):
+        bucket = SharedTokenBucket(rate=10, capacity=10)
+        bucket.block_for(5)
+        self.assertAlmostEqual(bucket.blocked_for(), 5)
+        self.assertAlmostEqual(bucket.try_acquire(), 5)
+
+        self.now += 5.1
+        self.assertEqual(bucket.blocked_for(), 0.0)
+        self.assertEqual(bucket.try_acquire(), 0.0)
+
+    def test_acquire_raises_when_wait_exceeds_max_wait(self):
+        bucket = SharedTokenBucket(rate=0.1, capacity=1)
+        bucket.acquire()
+        with self.assertRaises(RateLimitExceeded) as ctx:
+            bucket.acquire(max_wait=1)
+        self.assertEqual(ctx.exception.retry_after, 10)
+
+    @unittest.skipIf(rate_limiter.fcntl is None, "fcntl 없음")
+    def test_state_is_shared_through_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bucket.json")
+            first = SharedTokenBucket(rate=1, capacity=2, path=path)
+            second = SharedTokenBucket(rate=1, capacity=2, path=path)
+            self.assertEqual(first.try_acquire(), 0.0)
+            self.assertEqual(second.try_acquire(), 0.0)
+            self.assertGreater(first.try_acquire(), 0)
+
+            second.block_for(3)
+            self.assertAlmostEqual(first.blocked_for(), 3)
+
+
+class FakeBucket:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.acquired = []
+        self.blocked = []
+
+    def acquire(self, reserve, max_wait):
+        self.acquired.append((reserve, max_wait))
+        if self.fail:
+            raise RateLimitExceeded(7)
+
+    def block_for(self, seconds):
+        self.blocked.append(seconds)
+
+
+def rate_limited(retry_after):
+    headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+    return SpotifyException(429, -1, "rate limited", headers=headers)
+
+
+class RateLimitedSpotifyTest(unittest.TestCase):
+
+    def call(self, bucket, responses):
+        sp = RateLimitedSpotify(auth="token", bucket=bucket)
+        with mock.patch.object(Spotify, "_internal_call", side_effect=responses) as call, \
+                mock.patch("builtins.print"):
+            try:
+                return sp._internal_call("GET", "search", None, {})
+            finally:
+                self.calls = call.call_count
+
+    def test_every_call_takes_a_token(self):
+        bucket = FakeBucket()
+        self.assertEqual(self.call(bucket, [{"ok": 1}]), {"ok": 1})
+        self.assertEqual(bucket.acquired, [spotify_client.PRIORITY_POLICY[spotify_client.INTERACTIVE]])
+
+    def test_background_priority_keeps_reserve(self):
+        bucket = FakeBucket()
+        with spotify_priority(BACKGROUND):
+            self.call(bucket, [{"ok": 1}])
+        self.assertEqual(bucket.acquired, [spotify_client.PRIORITY_POLICY[BACKGROUND]])
+        self.assertGreater(bucket.acquired[0][0], 0)
+
+    def test_429_blocks_all_workers_then_retries(self):
+        bucket = FakeBucket()
+        self.assertEqual(self.call(bucket, [rate_limited(2), {"ok": 1}]), {"ok": 1})
+        self.assertEqual(bucket.blocked, [2.0])
+        self.assertEqual(self.calls, 2)
+
+    def test_retry_after_longer_than_wait_budget_raises(self):
+        bucket = FakeBucket()
+        with self.assertRaises(SpotifyRateLimitError) as ctx:
+            self.call(bucket, [rate_limited(60), {"ok": 1}])
+        self.assertEqual(ctx.exception.retry_after, 60)
+        self.assertEqual(self.calls, 1)
+
+    def test_no_token_in_time_raises(self):
+        with self.assertRaises(SpotifyRateLimitError) as ctx:
+            self.call(FakeBucket(fail=True), [{"ok": 1}])
+        self.assertEqual(ctx.exception.retry_after, 7)
+
+    def test_429_without_retry_after_is_not_rate_limit(self):
+        # urllib3의 5xx 재시도가 다 실패하면 spotipy가 헤더 없는 429를 던짐 → 다른 워커를 막지 않음
+        bucket = FakeBucket()
+        with self.assertRaises(SpotifyException):
+            self.call(bucket, [rate_limited(None), {"ok": 1}])
+        self.assertEqual(bucket.blocked, [])
+        self.assertEqual(self.calls, 1)
+
+    def test_other_errors_pass_through(self):
+        with self.assertRaises(SpotifyException):
+            self.call(FakeBucket(), [SpotifyException(404, -1, "not found")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+# seed_music 테스트: 장르:곡수 파싱, 체크포인트 저장/재시작, 페이지 저장, offset 한도 이후 검색어 전환
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import seed_music
+
+
+def track(n):
+    return {
+        "id": f"t{n}",
+        "name": f"Song {n}",
+        "artists": [{"id": f"a{n}", "name": f"Artist {n}"}],
+        "album": {"name": "Album", "images": []},
+        "external_urls": {"spotify": f"https://open.spotify.com/track/t{n}"},
+    }
+
+
+class ParseTest(unittest.TestCase):
+
+    def test_parse_spec(self):
+        self.assertEqual(seed_music.parse_spec("K-pop:5000"), ("K-pop", 5000))
+        self.assertEqual(seed_music.parse_spec("Hip hop:10"), ("Hip hop", 10))
+        for bad in ("K-pop", "K-pop:0", ":10", "K-pop:abc"):
+            with self.assertRaises(Exception, msg=bad):
+                seed_music.parse_spec(bad)
+
+    def test_query_variants(self):
+        variants = seed_music.query_variants("K-pop")
+        self.assertEqual(variants[:2], ["K-pop", 'genre:"k-pop"'])
+        self.assertEqual(len(variants), 2 + len(seed_music.YEAR_RANGES))
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "checkpoint.json")
+
+    def test_saved_progress_reloaded(self):
+        seed_music.Checkpoint(self.path).save("Pop", {"variant": 1, "offset": 50, "saved": 30})
+        self.assertEqual(seed_music.Checkpoint(self.path).get("Pop"), {"variant": 1, "offset": 50, "saved": 30})
+        self.assertEqual(seed_music.Checkpoint(self.path, fresh=True).get("Pop")["saved"], 0)
+
+    def test_broken_file_starts_over(self):
+        with open(self.path, "w") as f:
+            f.write("{broken")
+        self.assertEqual(seed_music.Checkpoint(self.path).get("Pop"), {"variant": 0, "offset": 0, "saved": 0})
+
+    def test_get_returns_copy(self):
+        checkpoint = seed_music.Checkpoint(self.path)
+        checkpoint.get("Pop")["saved"] = 99
+        self.assertEqual(checkpoint.get("Pop")["saved"], 0)
+
+
+class SavePageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.find = mock.patch.object(seed_music.music_model, "find_by_spotify_urls", return_value={}).start()
+        self.upsert = mock.patch.object(
+            seed_music.music_model, "upsert_many", side_effect=lambda rows: list(range(1, len(rows) + 1))
+        ).start()
+        self.features = mock.patch.object(
+            seed_music.music_service, "fetch_audio_features_batch", return_value={"t1": {"energy": 50}}
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_new_tracks_saved_once_with_genre(self):
+        existing = track(2)["external_urls"]["spotify"]
+        self.find.return_value = {existing: {"music_no": 7}}
+
+        saved = seed_music.save_page(None, [track(1), track(1), track(2), None], 3, True)
+
+        self.assertEqual(saved, 1)
+        (rows,), _ = self.upsert.call_args
+        self.assertEqual([r["spotify_track_id"] for r in rows], ["t1"])
+        self.assertEqual((rows[0]["genre_no"], rows[0]["energy"]), (3, 50))
+
+    def test_all_artists_joined(self):
+        feat = dict(track(1), artists=[{"id": "a1", "name": "IU"}, {"id": "a2", "name": "SUGA"}])
+        seed_music.save_page(None, [feat], 3, False)
+        (rows,), _ = self.upsert.call_args
+        self.assertEqual(rows[0]["artist_name"], "IU, SUGA")
+
+    def test_no_features(self):
+        seed_music.save_page(None, [track(1)], 3, False)
+        self.features.assert_not_called()
+
+    def test_failed_rows_not_counted(self):
+        self.upsert.side_effect = lambda rows: [None] * len(rows)
+        self.assertEqual(seed_music.save_page(None, [track(1)], 3, False), 0)
+
+
+class FakeSpotify:
+    def __init__(self, total):
+        self.total = total
+        self.calls = []
+
+    def search(self, q, type, limit, offset, market):
+        self.calls.append((q, offset))
+        items = [track(f"{q}-{n}") for n in range(offset, min(offset + limit, self.total))]
+        return {"tracks": {"total": self.total, "items": items}}
+
+
+class SeedGenreTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.checkpoint = seed_music.Checkpoint(os.path.join(tmp.name, "checkpoint.json"))
+        mock.patch.object(seed_music.genre_service, "get_or_create_genre", return_value=1).start()
+        mock.patch.object(seed_music, "save_page", side_effect=lambda sp, items, g, f: len(items)).start()
+        mock.patch("builtins.print").start()
+        self.addCleanup(mock.patch.stopall)
+
+    def seed(self, sp, target):
+        with mock.patch.object(seed_music, "get_spotify_client", return_value=sp):
+            return seed_music.seed_genre("Pop", target, self.checkpoint, False)
+
+    def test_next_variant_after_results_end(self):
+        sp = FakeSpotify(total=80)
+        # 페이지 단위로 저장하므로 마지막 페이지만큼 target을 넘을 수 있음
+        self.assertEqual(self.seed(sp, 150), 160)
+        self.assertEqual(sp.calls, [("Pop", 0), ("Pop", 50), ('genre:"pop"', 0), ('genre:"pop"', 50)])
+
+    def test_next_variant_at_offset_limit(self):
+        sp = FakeSpotify(total=5000)
+        with mock.patch.object(seed_music, "SPOTIFY_SEARCH_MAX_OFFSET", 100):
+            self.seed(sp, 150)
+        self.assertEqual([offset for _, offset in sp.calls], [0, 50, 0])
+
+    def test_resume_from_checkpoint(self):
+        self.checkpoint.save("Pop", {"variant": 1, "offset": 50, "saved": 100})
+        sp = FakeSpotify(total=5000)
+        self.assertEqual(self.seed(sp, 150), 150)
+        self.assertEqual(sp.calls, [('genre:"pop"', 50)])
+
+    def test_finished_genre_skipped(self):
+        self.checkpoint.save("Pop", {"variant": 0, "offset": 0, "saved": 150})
+        sp = FakeSpotify(total=5000)
+        self.assertEqual(self.seed(sp, 150), 150)
+        self.assertEqual(sp.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# spotify_fake 테스트: 합성 응답이 결정적인지, fixture 재생/strict, 오류 주입
+import json
+import os
+import tempfile
+import unittest
+
+from spotipy.exceptions import SpotifyException
+
+from spotify_fake import FakeTransport, fixture_path, synthesize_response
+
+
+class SynthesizeResponseTest(unittest.TestCase):
+
+    def test_search_is_deterministic_and_paged(self):
+        first = synthesize_response("GET", "search", {"q": "iu", "limit": 5, "offset": 10})
+        again = synthesize_response("GET", "search", {"q": "iu", "limit": 5, "offset": 10})
+        self.assertEqual(first, again)
+        self.assertEqual(len(first["tracks"]["items"]), 5)
+
+        other = synthesize_response("GET", "search", {"q": "iu", "limit": 5, "offset": 15})
+        ids = {t["id"] for t in first["tracks"]["items"]}
+        self.assertFalse(ids & {t["id"] for t in other["tracks"]["items"]})
+
+    def test_batch_endpoints_keep_id_order(self):
+        result = synthesize_response("GET", "audio-features/?ids=b,a", None)
+        self.assertEqual([f["id"] for f in result["audio_features"]], ["b", "a"])
+        artists = synthesize_response("GET", "artists/?ids=x,y", None)
+        self.assertEqual([a["id"] for a in artists["artists"]], ["x", "y"])
+
+    def test_unknown_path_is_404(self):
+        with self.assertRaises(SpotifyException) as ctx:
+            synthesize_response("GET", "me/player", None)
+        self.assertEqual(ctx.exception.http_status, 404)
+
+
+class FakeTransportTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.fixture_dir = tmp.name
+
+    def client(self, **kwargs):
+        return FakeTransport(auth="token", fixture_dir=self.fixture_dir, **kwargs)
+
+    def test_fixture_replayed_before_synthetic(self):
+        path = fixture_path(self.fixture_dir, "GET", "https://api.spotify.com/v1/tracks/t1", {})
+        os.makedirs(os.path.dirname(path))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"id": "t1", "name": "recorded"}, f)
+
+        self.assertEqual(self.client().track("t1")["name"], "recorded")
+        self.assertNotEqual(self.client().track("t2")["name"], "recorded")
+
+    def test_strict_requires_fixture(self):
+        with self.assertRaises(SpotifyException) as ctx:
+            self.client(strict=True).track("t1")
+        self.assertEqual(ctx.exception.http_status, 404)
+
+    def test_injected_errors(self):
+        with self.assertRaises(SpotifyException) as ctx:
+            self.client(rate_limit_rate=1.0)._internal_call("GET", "search", None, {})
+        self.assertEqual(ctx.exception.http_status, 429)
+
+        with self.assertRaises(SpotifyException) as ctx:
+            self.client(error_rate=1.0)._internal_call("GET", "search", None, {})
+        self.assertEqual(ctx.exception.http_status, 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
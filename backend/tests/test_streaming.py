@@ -0,0 +1,57 @@
+# streaming.stream_response 테스트: NDJSON/JSON 본문, 응답을 닫으면 원본 스트림도 닫힘
+import json
+import unittest
+
+from flask import Flask
+
+import streaming
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+class StreamResponseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        ctx = self.app.app_context()
+        ctx.push()
+        self.addCleanup(ctx.pop)
+
+    def body(self, chunks, fmt):
+        stream = FakeStream(chunks)
+        response = streaming.stream_response(stream, fmt)
+        text = "".join(response.response)
+        return response, text, stream
+
+    def test_ndjson(self):
+        response, text, stream = self.body([[{"n": 1}, {"n": 2}], [{"n": 3}]], "ndjson")
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertEqual([json.loads(line)["n"] for line in text.splitlines()], [1, 2, 3])
+        self.assertTrue(stream.closed)
+
+    def test_json_envelope(self):
+        _, text, _ = self.body([[{"n": 1}], [], [{"n": 2}]], "json")
+        self.assertEqual(json.loads(text), {"success": True, "data": [{"n": 1}, {"n": 2}]})
+
+    def test_empty_json(self):
+        _, text, _ = self.body([], "json")
+        self.assertEqual(json.loads(text), {"success": True, "data": []})
+
+    def test_closing_unread_response_closes_stream(self):
+        stream = FakeStream([[{"n": 1}]])
+        streaming.stream_response(stream, "ndjson").close()
+        self.assertTrue(stream.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()